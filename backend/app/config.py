@@ -10,5 +10,13 @@ DB_PATH = os.getenv("ATLAS_DB_PATH", str(BASE_DIR / "data" / "atlas.db"))
 DB_PATH = str(Path(DB_PATH).resolve()) if not Path(DB_PATH).is_absolute() else DB_PATH
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 NVD_API_KEY = os.getenv("NVD_API_KEY", "")
+# OSINT cache budget enforced by the background eviction sweeper (0 = unlimited)
+OSINT_CACHE_MAX_ROWS = int(os.getenv("OSINT_CACHE_MAX_ROWS", "0"))
+OSINT_CACHE_MAX_BYTES = int(os.getenv("OSINT_CACHE_MAX_BYTES", "0"))
+OSINT_EVICTION_INTERVAL_MINUTES = int(os.getenv("OSINT_EVICTION_INTERVAL_MINUTES", "60"))
+# Statements slower than this are logged with their query plan
+SLOW_QUERY_MS = float(os.getenv("ATLAS_SLOW_QUERY_MS", "100"))
+# Serve OSINT API requests from recorded responses instead of the network
+OSINT_REPLAY_DIR = os.getenv("OSINT_REPLAY_DIR", "")
 ATLAS_YAML_URL = "https://raw.githubusercontent.com/mitre-atlas/atlas-data/main/dist/ATLAS.yaml"
 ATLAS_RELEASES_URL = "https://api.github.com/repos/mitre-atlas/atlas-data/releases/latest"
@@ -1,12 +1,27 @@
+import asyncio
+import contextvars
+import functools
+import re
 import sqlite3
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, TypeVar
 
 from .config import DB_PATH
+from .query_metrics import InstrumentedConnection
 
 _connection: sqlite3.Connection | None = None
 _lock = threading.Lock()
 
+# Async code (OSINT fetches, prefetch, background sweeps) runs its SQLite work
+# on this single thread so disk I/O never blocks the event loop and writes
+# from concurrent tasks are serialized.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="atlas-db")
+
+T = TypeVar("T")
+
 SCHEMA_SQL = """
 -- METADATA
 CREATE TABLE IF NOT EXISTS atlas_metadata (
@@ -118,6 +133,33 @@ CREATE TABLE IF NOT EXISTS case_study_procedures (
     FOREIGN KEY (technique_id) REFERENCES techniques(id)
 );
 
+-- Number of case studies sharing each pair of techniques, with
+-- technique_a < technique_b. At 'parent' granularity procedures on
+-- subtechniques count for their parent; at 'subtechnique' granularity every
+-- technique is its own node. Rebuilt from case_study_procedures on every
+-- ingestion.
+CREATE TABLE IF NOT EXISTS technique_cooccurrence (
+    granularity TEXT NOT NULL,
+    technique_a TEXT NOT NULL,
+    technique_b TEXT NOT NULL,
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (granularity, technique_a, technique_b)
+) WITHOUT ROWID;
+
+-- Best-scoring similar techniques of each technique, ranked from 1 (see
+-- services.technique_similarity). Rebuilt on every ingestion.
+CREATE TABLE IF NOT EXISTS technique_related (
+    technique_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    related_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    text_score REAL NOT NULL,
+    cooccurrence_score REAL NOT NULL,
+    mitigation_score REAL NOT NULL,
+    tactic_score REAL NOT NULL,
+    PRIMARY KEY (technique_id, rank)
+) WITHOUT ROWID;
+
 CREATE TABLE IF NOT EXISTS references_ (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     entity_type TEXT NOT NULL,
@@ -127,30 +169,86 @@ CREATE TABLE IF NOT EXISTS references_ (
 );
 
 -- OSINT & ENRICHMENT
-CREATE TABLE IF NOT EXISTS osint_results (
+-- One row per external artifact (GitHub repo, arXiv paper, CVE), keyed by
+-- canonical id; technique_artifacts links artifacts to techniques.
+CREATE TABLE IF NOT EXISTS osint_artifacts (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    technique_id TEXT NOT NULL,
     source TEXT NOT NULL,
+    canonical_id TEXT NOT NULL,
     title TEXT,
     url TEXT,
     summary TEXT,
-    relevance_score REAL,
-    fetched_at TEXT DEFAULT (datetime('now')),
-    expires_at TEXT,
-    FOREIGN KEY (technique_id) REFERENCES techniques(id)
+    stars INTEGER,
+    language TEXT,
+    cvss_score REAL,
+    updated_at TEXT,
+    etag TEXT,
+    stars_delta INTEGER,
+    cvss_delta REAL,
+    UNIQUE (source, canonical_id)
 );
 
-CREATE TABLE IF NOT EXISTS github_repos (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+-- fetched_at/expires_at on the OSINT cache tables are Unix epoch seconds so
+-- freshness checks and eviction are indexed range comparisons.
+CREATE TABLE IF NOT EXISTS technique_artifacts (
     technique_id TEXT NOT NULL,
-    repo_full_name TEXT NOT NULL,
-    description TEXT,
-    stars INTEGER,
-    language TEXT,
-    url TEXT,
+    artifact_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    relevance_score REAL,
     category TEXT,
-    last_updated TEXT,
-    FOREIGN KEY (technique_id) REFERENCES techniques(id)
+    fetched_at REAL,
+    expires_at REAL,
+    PRIMARY KEY (technique_id, artifact_id),
+    FOREIGN KEY (artifact_id) REFERENCES osint_artifacts(id)
+);
+
+-- Outcome of the last fetch per (technique, source), including empty results
+-- and failures, so those are cached too instead of re-hitting the API.
+CREATE TABLE IF NOT EXISTS osint_fetch_status (
+    technique_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result_count INTEGER NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (technique_id, source)
+);
+
+-- When each artifact was first and last returned for a technique. Keyed by
+-- canonical id so history survives links and artifacts being removed.
+CREATE TABLE IF NOT EXISTS osint_history (
+    technique_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    canonical_id TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (technique_id, source, canonical_id)
+) WITHOUT ROWID;
+
+-- OSINT coverage statistics, maintained by the triggers below so status and
+-- report endpoints read a single row instead of scanning technique_artifacts.
+-- osint_coverage counts links per (technique, source) to tell when a
+-- technique gains its first or loses its last result for a source.
+CREATE TABLE IF NOT EXISTS osint_coverage (
+    technique_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    links INTEGER NOT NULL,
+    PRIMARY KEY (technique_id, source)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS osint_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_techniques INTEGER NOT NULL DEFAULT 0,
+    techniques_with_github INTEGER NOT NULL DEFAULT 0,
+    techniques_with_arxiv INTEGER NOT NULL DEFAULT 0,
+    techniques_with_nvd INTEGER NOT NULL DEFAULT 0,
+    techniques_with_osint INTEGER NOT NULL DEFAULT 0,
+    github_links INTEGER NOT NULL DEFAULT 0,
+    arxiv_links INTEGER NOT NULL DEFAULT 0,
+    nvd_links INTEGER NOT NULL DEFAULT 0,
+    last_refresh REAL
 );
 
 CREATE TABLE IF NOT EXISTS killchains (
@@ -179,12 +277,58 @@ CREATE TABLE IF NOT EXISTS killchain_steps (
     FOREIGN KEY (technique_id) REFERENCES techniques(id)
 );
 
+-- OSINT search keywords per (technique, source). queries/hits/results count
+-- the external searches made with each term so low-yield terms can be
+-- disabled. No foreign key to techniques so terms survive re-ingestion.
 CREATE TABLE IF NOT EXISTS technique_search_terms (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     technique_id TEXT NOT NULL,
     source TEXT NOT NULL,
     search_term TEXT NOT NULL,
-    FOREIGN KEY (technique_id) REFERENCES techniques(id)
+    origin TEXT NOT NULL DEFAULT 'manual',
+    enabled INTEGER NOT NULL DEFAULT 1,
+    queries INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    results INTEGER NOT NULL DEFAULT 0,
+    last_used_at REAL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    UNIQUE (technique_id, source, search_term)
+);
+
+CREATE TABLE IF NOT EXISTS osint_prefetch_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sources TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at TEXT NOT NULL,
+    resumed_at TEXT NOT NULL,
+    finished_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS osint_prefetch_checkpoints (
+    run_id INTEGER NOT NULL,
+    technique_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result_count INTEGER,
+    error TEXT,
+    completed_at TEXT,
+    PRIMARY KEY (run_id, technique_id, source),
+    FOREIGN KEY (run_id) REFERENCES osint_prefetch_runs(id)
+);
+
+CREATE TABLE IF NOT EXISTS nvd_cves (
+    id INTEGER PRIMARY KEY,
+    cve_id TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    cvss_score REAL,
+    published TEXT,
+    last_modified TEXT
+);
+
+CREATE TABLE IF NOT EXISTS nvd_mirror_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_modified_end TEXT,
+    updated_at TEXT
 );
 
 -- INDEXES
@@ -194,11 +338,69 @@ CREATE INDEX IF NOT EXISTS idx_technique_tactics_tactic ON technique_tactics(tac
 CREATE INDEX IF NOT EXISTS idx_mitigation_techniques_technique ON mitigation_techniques(technique_id);
 CREATE INDEX IF NOT EXISTS idx_case_study_procedures_case ON case_study_procedures(case_study_id);
 CREATE INDEX IF NOT EXISTS idx_case_study_procedures_technique ON case_study_procedures(technique_id);
+CREATE INDEX IF NOT EXISTS idx_technique_cooccurrence_weight ON technique_cooccurrence(granularity, weight);
 CREATE INDEX IF NOT EXISTS idx_references_entity ON references_(entity_type, entity_id);
-CREATE INDEX IF NOT EXISTS idx_osint_results_technique ON osint_results(technique_id);
-CREATE INDEX IF NOT EXISTS idx_github_repos_technique ON github_repos(technique_id);
+CREATE INDEX IF NOT EXISTS idx_technique_artifacts_freshness ON technique_artifacts(technique_id, source, expires_at);
+CREATE INDEX IF NOT EXISTS idx_technique_artifacts_artifact ON technique_artifacts(artifact_id);
+CREATE INDEX IF NOT EXISTS idx_technique_artifacts_expires ON technique_artifacts(expires_at);
+CREATE INDEX IF NOT EXISTS idx_osint_fetch_status_expires ON osint_fetch_status(expires_at);
+CREATE INDEX IF NOT EXISTS idx_osint_history_first_seen ON osint_history(technique_id, first_seen);
+CREATE INDEX IF NOT EXISTS idx_osint_history_last_seen ON osint_history(last_seen);
 CREATE INDEX IF NOT EXISTS idx_killchain_steps_killchain ON killchain_steps(killchain_id);
-CREATE INDEX IF NOT EXISTS idx_technique_search_terms ON technique_search_terms(technique_id, source);
+CREATE INDEX IF NOT EXISTS idx_osint_prefetch_checkpoints_status ON osint_prefetch_checkpoints(run_id, status);
+
+-- OSINT STATISTICS TRIGGERS
+CREATE TRIGGER IF NOT EXISTS techniques_stats_ai AFTER INSERT ON techniques BEGIN
+    UPDATE osint_stats SET total_techniques = total_techniques + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS techniques_stats_ad AFTER DELETE ON techniques BEGIN
+    UPDATE osint_stats SET total_techniques = total_techniques - 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS technique_artifacts_stats_ai AFTER INSERT ON technique_artifacts BEGIN
+    INSERT INTO osint_coverage (technique_id, source, links) VALUES (new.technique_id, new.source, 1)
+        ON CONFLICT (technique_id, source) DO UPDATE SET links = links + 1;
+    UPDATE osint_stats SET
+        github_links = github_links + (new.source = 'github'),
+        arxiv_links = arxiv_links + (new.source = 'arxiv'),
+        nvd_links = nvd_links + (new.source = 'nvd'),
+        techniques_with_github = techniques_with_github + (new.source = 'github' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = new.technique_id AND source = 'github') = 1),
+        techniques_with_arxiv = techniques_with_arxiv + (new.source = 'arxiv' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = new.technique_id AND source = 'arxiv') = 1),
+        techniques_with_nvd = techniques_with_nvd + (new.source = 'nvd' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = new.technique_id AND source = 'nvd') = 1),
+        techniques_with_osint = techniques_with_osint + (new.source != 'github' AND (
+            SELECT SUM(links) FROM osint_coverage WHERE technique_id = new.technique_id AND source != 'github') = 1),
+        last_refresh = CASE WHEN new.source != 'github' AND new.fetched_at > COALESCE(last_refresh, 0)
+            THEN new.fetched_at ELSE last_refresh END
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS technique_artifacts_stats_ad AFTER DELETE ON technique_artifacts BEGIN
+    UPDATE osint_coverage SET links = links - 1 WHERE technique_id = old.technique_id AND source = old.source;
+    UPDATE osint_stats SET
+        github_links = github_links - (old.source = 'github'),
+        arxiv_links = arxiv_links - (old.source = 'arxiv'),
+        nvd_links = nvd_links - (old.source = 'nvd'),
+        techniques_with_github = techniques_with_github - (old.source = 'github' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = old.technique_id AND source = 'github') = 0),
+        techniques_with_arxiv = techniques_with_arxiv - (old.source = 'arxiv' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = old.technique_id AND source = 'arxiv') = 0),
+        techniques_with_nvd = techniques_with_nvd - (old.source = 'nvd' AND (
+            SELECT links FROM osint_coverage WHERE technique_id = old.technique_id AND source = 'nvd') = 0),
+        techniques_with_osint = techniques_with_osint - (old.source != 'github' AND (
+            SELECT SUM(links) FROM osint_coverage WHERE technique_id = old.technique_id AND source != 'github') = 0)
+    WHERE id = 1;
+    DELETE FROM osint_coverage WHERE technique_id = old.technique_id AND source = old.source AND links = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS technique_artifacts_stats_au AFTER UPDATE OF fetched_at ON technique_artifacts
+WHEN new.source != 'github' BEGIN
+    UPDATE osint_stats SET last_refresh = new.fetched_at
+    WHERE id = 1 AND new.fetched_at > COALESCE(last_refresh, 0);
+END;
 """
 
 FTS_SQL = """
@@ -209,6 +411,25 @@ CREATE VIRTUAL TABLE IF NOT EXISTS techniques_fts USING fts5(
 CREATE VIRTUAL TABLE IF NOT EXISTS case_studies_fts USING fts5(
     id, name, summary
 );
+
+-- External-content index over the CVE mirror, kept in sync by triggers so
+-- incremental updates don't require a full rebuild.
+CREATE VIRTUAL TABLE IF NOT EXISTS nvd_cves_fts USING fts5(
+    description, content='nvd_cves', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS nvd_cves_ai AFTER INSERT ON nvd_cves BEGIN
+    INSERT INTO nvd_cves_fts (rowid, description) VALUES (new.id, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS nvd_cves_ad AFTER DELETE ON nvd_cves BEGIN
+    INSERT INTO nvd_cves_fts (nvd_cves_fts, rowid, description) VALUES ('delete', old.id, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS nvd_cves_au AFTER UPDATE ON nvd_cves BEGIN
+    INSERT INTO nvd_cves_fts (nvd_cves_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    INSERT INTO nvd_cves_fts (rowid, description) VALUES (new.id, new.description);
+END;
 """
 
 
@@ -217,17 +438,153 @@ def _ensure_data_dir() -> None:
     Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
 
 
+def _iso_to_epoch(value: str | None) -> float | None:
+    """Convert an ISO-8601 timestamp (naive values are UTC) to epoch seconds."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def _migrate_search_terms(conn: sqlite3.Connection) -> None:
+    """Recreate technique_search_terms from the original keyword-only layout.
+
+    The first version had no stats columns and a foreign key to techniques,
+    which would block re-ingestion once terms exist. Terms are kept.
+    """
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(technique_search_terms)").fetchall()}
+    if "enabled" in columns:
+        return
+    rows = conn.execute("SELECT technique_id, source, search_term FROM technique_search_terms").fetchall()
+    conn.execute("DROP TABLE technique_search_terms")
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany(
+        "INSERT OR IGNORE INTO technique_search_terms (technique_id, source, search_term) VALUES (?, ?, ?)",
+        [tuple(r) for r in rows],
+    )
+    conn.commit()
+
+
+def _migrate_legacy_osint(conn: sqlite3.Connection) -> None:
+    """Move per-technique github_repos/osint_results rows into the artifact store.
+
+    Older databases stored each repo, paper and CVE once per technique. Rows
+    are deduplicated by canonical id into osint_artifacts and linked back
+    through technique_artifacts, then the legacy tables are dropped.
+    """
+    tables = {
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('github_repos', 'osint_results')"
+        ).fetchall()
+    }
+    if not tables:
+        return
+
+    conn.create_function(
+        "arxiv_id", 1, lambda url: re.sub(r"v\d+$", "", (url or "").rsplit("/abs/", 1)[-1]), deterministic=True
+    )
+    conn.create_function("iso_epoch", 1, _iso_to_epoch, deterministic=True)
+
+    if "github_repos" in tables:
+        conn.execute(
+            """INSERT OR IGNORE INTO osint_artifacts
+               (source, canonical_id, title, url, summary, stars, language, updated_at)
+               SELECT 'github', repo_full_name, repo_full_name, url, description, stars, language, last_updated
+               FROM github_repos"""
+        )
+        conn.execute(
+            """INSERT OR IGNORE INTO technique_artifacts
+               (technique_id, artifact_id, source, category, fetched_at)
+               SELECT g.technique_id, a.id, 'github', g.category, iso_epoch(g.last_updated)
+               FROM github_repos g
+               JOIN osint_artifacts a ON a.source = 'github' AND a.canonical_id = g.repo_full_name"""
+        )
+        conn.execute("DROP TABLE github_repos")
+
+    if "osint_results" in tables:
+        canonical = "CASE o.source WHEN 'arxiv' THEN arxiv_id(o.url) ELSE o.title END"
+        conn.execute(
+            f"""INSERT OR IGNORE INTO osint_artifacts (source, canonical_id, title, url, summary, updated_at)
+                SELECT o.source, {canonical}, o.title, o.url, o.summary, o.fetched_at
+                FROM osint_results o WHERE o.title IS NOT NULL"""
+        )
+        conn.execute(
+            f"""INSERT OR IGNORE INTO technique_artifacts
+                (technique_id, artifact_id, source, relevance_score, fetched_at, expires_at)
+                SELECT o.technique_id, a.id, o.source, o.relevance_score, iso_epoch(o.fetched_at), iso_epoch(o.expires_at)
+                FROM osint_results o
+                JOIN osint_artifacts a ON a.source = o.source AND a.canonical_id = {canonical}"""
+        )
+        conn.execute("DROP TABLE osint_results")
+
+    conn.commit()
+
+
+def _backfill_osint_history(conn: sqlite3.Connection) -> None:
+    """Seed osint_history from the current links the first time it is empty,
+    using each link's last fetch as its first-seen time."""
+    if conn.execute("SELECT 1 FROM osint_history LIMIT 1").fetchone():
+        return
+    conn.execute(
+        """INSERT OR IGNORE INTO osint_history (technique_id, source, canonical_id, first_seen, last_seen)
+           SELECT l.technique_id, l.source, a.canonical_id, l.fetched_at, l.fetched_at
+           FROM technique_artifacts l JOIN osint_artifacts a ON a.id = l.artifact_id
+           WHERE l.fetched_at IS NOT NULL"""
+    )
+    conn.commit()
+
+
+def rebuild_osint_stats(conn: sqlite3.Connection) -> None:
+    """Recompute osint_coverage and the osint_stats row from scratch.
+
+    Runs once when the stats table is first created; afterwards the triggers
+    keep both up to date incrementally.
+    """
+    conn.execute("DELETE FROM osint_coverage")
+    conn.execute(
+        "INSERT INTO osint_coverage (technique_id, source, links) "
+        "SELECT technique_id, source, COUNT(*) FROM technique_artifacts GROUP BY technique_id, source"
+    )
+    conn.execute("DELETE FROM osint_stats")
+    conn.execute(
+        """INSERT INTO osint_stats (
+               id, total_techniques, techniques_with_github, techniques_with_arxiv, techniques_with_nvd,
+               techniques_with_osint, github_links, arxiv_links, nvd_links, last_refresh)
+           SELECT 1,
+               (SELECT COUNT(*) FROM techniques),
+               COALESCE(SUM(source = 'github'), 0),
+               COALESCE(SUM(source = 'arxiv'), 0),
+               COALESCE(SUM(source = 'nvd'), 0),
+               (SELECT COUNT(DISTINCT technique_id) FROM osint_coverage WHERE source != 'github'),
+               COALESCE(SUM(CASE WHEN source = 'github' THEN links END), 0),
+               COALESCE(SUM(CASE WHEN source = 'arxiv' THEN links END), 0),
+               COALESCE(SUM(CASE WHEN source = 'nvd' THEN links END), 0),
+               (SELECT MAX(fetched_at) FROM technique_artifacts WHERE source != 'github')
+           FROM osint_coverage"""
+    )
+    conn.commit()
+
+
 def init_db(conn: sqlite3.Connection) -> None:
     """Create all tables, indexes, and FTS virtual tables."""
     conn.executescript(SCHEMA_SQL)
     conn.executescript(FTS_SQL)
+    _migrate_search_terms(conn)
+    _migrate_legacy_osint(conn)
+    _backfill_osint_history(conn)
+    if conn.execute("SELECT 1 FROM osint_stats WHERE id = 1").fetchone() is None:
+        rebuild_osint_stats(conn)
 
 
 def get_db() -> sqlite3.Connection:
     """Return the singleton database connection, creating it if needed.
 
     The connection is thread-safe (check_same_thread=False), uses WAL mode,
-    and has foreign keys enabled.
+    and has foreign keys enabled. Its statements are counted and timed
+    (see app.query_metrics).
     """
     global _connection
     if _connection is not None:
@@ -240,7 +597,7 @@ def get_db() -> sqlite3.Connection:
 
         _ensure_data_dir()
 
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, factory=InstrumentedConnection)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA foreign_keys=ON")
@@ -249,3 +606,13 @@ def get_db() -> sqlite3.Connection:
 
         _connection = conn
         return _connection
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking database function on the dedicated database thread.
+
+    The caller's context goes along, so the statements count toward its request.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_db_executor, context.run, functools.partial(fn, *args, **kwargs))
@@ -1,10 +1,17 @@
+import asyncio
 import logging
+import time
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.config import OSINT_EVICTION_INTERVAL_MINUTES
 from app.database import get_db
-from app.routers import case_studies, deepdives, exercises, killchains, matrix, osint, reports, sync, techniques
+from app.prometheus import CONTENT_TYPE, Histogram, render
+from app.query_metrics import record_request, server_timing, track_queries
+from app.routers import case_studies, deepdives, exercises, killchains, matrix, metrics, osint, reports, sync, techniques
+from app.routers.listing import NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +27,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "atlas_http_request_duration_seconds", "API request latency, per route", ("method", "route", "status")
+)
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """Report each request's SQL statements in Server-Timing and record per-route metrics."""
+    start = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing(stats)
+    # Requests matching no route are left out to keep label values bounded
+    route = request.scope.get("route")
+    if route is not None:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start, method=request.method, route=route.path, status=response.status_code
+        )
+        record_request(request.method, route.path, stats)
+    return response
+
 app.include_router(matrix.router, prefix="/api")
 app.include_router(techniques.router, prefix="/api")
 app.include_router(case_studies.router, prefix="/api")
@@ -31,6 +61,7 @@ app.include_router(killchains.router, prefix="/api")
 app.include_router(reports.router, prefix="/api")
 app.include_router(exercises.router, prefix="/api")
 app.include_router(deepdives.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.on_event("startup")
@@ -53,7 +84,36 @@ def startup():
         except Exception:
             logger.exception("Auto-sync failed, will retry on next startup")
 
+    from app.services.search_terms import seed_search_terms
+    from app.services.technique_graph import ensure_cooccurrence
+    from app.services.technique_similarity import ensure_related
+
+    seed_search_terms(conn)
+    ensure_cooccurrence(conn)
+    ensure_related(conn)
+
+
+# Strong references to long-running background tasks so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+@app.on_event("startup")
+async def start_osint_eviction():
+    if OSINT_EVICTION_INTERVAL_MINUTES <= 0:
+        return
+    from app.services.osint_eviction import run_eviction_loop
+
+    task = asyncio.create_task(run_eviction_loop(get_db()))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus metrics for the API, database, OSINT sources and ingestion."""
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -28,6 +28,32 @@ class TechniqueSummary(BaseModel):
     tactic_ids: list[str]
 
 
+class RelatedTechnique(BaseModel):
+    id: str
+    name: str
+    is_subtechnique: bool
+    maturity: str | None
+    score: float
+    text_score: float
+    cooccurrence_score: float
+    mitigation_score: float
+    tactic_score: float
+
+
+class TacticRef(BaseModel):
+    id: str
+    name: str | None
+
+
+class TechniqueListItem(TechniqueSummary):
+    """Technique summary with the relations requested through `expand`."""
+
+    tactics: list[TacticRef] | None = None
+    subtechniques: list[TechniqueSummary] | None = None
+    mitigations: list[MitigationRef] | None = None
+    case_studies: list[CaseStudySummary] | None = None
+
+
 class TechniqueDetail(BaseModel):
     id: str
     name: str
@@ -173,6 +199,9 @@ class GraphNode(BaseModel):
     tactic_ids: list[str]
     maturity: str | None
     case_study_count: int
+    # Precomputed force-directed layout position, scaled to [0, 1]
+    x: float | None = None
+    y: float | None = None
 
 
 class GraphEdge(BaseModel):
@@ -186,6 +215,42 @@ class TechniqueGraph(BaseModel):
     edges: list[GraphEdge]
 
 
+class GraphNodeAnalytics(BaseModel):
+    id: str
+    case_study_count: int
+    degree: int
+    strength: int
+    degree_centrality: float
+    betweenness: float
+    eigenvector: float
+    community: int
+
+
+class GraphEdgeAnalytics(BaseModel):
+    source: str
+    target: str
+    weight: int
+    jaccard: float
+    pmi: float
+    npmi: float
+
+
+class GraphCommunity(BaseModel):
+    id: int
+    size: int
+    technique_ids: list[str]
+
+
+class TechniqueGraphAnalytics(BaseModel):
+    granularity: str
+    data_version: str
+    case_study_count: int
+    modularity: float
+    nodes: list[GraphNodeAnalytics]
+    edges: list[GraphEdgeAnalytics]
+    communities: list[GraphCommunity]
+
+
 # ── Executive Report Models ──────────────────────────────────────────
 
 
@@ -313,3 +378,35 @@ class ExerciseDetail(BaseModel):
     hints: list[str]
     solution: ExerciseSolution
     false_positive_notes: str
+
+
+class SearchTerm(BaseModel):
+    id: int
+    technique_id: str
+    source: str
+    search_term: str
+    origin: str
+    enabled: bool
+    queries: int
+    hits: int
+    results: int
+    hit_rate: float | None
+    last_used_at: float | None
+    created_at: str
+
+
+class SearchTermCreate(BaseModel):
+    technique_id: str
+    search_term: str
+    sources: list[str] | None = None
+    origin: str = "manual"
+
+
+class SearchTermUpdate(BaseModel):
+    enabled: bool | None = None
+    search_term: str | None = None
+
+
+class SearchTermSuggestion(BaseModel):
+    search_term: str
+    score: float
@@ -0,0 +1,196 @@
+"""SQL statement counting and slow-query logging.
+
+`get_db` opens its connection as an `InstrumentedConnection`, which times
+every statement run through `execute`/`executemany` (fetching the rows
+included). While a request is tracked (`track_queries`), its statements and
+their time are added to that request's `QueryStats`; the HTTP middleware
+reports them in the Server-Timing header and aggregates them per route.
+
+Statements slower than SLOW_QUERY_MS to run are logged with their
+EXPLAIN QUERY PLAN and kept in a short list of recent slow queries.
+Process-wide totals are also exported as Prometheus metrics.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator
+
+from .config import SLOW_QUERY_MS
+from .prometheus import Counter
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_HISTORY = 50
+
+DB_QUERIES = Counter("atlas_db_queries_total", "SQL statements executed")
+DB_QUERY_SECONDS = Counter("atlas_db_query_seconds_total", "Time spent running SQL statements and fetching their rows")
+DB_SLOW_QUERIES = Counter("atlas_db_slow_queries_total", "SQL statements slower than the slow-query threshold")
+ROUTE_QUERIES = Counter(
+    "atlas_db_route_queries_total", "SQL statements executed by requests, per route", ("method", "route")
+)
+ROUTE_QUERY_SECONDS = Counter(
+    "atlas_db_route_query_seconds_total", "Time spent in SQLite by requests, per route", ("method", "route")
+)
+
+
+class QueryStats:
+    """Statements run and time spent in SQLite on behalf of one request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_lock = threading.Lock()
+_routes: dict[tuple[str, str], dict] = {}
+_slow_queries: deque[dict] = deque(maxlen=SLOW_QUERY_HISTORY)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Attribute statements run in this context (and threads it hands work to) to one QueryStats."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _add_time(stats: QueryStats | None, seconds: float) -> None:
+    DB_QUERY_SECONDS.inc(seconds)
+    if stats is not None:
+        stats.seconds += seconds
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that adds the time spent fetching rows to the request that ran it."""
+
+    stats: QueryStats | None = None
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _add_time(self.stats, time.perf_counter() - start)
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(*args, **kwargs)
+        finally:
+            _add_time(self.stats, time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _add_time(self.stats, time.perf_counter() - start)
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return super().__next__()
+        finally:
+            _add_time(self.stats, time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection that counts and times statements (see module docstring)."""
+
+    def _run(self, method: str, sql: str, parameters) -> sqlite3.Cursor:
+        stats = _current.get()
+        cursor = self.cursor(_TimedCursor)
+        cursor.stats = stats
+        start = time.perf_counter()
+        try:
+            getattr(cursor, method)(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_QUERIES.inc()
+            _add_time(stats, elapsed)
+            if stats is not None:
+                stats.count += 1
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            DB_SLOW_QUERIES.inc()
+            self._log_slow(sql, parameters if method == "execute" else None, elapsed)
+        return cursor
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self._run("execute", sql, parameters)
+
+    def executemany(self, sql: str, parameters) -> sqlite3.Cursor:
+        return self._run("executemany", sql, parameters)
+
+    def _log_slow(self, sql: str, parameters, elapsed: float) -> None:
+        plan: list[str] = []
+        if parameters is not None:
+            try:
+                # Plain Connection.execute so the EXPLAIN itself is not counted
+                plan = [
+                    r[3] for r in sqlite3.Connection.execute(self, f"EXPLAIN QUERY PLAN {sql}", parameters)
+                ]
+            except sqlite3.Error:
+                pass
+        statement = " ".join(sql.split())
+        logger.warning(
+            "Slow query (%.1f ms): %s%s",
+            elapsed * 1000,
+            statement,
+            "".join(f"\n  {line}" for line in plan),
+        )
+        with _lock:
+            _slow_queries.append({
+                "sql": statement,
+                "duration_ms": round(elapsed * 1000, 3),
+                "plan": plan,
+                "at": datetime.now(timezone.utc).isoformat(),
+            })
+
+
+def record_request(method: str, route: str, stats: QueryStats) -> None:
+    """Add one finished request's statements to its route's totals."""
+    with _lock:
+        totals = _routes.setdefault((method, route), {"requests": 0, "queries": 0, "seconds": 0.0, "max_queries": 0})
+        totals["requests"] += 1
+        totals["queries"] += stats.count
+        totals["seconds"] += stats.seconds
+        totals["max_queries"] = max(totals["max_queries"], stats.count)
+    ROUTE_QUERIES.inc(stats.count, method=method, route=route)
+    ROUTE_QUERY_SECONDS.inc(stats.seconds, method=method, route=route)
+
+
+def server_timing(stats: QueryStats) -> str:
+    """Server-Timing header value for a request's database work."""
+    return f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+def query_metrics() -> dict:
+    """Per-route statement counts and time, plus the most recent slow queries."""
+    with _lock:
+        routes = [
+            {
+                "method": method,
+                "route": route,
+                "requests": t["requests"],
+                "queries": t["queries"],
+                "avg_queries": round(t["queries"] / t["requests"], 2),
+                "max_queries": t["max_queries"],
+                "query_time_ms": round(t["seconds"] * 1000, 3),
+                "avg_query_time_ms": round(t["seconds"] * 1000 / t["requests"], 3),
+            }
+            for (method, route), t in sorted(_routes.items(), key=lambda item: (item[0][1], item[0][0]))
+        ]
+        slow = list(reversed(_slow_queries))
+    return {"slow_query_ms": SLOW_QUERY_MS, "routes": routes, "slow_queries": slow}
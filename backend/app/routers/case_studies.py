@@ -9,6 +9,7 @@ from app.models.atlas import (
     ProcedureStep,
     Reference,
 )
+from app.routers.listing import MAX_PAGE_SIZE, list_response, page_clause, parse_fields, split_page
 
 router = APIRouter(tags=["case_studies"])
 
@@ -17,31 +18,38 @@ router = APIRouter(tags=["case_studies"])
 def list_case_studies(
     type: Optional[str] = Query(None),
     technique_id: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
 ):
     conn = get_db()
 
+    selected = parse_fields(fields, CaseStudySummary)
+    columns = ", ".join(f"cs.{f}" for f in selected)
+    after, limit_clause, page_params = page_clause("cs.id", cursor, limit)
+
     if technique_id:
-        rows = conn.execute(
-            "SELECT DISTINCT cs.id, cs.name, cs.incident_date, cs.case_study_type, cs.target "
-            "FROM case_studies cs "
-            "JOIN case_study_procedures csp ON cs.id = csp.case_study_id "
-            "WHERE csp.technique_id = ? "
-            "ORDER BY cs.id",
-            (technique_id,),
-        ).fetchall()
+        conditions = ["csp.technique_id = ?"]
+        params = [technique_id]
+        source = "case_studies cs JOIN case_study_procedures csp ON cs.id = csp.case_study_id"
     elif type:
-        rows = conn.execute(
-            "SELECT id, name, incident_date, case_study_type, target "
-            "FROM case_studies WHERE case_study_type = ? ORDER BY id",
-            (type,),
-        ).fetchall()
+        conditions = ["cs.case_study_type = ?"]
+        params = [type]
+        source = "case_studies cs"
     else:
-        rows = conn.execute(
-            "SELECT id, name, incident_date, case_study_type, target "
-            "FROM case_studies ORDER BY id"
-        ).fetchall()
+        conditions, params = [], []
+        source = "case_studies cs"
+    if after:
+        conditions.append(after)
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+    rows = conn.execute(
+        f"SELECT DISTINCT {columns} FROM {source} {where} ORDER BY cs.id {limit_clause}",
+        params + page_params,
+    ).fetchall()
+    rows, next_cursor = split_page(rows, limit)
 
-    return [CaseStudySummary(**dict(r)) for r in rows]
+    return list_response([dict(r) for r in rows], CaseStudySummary, selected, next_cursor)
 
 
 @router.get("/case-studies/{case_study_id}", response_model=CaseStudyDetail)
@@ -10,6 +10,7 @@ from app.models.atlas import (
     FlowNode,
     FlowEdge,
 )
+from app.routers.listing import MAX_PAGE_SIZE, decode_cursor, list_response, parse_fields, split_page
 from app.services.killchain_service import (
     get_killchain_with_flow,
     list_killchains,
@@ -58,9 +59,22 @@ def seed_killchains():
 def get_killchains(
     category: Optional[str] = Query(None),
     severity: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
 ):
     conn = get_db()
-    return list_killchains(conn, category=category, severity=severity)
+    selected = parse_fields(fields, KillchainSummary)
+    rows = list_killchains(
+        conn,
+        category=category,
+        severity=severity,
+        fields=selected,
+        after=decode_cursor(cursor, int),
+        limit=limit + 1 if limit else None,
+    )
+    rows, next_cursor = split_page(rows, limit)
+    return list_response(rows, KillchainSummary, selected, next_cursor)
 
 
 @router.get("/killchains/{killchain_id}/export")
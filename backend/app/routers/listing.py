@@ -0,0 +1,108 @@
+"""Keyset pagination and sparse fieldsets shared by the list endpoints.
+
+List endpoints order by id. With `limit`, they return at most that many
+items after `cursor` and, when more remain, put the cursor of the next page
+in the X-Next-Cursor response header. Cursors are opaque tokens encoding the
+last id of the page, so pages stay consistent while rows are added and a
+page costs an index range scan however deep it is.
+
+`fields` (comma-separated) limits each item to those attributes of the
+response model; endpoints select only the matching columns. `id` is always
+included.
+"""
+
+import base64
+import binascii
+import json
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], id_type: type = str) -> Any:
+    """Return the last id encoded in `cursor`, or None without one.
+
+    The id must be of `id_type` (str or int, as the endpoint's id column).
+    """
+    if not cursor:
+        return None
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if type(after) is not id_type:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after
+
+
+def parse_fields(fields: Optional[str], model: type[BaseModel]) -> list[str]:
+    """Return the requested fields of `model` in model order, or all of them."""
+    if fields is None:
+        return list(model.model_fields)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return [f for f in model.model_fields if f in requested or f == "id"]
+
+
+def page_clause(
+    column: str,
+    cursor: Optional[str],
+    limit: Optional[int],
+    id_type: type = str,
+) -> tuple[str, str, list]:
+    """Return (condition or "", LIMIT clause or "", params) for a keyset page.
+
+    One extra row is fetched to tell whether another page follows.
+    """
+    after = decode_cursor(cursor, id_type)
+    condition = f"{column} > ?" if after is not None else ""
+    params = [after] if after is not None else []
+    if limit is None:
+        return condition, "", params
+    return condition, "LIMIT ?", params + [limit + 1]
+
+
+def split_page(items: list, limit: Optional[int], key: str = "id") -> tuple[list, Optional[str]]:
+    """Trim the extra row fetched by `page_clause`; return (page, next cursor)."""
+    if limit is None or len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1][key])
+
+
+@lru_cache(maxsize=256)
+def _partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Fields",
+        __module__=model.__module__,
+        **{f: (model.model_fields[f].annotation, model.model_fields[f]) for f in fields},
+    )
+
+
+def list_response(
+    items: list[dict],
+    model: type[BaseModel],
+    fields: list[str],
+    next_cursor: Optional[str] = None,
+) -> JSONResponse:
+    """Serialize `items` through `model` trimmed to `fields`, with the next-page header."""
+    if list(model.model_fields) != fields:
+        model = _partial_model(model, tuple(fields))
+    content = [
+        model(**{f: item[f] for f in fields if f in item}).model_dump(mode="json", exclude_unset=True)
+        for item in items
+    ]
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return JSONResponse(content, headers=headers)
@@ -9,9 +9,9 @@ from app.models.atlas import (
     MitigationDetail,
     TacticDetail,
     TacticSummary,
-    TechniqueRef,
     TechniqueSummary,
 )
+from app.routers.listing import MAX_PAGE_SIZE, list_response, page_clause, parse_fields, split_page
 
 router = APIRouter(tags=["matrix"])
 
@@ -124,47 +124,60 @@ def get_tactic(tactic_id: str):
 
 
 @router.get("/mitigations", response_model=list[MitigationDetail])
-def list_mitigations(category: Optional[str] = Query(None)):
+def list_mitigations(
+    category: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+):
     conn = get_db()
 
+    selected = parse_fields(fields, MitigationDetail)
+    columns = [f for f in selected if f not in ("lifecycle_stages", "techniques")]
+    after, limit_clause, page_params = page_clause("id", cursor, limit)
+
+    conditions, params = [], []
     if category:
-        rows = conn.execute(
-            "SELECT * FROM mitigations WHERE category = ? ORDER BY id",
-            (category,),
-        ).fetchall()
-    else:
-        rows = conn.execute("SELECT * FROM mitigations ORDER BY id").fetchall()
-
-    results = []
-    for r in rows:
-        # Get lifecycle stages
-        stage_rows = conn.execute(
-            "SELECT lifecycle_stage FROM mitigation_lifecycle WHERE mitigation_id = ?",
-            (r["id"],),
-        ).fetchall()
-        lifecycle_stages = [s["lifecycle_stage"] for s in stage_rows]
+        conditions.append("category = ?")
+        params.append(category)
+    if after:
+        conditions.append(after)
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-        # Get techniques
-        tech_rows = conn.execute(
-            "SELECT t.id, t.name, mt.usage "
-            "FROM mitigation_techniques mt "
-            "JOIN techniques t ON mt.technique_id = t.id "
-            "WHERE mt.mitigation_id = ?",
-            (r["id"],),
-        ).fetchall()
-        techniques = [TechniqueRef(**dict(tr)) for tr in tech_rows]
-
-        results.append(
-            MitigationDetail(
-                id=r["id"],
-                name=r["name"],
-                description=r["description"],
-                category=r["category"],
-                attck_id=r["attck_id"],
-                attck_url=r["attck_url"],
-                lifecycle_stages=lifecycle_stages,
-                techniques=techniques,
+    rows = conn.execute(
+        f"SELECT {', '.join(columns)} FROM mitigations {where} ORDER BY id {limit_clause}",
+        params + page_params,
+    ).fetchall()
+    rows, next_cursor = split_page(rows, limit)
+
+    results = {r["id"]: dict(r) for r in rows}
+    ids = list(results)
+    placeholders = ",".join("?" for _ in ids)
+
+    # Lifecycle stages and techniques of the whole page, one query each
+    if "lifecycle_stages" in selected:
+        for item in results.values():
+            item["lifecycle_stages"] = []
+        for sr in conn.execute(
+            f"SELECT mitigation_id, lifecycle_stage FROM mitigation_lifecycle "
+            f"WHERE mitigation_id IN ({placeholders}) ORDER BY mitigation_id, lifecycle_stage",
+            ids,
+        ).fetchall():
+            results[sr["mitigation_id"]]["lifecycle_stages"].append(sr["lifecycle_stage"])
+
+    if "techniques" in selected:
+        for item in results.values():
+            item["techniques"] = []
+        for tr in conn.execute(
+            f"SELECT mt.mitigation_id, t.id, t.name, mt.usage "
+            f"FROM mitigation_techniques mt "
+            f"JOIN techniques t ON mt.technique_id = t.id "
+            f"WHERE mt.mitigation_id IN ({placeholders}) "
+            f"ORDER BY mt.mitigation_id, mt.technique_id",
+            ids,
+        ).fetchall():
+            results[tr["mitigation_id"]]["techniques"].append(
+                {"id": tr["id"], "name": tr["name"], "usage": tr["usage"]}
             )
-        )
 
-    return results
+    return list_response(list(results.values()), MitigationDetail, selected, next_cursor)
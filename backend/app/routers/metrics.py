@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.query_metrics import query_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics/queries")
+def get_query_metrics():
+    """SQL statement counts and time per route since startup, and recent slow queries."""
+    return query_metrics()
@@ -1,9 +1,26 @@
 """OSINT API routes for technique enrichment."""
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-
-from app.database import get_db
-from app.services.osint import fetch_osint, get_cached_osint, clear_cache
+import json
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.database import get_db, run_db
+from app.models.atlas import SearchTerm, SearchTermCreate, SearchTermSuggestion, SearchTermUpdate
+from app.services.circuit_breaker import breaker_status
+from app.services.osint import OSINT_SOURCES, expire_cache, fetch_osint, get_cached_osint, stream_osint
+from app.services.osint_prefetch import claim_run, get_prefetch_status, run_prefetch
+from app.services.osint_store import epoch_to_iso, get_osint_stats, load_new_artifacts
+from app.services.search_terms import (
+    add_search_term,
+    delete_search_term,
+    list_search_terms,
+    suggest_search_terms,
+    update_search_term,
+)
 
 router = APIRouter(tags=["osint"])
 
@@ -19,45 +36,107 @@ def _get_technique_name(technique_id: str) -> str:
     return row["name"]
 
 
-# NOTE: /osint/status must be defined BEFORE /osint/{technique_id}
+# NOTE: /osint/status, /osint/prefetch and /osint/search-terms must be defined BEFORE /osint/{technique_id}
 # to avoid FastAPI matching "status" as a technique_id.
 
-@router.get("/osint/status")
-async def osint_status():
-    """Get OSINT coverage statistics."""
-    conn = get_db()
-
-    total_techniques = conn.execute("SELECT COUNT(*) as c FROM techniques").fetchone()["c"]
+def _coverage_stats(conn) -> dict:
+    stats = get_osint_stats(conn)
+    return {
+        "total_techniques": stats.get("total_techniques", 0),
+        "techniques_with_github": stats.get("techniques_with_github", 0),
+        "techniques_with_osint": stats.get("techniques_with_osint", 0),
+        "total_github_repos": stats.get("github_links", 0),
+        "total_arxiv_papers": stats.get("arxiv_links", 0),
+        "total_nvd_cves": stats.get("nvd_links", 0),
+        "last_refresh": epoch_to_iso(stats.get("last_refresh")),
+    }
 
-    techniques_with_github = conn.execute(
-        "SELECT COUNT(DISTINCT technique_id) as c FROM github_repos"
-    ).fetchone()["c"]
 
-    techniques_with_osint = conn.execute(
-        "SELECT COUNT(DISTINCT technique_id) as c FROM osint_results"
-    ).fetchone()["c"]
+@router.get("/osint/status")
+async def osint_status():
+    """Get OSINT coverage statistics and per-source circuit breaker state."""
+    stats = await run_db(_coverage_stats, get_db())
+    return {**stats, "sources": breaker_status()}
 
-    total_repos = conn.execute("SELECT COUNT(*) as c FROM github_repos").fetchone()["c"]
-    total_arxiv = conn.execute(
-        "SELECT COUNT(*) as c FROM osint_results WHERE source = 'arxiv'"
-    ).fetchone()["c"]
-    total_nvd = conn.execute(
-        "SELECT COUNT(*) as c FROM osint_results WHERE source = 'nvd'"
-    ).fetchone()["c"]
 
-    latest = conn.execute(
-        "SELECT MAX(fetched_at) as latest FROM osint_results"
-    ).fetchone()["latest"]
+@router.post("/osint/prefetch", status_code=202)
+async def start_prefetch(
+    background_tasks: BackgroundTasks,
+    sources: Optional[list[str]] = Query(None),
+    restart: bool = Query(False),
+):
+    """Enrich every technique in the background, resuming an unfinished run.
 
-    return {
-        "total_techniques": total_techniques,
-        "techniques_with_github": techniques_with_github,
-        "techniques_with_osint": techniques_with_osint,
-        "total_github_repos": total_repos,
-        "total_arxiv_papers": total_arxiv,
-        "total_nvd_cves": total_nvd,
-        "last_refresh": latest,
-    }
+    Requested sources the unfinished run does not cover are added to it and
+    listed in `added_sources`.
+    """
+    conn = get_db()
+    try:
+        run_id, added_sources = await claim_run(conn, sources, restart=restart)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(run_prefetch, conn, run_id)
+    return {**await run_db(get_prefetch_status, conn, run_id), "added_sources": added_sources}
+
+
+@router.get("/osint/prefetch/status")
+async def prefetch_status():
+    """Get progress, throughput and ETA of the latest OSINT prefetch run."""
+    status = await run_db(get_prefetch_status, get_db())
+    if status is None:
+        raise HTTPException(status_code=404, detail="No OSINT prefetch run found")
+    return status
+
+
+@router.get("/osint/search-terms", response_model=list[SearchTerm])
+async def get_search_terms(
+    technique_id: Optional[str] = None,
+    source: Optional[str] = None,
+    enabled: Optional[bool] = None,
+):
+    """List OSINT search terms with their query count and hit rate."""
+    return await run_db(list_search_terms, get_db(), technique_id, source, enabled)
+
+
+@router.get("/osint/search-terms/suggestions", response_model=list[SearchTermSuggestion])
+async def get_search_term_suggestions(technique_id: str, limit: int = Query(10, ge=1, le=50)):
+    """Suggest search terms mined from a technique's name and description."""
+    await run_db(_get_technique_name, technique_id)
+    return await run_db(suggest_search_terms, get_db(), technique_id, limit)
+
+
+@router.post("/osint/search-terms", response_model=list[SearchTerm], status_code=201)
+async def create_search_term(body: SearchTermCreate):
+    """Add a search term for a technique (for all sources unless given)."""
+    await run_db(_get_technique_name, body.technique_id)
+    try:
+        return await run_db(
+            add_search_term, get_db(), body.technique_id, body.search_term, body.sources, body.origin
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.patch("/osint/search-terms/{term_id}", response_model=SearchTerm)
+async def patch_search_term(term_id: int, body: SearchTermUpdate):
+    """Enable, disable or rename a search term."""
+    try:
+        term = await run_db(update_search_term, get_db(), term_id, body.enabled, body.search_term)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if term is None:
+        raise HTTPException(status_code=404, detail=f"Search term {term_id} not found")
+    return term
+
+
+@router.delete("/osint/search-terms/{term_id}", status_code=204)
+async def remove_search_term(term_id: int):
+    """Delete a search term."""
+    if not await run_db(delete_search_term, get_db(), term_id):
+        raise HTTPException(status_code=404, detail=f"Search term {term_id} not found")
 
 
 @router.get("/osint/{technique_id}")
@@ -67,11 +146,11 @@ async def get_osint(technique_id: str, background_tasks: BackgroundTasks):
     Returns cached results immediately if available.
     Triggers a background refresh if cache is stale or empty.
     """
-    technique_name = _get_technique_name(technique_id)
+    technique_name = await run_db(_get_technique_name, technique_id)
     conn = get_db()
 
     # Try cache first
-    cached = get_cached_osint(conn, technique_id)
+    cached = await run_db(get_cached_osint, conn, technique_id)
     if cached is not None:
         return cached
 
@@ -80,13 +159,66 @@ async def get_osint(technique_id: str, background_tasks: BackgroundTasks):
     return result
 
 
+@router.get("/osint/{technique_id}/new")
+async def get_new_osint(technique_id: str, days: int = Query(7, ge=1, le=90)):
+    """Get OSINT results first seen for a technique within the last `days` days."""
+    await run_db(_get_technique_name, technique_id)
+    since = time.time() - days * 86400
+    results = await run_db(load_new_artifacts, get_db(), technique_id, since)
+    return {"technique_id": technique_id, "since": epoch_to_iso(since), "results": results}
+
+
 @router.post("/osint/{technique_id}/refresh")
 async def refresh_osint(technique_id: str):
-    """Force refresh OSINT data for a technique (clears cache and re-fetches)."""
-    technique_name = _get_technique_name(technique_id)
+    """Force refresh OSINT data for a technique (expires the cache and re-fetches)."""
+    technique_name = await run_db(_get_technique_name, technique_id)
     conn = get_db()
 
-    clear_cache(conn, technique_id)
+    await run_db(expire_cache, conn, technique_id)
 
     result = await fetch_osint(conn, technique_id, technique_name)
     return result
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/osint/{technique_id}/stream")
+async def stream_osint_results(technique_id: str):
+    """Stream OSINT results for a technique as Server-Sent Events.
+
+    Emits one `source` event per source as soon as its results are available
+    (immediately when cached), then a `summary` event with per-source counts.
+    """
+    technique_name = await run_db(_get_technique_name, technique_id)
+    conn = get_db()
+    cached = await run_db(get_cached_osint, conn, technique_id)
+
+    async def events():
+        started = time.monotonic()
+        counts = {}
+        if cached is not None:
+            for source, (key, _) in OSINT_SOURCES.items():
+                counts[key] = len(cached[key])
+                yield _sse("source", {"source": source, "key": key, "results": cached[key], "error": None})
+            last_fetched = cached["last_fetched"]
+        else:
+            async for event in stream_osint(conn, technique_id, technique_name):
+                counts[event["key"]] = len(event["results"])
+                yield _sse("source", event)
+            last_fetched = datetime.now(timezone.utc).isoformat()
+
+        yield _sse("summary", {
+            "technique_id": technique_id,
+            "cached": cached is not None,
+            "last_fetched": last_fetched,
+            "counts": counts,
+            "elapsed_ms": round((time.monotonic() - started) * 1000),
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,38 +1,61 @@
-import sqlite3
-from typing import Optional
+from typing import Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
 from app.database import get_db
 from app.models.atlas import (
-    CaseStudySummary,
     GraphEdge,
     GraphNode,
-    MitigationRef,
+    RelatedTechnique,
     TechniqueDetail,
     TechniqueGraph,
+    TechniqueGraphAnalytics,
+    TechniqueListItem,
     TechniqueSummary,
 )
+from app.routers.listing import MAX_PAGE_SIZE, list_response, page_clause, parse_fields, split_page
+from app.services.graph_analytics import get_analytics
+from app.services.graph_layout import get_layout
+from app.services.technique_details import DETAIL_EXPANSIONS, load_technique_details
+from app.services.technique_graph import load_graph
+from app.services.technique_similarity import RELATED_TOP_K, load_related
 
 router = APIRouter(tags=["techniques"])
 
 
-def _technique_tactic_ids(conn: sqlite3.Connection, technique_id: str) -> list[str]:
-    rows = conn.execute(
-        "SELECT tactic_id FROM technique_tactics WHERE technique_id = ?",
-        (technique_id,),
-    ).fetchall()
-    return [r["tactic_id"] for r in rows]
+def _split_param(value: Optional[str]) -> list[str]:
+    """Split a comma-separated query parameter, dropping blanks and duplicates."""
+    return list(dict.fromkeys(v.strip() for v in (value or "").split(",") if v.strip()))
 
 
-@router.get("/techniques", response_model=list[TechniqueSummary])
+@router.get("/techniques", response_model=list[TechniqueListItem])
 def list_techniques(
     tactic_id: Optional[str] = Query(None),
     maturity: Optional[str] = Query(None),
     subtechniques: Optional[bool] = Query(None),
+    ids: Optional[str] = Query(None, description="Comma-separated technique ids"),
+    expand: Optional[str] = Query(None, description="Comma-separated: " + ", ".join(DETAIL_EXPANSIONS)),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
 ):
+    """List techniques, optionally only `ids`, with `expand`ed relations of each.
+
+    Paginated with `limit`/`cursor` and trimmed with `fields` (see
+    routers.listing).
+    """
     conn = get_db()
 
+    expansions = _split_param(expand)
+    unknown = set(expansions) - set(DETAIL_EXPANSIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}",
+        )
+    selected = parse_fields(fields, TechniqueSummary)
+    columns = [f for f in selected if f != "tactic_ids"]
+
     conditions: list[str] = []
     params: list[str | bool] = []
 
@@ -47,240 +70,115 @@ def list_techniques(
     if subtechniques is not None:
         conditions.append("te.is_subtechnique = ?")
         params.append(subtechniques)
+    if ids is not None:
+        id_list = _split_param(ids)
+        conditions.append("te.id IN ({})".format(",".join("?" for _ in id_list)))
+        params.extend(id_list)
+    after, limit_clause, page_params = page_clause("te.id", cursor, limit)
+    if after:
+        conditions.append(after)
 
     where = ""
     if conditions:
         where = "WHERE " + " AND ".join(conditions)
 
     rows = conn.execute(
-        f"SELECT te.id, te.name, te.is_subtechnique, te.maturity "
-        f"FROM techniques te {where} ORDER BY te.id",
-        params,
+        f"SELECT {', '.join('te.' + c for c in columns)} "
+        f"FROM techniques te {where} ORDER BY te.id {limit_clause}",
+        params + page_params,
     ).fetchall()
+    rows, next_cursor = split_page(rows, limit)
 
-    results = []
-    for r in rows:
-        tactic_ids = _technique_tactic_ids(conn, r["id"])
-        results.append(
-            TechniqueSummary(
-                id=r["id"],
-                name=r["name"],
-                is_subtechnique=bool(r["is_subtechnique"]),
-                maturity=r["maturity"],
-                tactic_ids=tactic_ids,
-            )
-        )
-    return results
+    items = [dict(r) for r in rows]
+    if "tactic_ids" in selected or expansions:
+        details = load_technique_details(conn, [r["id"] for r in rows], expansions)
+        for item in items:
+            detail = details[item["id"]]
+            item.update({k: detail[k] for k in ("tactic_ids", *expansions)})
+    return list_response(items, TechniqueListItem, selected + expansions, next_cursor)
 
 
 @router.get("/techniques/graph", response_model=TechniqueGraph)
-def get_technique_graph():
-    """Return a graph of technique co-occurrence in case studies."""
+def get_technique_graph(
+    granularity: Literal["parent", "subtechnique"] = Query("parent"),
+    min_weight: int = Query(1, ge=1),
+    top_k: Optional[int] = Query(None, ge=1),
+    tactic_id: Optional[list[str]] = Query(None),
+):
+    """Return a graph of technique co-occurrence in case studies.
+
+    Edge weights are precomputed into technique_cooccurrence at ingestion
+    (see services.technique_graph). `granularity=subtechnique` keeps
+    subtechniques as separate nodes, `min_weight` drops weaker edges,
+    `top_k` keeps each node's heaviest edges and `tactic_id` (repeatable)
+    limits nodes to those tactics. Node x/y come from a layout of the
+    full graph computed once per data version.
+    """
     conn = get_db()
+    graph = load_graph(conn, granularity, min_weight, top_k, tactic_id)
+    layout = get_layout(conn, granularity)
+    return TechniqueGraph(
+        nodes=[GraphNode(**n, x=layout[n["id"]][0], y=layout[n["id"]][1]) for n in graph["nodes"]],
+        edges=[GraphEdge(**e) for e in graph["edges"]],
+    )
 
-    # Get parent techniques only (not subtechniques) with their case study counts
-    tech_rows = conn.execute(
-        "SELECT t.id, t.name, t.maturity, "
-        "  (SELECT COUNT(DISTINCT csp.case_study_id) "
-        "   FROM case_study_procedures csp WHERE csp.technique_id = t.id) AS case_study_count "
-        "FROM techniques t "
-        "WHERE t.is_subtechnique = 0 "
-        "ORDER BY t.id"
-    ).fetchall()
-
-    nodes: list[GraphNode] = []
-    for r in tech_rows:
-        tactic_ids = _technique_tactic_ids(conn, r["id"])
-        nodes.append(
-            GraphNode(
-                id=r["id"],
-                name=r["name"],
-                tactic_ids=tactic_ids,
-                maturity=r["maturity"],
-                case_study_count=r["case_study_count"],
-            )
-        )
-
-    # Find co-occurring technique pairs in case studies.
-    # We resolve subtechniques to their parent for edge aggregation so that
-    # the graph only shows parent-level connections.
-    edge_rows = conn.execute(
-        "SELECT t1_parent, t2_parent, COUNT(*) AS weight FROM ("
-        "  SELECT DISTINCT"
-        "    COALESCE(p1.id, a.technique_id) AS t1_parent,"
-        "    COALESCE(p2.id, b.technique_id) AS t2_parent,"
-        "    a.case_study_id"
-        "  FROM case_study_procedures a"
-        "  JOIN case_study_procedures b"
-        "    ON a.case_study_id = b.case_study_id"
-        "  LEFT JOIN techniques t1 ON a.technique_id = t1.id"
-        "  LEFT JOIN techniques p1 ON t1.parent_technique_id = p1.id"
-        "  LEFT JOIN techniques t2 ON b.technique_id = t2.id"
-        "  LEFT JOIN techniques p2 ON t2.parent_technique_id = p2.id"
-        "  WHERE COALESCE(p1.id, a.technique_id) < COALESCE(p2.id, b.technique_id)"
-        ") sub "
-        "GROUP BY t1_parent, t2_parent "
-        "ORDER BY weight DESC"
-    ).fetchall()
 
-    # Build a set of valid parent technique IDs for filtering
-    parent_ids = {n.id for n in nodes}
-    edges: list[GraphEdge] = []
-    for r in edge_rows:
-        src = r["t1_parent"]
-        tgt = r["t2_parent"]
-        if src in parent_ids and tgt in parent_ids:
-            edges.append(GraphEdge(source=src, target=tgt, weight=r["weight"]))
+@router.get("/techniques/graph/analytics", response_model=TechniqueGraphAnalytics)
+def get_technique_graph_analytics(granularity: Literal["parent", "subtechnique"] = Query("parent")):
+    """Return centrality, communities and PMI/Jaccard-normalized edge weights.
 
-    return TechniqueGraph(nodes=nodes, edges=edges)
+    Computed from the co-occurrence matrix once per ingested data version.
+    """
+    return get_analytics(get_db(), granularity)
 
 
 @router.get("/techniques/{technique_id}/export")
 def export_technique(technique_id: str):
     """Export a technique as comprehensive JSON for download."""
-    conn = get_db()
-
-    row = conn.execute(
-        "SELECT * FROM techniques WHERE id = ?", (technique_id,)
-    ).fetchone()
-    if not row:
+    detail = load_technique_details(get_db(), [technique_id]).get(technique_id)
+    if not detail:
         raise HTTPException(status_code=404, detail="Technique not found")
 
-    tactic_ids = _technique_tactic_ids(conn, technique_id)
-
-    # Tactic names
-    tactic_rows = conn.execute(
-        "SELECT id, name FROM tactics WHERE id IN ({})".format(
-            ",".join("?" for _ in tactic_ids)
-        ),
-        tactic_ids,
-    ).fetchall() if tactic_ids else []
-    tactic_map = {r["id"]: r["name"] for r in tactic_rows}
-
-    # Subtechniques
-    sub_rows = conn.execute(
-        "SELECT id, name, maturity FROM techniques WHERE parent_technique_id = ? ORDER BY id",
-        (technique_id,),
-    ).fetchall()
-
-    # Mitigations
-    mit_rows = conn.execute(
-        "SELECT m.id, m.name, m.category, mt.usage "
-        "FROM mitigation_techniques mt "
-        "JOIN mitigations m ON mt.mitigation_id = m.id "
-        "WHERE mt.technique_id = ?",
-        (technique_id,),
-    ).fetchall()
-
-    # Case studies
-    cs_rows = conn.execute(
-        "SELECT DISTINCT cs.id, cs.name, cs.incident_date, cs.case_study_type, cs.target "
-        "FROM case_study_procedures csp "
-        "JOIN case_studies cs ON csp.case_study_id = cs.id "
-        "WHERE csp.technique_id = ?",
-        (technique_id,),
-    ).fetchall()
-
     export_data = {
         "export_type": "technique",
-        "id": row["id"],
-        "name": row["name"],
-        "description": row["description"],
-        "is_subtechnique": bool(row["is_subtechnique"]),
-        "parent_technique_id": row["parent_technique_id"],
-        "maturity": row["maturity"],
-        "attck_id": row["attck_id"],
-        "attck_url": row["attck_url"],
-        "created_date": row["created_date"],
-        "modified_date": row["modified_date"],
-        "tactics": [
-            {"id": tid, "name": tactic_map.get(tid)} for tid in tactic_ids
-        ],
+        **{
+            k: detail[k]
+            for k in (
+                "id", "name", "description", "is_subtechnique", "parent_technique_id", "maturity",
+                "attck_id", "attck_url", "created_date", "modified_date", "tactics",
+            )
+        },
         "subtechniques": [
             {"id": sr["id"], "name": sr["name"], "maturity": sr["maturity"]}
-            for sr in sub_rows
-        ],
-        "mitigations": [
-            {"id": mr["id"], "name": mr["name"], "category": mr["category"], "usage": mr["usage"]}
-            for mr in mit_rows
-        ],
-        "case_studies": [
-            {"id": cr["id"], "name": cr["name"], "incident_date": cr["incident_date"],
-             "case_study_type": cr["case_study_type"], "target": cr["target"]}
-            for cr in cs_rows
+            for sr in detail["subtechniques"]
         ],
+        "mitigations": detail["mitigations"],
+        "case_studies": detail["case_studies"],
     }
     return export_data
 
 
-@router.get("/techniques/{technique_id}", response_model=TechniqueDetail)
-def get_technique(technique_id: str):
-    conn = get_db()
+@router.get("/techniques/{technique_id}/related", response_model=list[RelatedTechnique])
+def get_related_techniques(technique_id: str, limit: int = Query(10, ge=1, le=RELATED_TOP_K)):
+    """Return the techniques most similar to this one, best first.
 
-    row = conn.execute(
-        "SELECT * FROM techniques WHERE id = ?", (technique_id,)
-    ).fetchone()
-    if not row:
+    Scores combine description text, case study co-occurrence, shared
+    mitigations and shared tactics, and are precomputed at ingestion.
+    """
+    conn = get_db()
+    if not conn.execute("SELECT 1 FROM techniques WHERE id = ?", (technique_id,)).fetchone():
         raise HTTPException(status_code=404, detail="Technique not found")
+    return load_related(conn, technique_id, limit)
 
-    # Tactic IDs
-    tactic_ids = _technique_tactic_ids(conn, technique_id)
 
-    # Subtechniques
-    sub_rows = conn.execute(
-        "SELECT id, name, is_subtechnique, maturity "
-        "FROM techniques WHERE parent_technique_id = ? ORDER BY id",
-        (technique_id,),
-    ).fetchall()
-    subtechniques = []
-    for sr in sub_rows:
-        sub_tactic_ids = _technique_tactic_ids(conn, sr["id"])
-        subtechniques.append(
-            TechniqueSummary(
-                id=sr["id"],
-                name=sr["name"],
-                is_subtechnique=bool(sr["is_subtechnique"]),
-                maturity=sr["maturity"],
-                tactic_ids=sub_tactic_ids,
-            )
-        )
-
-    # Mitigations
-    mit_rows = conn.execute(
-        "SELECT m.id, m.name, m.category, mt.usage "
-        "FROM mitigation_techniques mt "
-        "JOIN mitigations m ON mt.mitigation_id = m.id "
-        "WHERE mt.technique_id = ?",
-        (technique_id,),
-    ).fetchall()
-    mitigations = [MitigationRef(**dict(mr)) for mr in mit_rows]
-
-    # Case studies (via procedures that reference this technique)
-    cs_rows = conn.execute(
-        "SELECT DISTINCT cs.id, cs.name, cs.incident_date, cs.case_study_type, cs.target "
-        "FROM case_study_procedures csp "
-        "JOIN case_studies cs ON csp.case_study_id = cs.id "
-        "WHERE csp.technique_id = ?",
-        (technique_id,),
-    ).fetchall()
-    case_studies = [CaseStudySummary(**dict(cr)) for cr in cs_rows]
-
-    return TechniqueDetail(
-        id=row["id"],
-        name=row["name"],
-        description=row["description"],
-        is_subtechnique=bool(row["is_subtechnique"]),
-        parent_technique_id=row["parent_technique_id"],
-        maturity=row["maturity"],
-        attck_id=row["attck_id"],
-        attck_url=row["attck_url"],
-        created_date=row["created_date"],
-        modified_date=row["modified_date"],
-        tactic_ids=tactic_ids,
-        subtechniques=subtechniques,
-        mitigations=mitigations,
-        case_studies=case_studies,
-    )
+@router.get("/techniques/{technique_id}", response_model=TechniqueDetail)
+def get_technique(technique_id: str):
+    detail = load_technique_details(
+        get_db(), [technique_id], ("subtechniques", "mitigations", "case_studies")
+    ).get(technique_id)
+    if not detail:
+        raise HTTPException(status_code=404, detail="Technique not found")
+    return TechniqueDetail(**detail)
 
 
 @router.get("/search")
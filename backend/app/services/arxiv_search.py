@@ -3,40 +3,49 @@
 import logging
 import sqlite3
 import xml.etree.ElementTree as ET
-from datetime import datetime, timezone, timedelta
 
 import httpx
 
+from ..database import run_db
+from .circuit_breaker import CircuitOpenError, get_with_retry, osint_client
+from .osint_store import canonical_arxiv_id, load_artifacts, load_fresh_artifacts, store_fetches
+from .relevance import rank_results
+from .search_terms import record_term_hits
+
 logger = logging.getLogger(__name__)
 
 ARXIV_API_URL = "https://export.arxiv.org/api/query"
 CACHE_TTL_HOURS = 24
 
+# Batch mode: distinct search terms OR'd into a single arXiv query, and the
+# number of results requested per batched query.
+BATCH_TERMS_PER_QUERY = 12
+BATCH_MAX_RESULTS = 100
+
+MAX_RESULTS = 15
+
+
+def _check_cache(conn: sqlite3.Connection, technique_ids: list[str]) -> dict[str, list[dict]]:
+    """Return the cached arXiv results that are still fresh, keyed by technique id."""
+    cached = {}
+    for technique_id in technique_ids:
+        results = load_fresh_artifacts(conn, technique_id, "arxiv")
+        if results is not None:
+            cached[technique_id] = results
+    return cached
+
+
+def _load_stored(conn: sqlite3.Connection, technique_ids: list[str]) -> dict[str, list[dict]]:
+    """Return the stored arXiv results regardless of freshness, keyed by technique id."""
+    return {technique_id: load_artifacts(conn, technique_id, "arxiv") for technique_id in technique_ids}
 
-def _check_cache(
-    conn: sqlite3.Connection, technique_id: str, ttl_hours: int = CACHE_TTL_HOURS
-) -> list[dict] | None:
-    """Return cached arXiv results if still fresh, else None."""
-    rows = conn.execute(
-        "SELECT * FROM osint_results WHERE technique_id = ? AND source = 'arxiv' ORDER BY relevance_score DESC",
-        (technique_id,),
-    ).fetchall()
-    if not rows:
-        return None
-
-    fetched = rows[0]["fetched_at"]
-    if fetched:
-        try:
-            fetched_at = datetime.fromisoformat(fetched.replace("Z", "+00:00"))
-            if datetime.now(timezone.utc) - fetched_at < timedelta(hours=ttl_hours):
-                return [dict(r) for r in rows]
-        except (ValueError, TypeError):
-            pass
-    return None
-
-
-def _parse_arxiv_response(xml_text: str) -> list[dict]:
-    """Parse arXiv Atom XML response into a list of paper dicts."""
+
+def _parse_arxiv_response(xml_text: str, summary_chars: int | None = 500) -> list[dict]:
+    """Parse arXiv Atom XML response into a list of paper dicts.
+
+    Summaries are truncated to `summary_chars` (pass None to keep the full
+    abstract, e.g. for keyword matching before persisting).
+    """
     papers = []
     try:
         root = ET.fromstring(xml_text)
@@ -51,7 +60,7 @@ def _parse_arxiv_response(xml_text: str) -> list[dict]:
         link_el = entry.find("atom:id", ns)
 
         title = title_el.text.strip().replace("\n", " ") if title_el is not None and title_el.text else ""
-        summary = summary_el.text.strip().replace("\n", " ")[:500] if summary_el is not None and summary_el.text else ""
+        summary = summary_el.text.strip().replace("\n", " ")[:summary_chars] if summary_el is not None and summary_el.text else ""
         url = link_el.text.strip() if link_el is not None and link_el.text else ""
 
         if title:
@@ -64,29 +73,71 @@ def _parse_arxiv_response(xml_text: str) -> list[dict]:
     return papers
 
 
+def _persist_results(conn: sqlite3.Connection, fetches: list[tuple[str, list[dict], str | None]]) -> None:
+    """Replace the cached arXiv papers of each (technique_id, results, error) fetch
+    and record the fetches, in one transaction."""
+    store_fetches(
+        conn,
+        "arxiv",
+        [
+            (
+                technique_id,
+                [{**paper, "canonical_id": canonical_arxiv_id(paper["url"])} for paper in results],
+                error,
+            )
+            for technique_id, results, error in fetches
+        ],
+        CACHE_TTL_HOURS,
+    )
+
+
+def _rank_and_persist(
+    conn: sqlite3.Connection,
+    fetches: list[tuple[str, str, list[str], list[dict], str | None]],
+    term_hits: list[tuple[str, str, int]],
+) -> dict[str, list[dict]]:
+    """Score each (technique_id, name, keywords, candidates, error) fetch's
+    candidate papers, keep the best MAX_RESULTS and persist them, with the
+    result count of each search term, in one transaction. Returns the ranked
+    papers keyed by technique id."""
+    record_term_hits(conn, "arxiv", term_hits)
+    ranked = {
+        technique_id: rank_results(conn, technique_id, name, keywords, candidates, MAX_RESULTS)
+        for technique_id, name, keywords, candidates, _ in fetches
+    }
+    _persist_results(conn, [(technique_id, ranked[technique_id], error) for technique_id, *_, error in fetches])
+    return ranked
+
+
 async def search_arxiv(
     conn: sqlite3.Connection,
     technique_id: str,
     technique_name: str,
     keywords: list[str] | None = None,
 ) -> list[dict]:
-    """Search arXiv for papers related to a technique."""
-    cached = _check_cache(conn, technique_id)
+    """Search arXiv for papers related to a technique.
+
+    Raises CircuitOpenError if arXiv's circuit opens before any query succeeds.
+    """
+    cached = (await run_db(_check_cache, conn, [technique_id])).get(technique_id)
     if cached is not None:
         logger.info("arXiv cache hit for %s (%d papers)", technique_id, len(cached))
         return cached
 
-    search_terms = keywords or []
-    if technique_name:
-        search_terms.insert(0, technique_name)
+    search_terms = list(keywords or [technique_name])
 
     all_papers: dict[str, dict] = {}  # keyed by URL for dedup
+    term_hits: list[tuple[str, str, int]] = []
+    succeeded = False
+    error: str | None = None
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with osint_client() as client:
         for term in search_terms[:3]:
             query = f'all:"{term}"'
             try:
-                resp = await client.get(
+                resp = await get_with_retry(
+                    client,
+                    "arxiv",
                     ARXIV_API_URL,
                     params={
                         "search_query": query,
@@ -98,47 +149,153 @@ async def search_arxiv(
                 )
                 resp.raise_for_status()
                 papers = _parse_arxiv_response(resp.text)
+                succeeded = True
+                term_hits.append((technique_id, term, len(papers)))
 
                 for paper in papers:
-                    if paper["url"] not in all_papers:
-                        # Simple relevance: first search term = highest score
-                        score = 1.0 - (search_terms.index(term) * 0.2) if term in search_terms else 0.5
-                        all_papers[paper["url"]] = {
-                            **paper,
-                            "relevance_score": round(score, 2),
-                        }
+                    all_papers.setdefault(paper["url"], paper)
 
+            except CircuitOpenError:
+                # Nothing fetched yet: let the caller decide whether stored results will do
+                if not succeeded:
+                    raise
+                break
             except httpx.HTTPError as e:
                 logger.error("arXiv search failed for '%s': %s", term, e)
+                error = str(e)
 
-    results = sorted(all_papers.values(), key=lambda p: p["relevance_score"], reverse=True)[:15]
-
-    # Persist to cache
-    now_iso = datetime.now(timezone.utc).isoformat()
-    expires = (datetime.now(timezone.utc) + timedelta(hours=CACHE_TTL_HOURS)).isoformat()
-
-    if results:
-        conn.execute(
-            "DELETE FROM osint_results WHERE technique_id = ? AND source = 'arxiv'",
-            (technique_id,),
-        )
-        for paper in results:
-            conn.execute(
-                """INSERT INTO osint_results
-                   (technique_id, source, title, url, summary, relevance_score, fetched_at, expires_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    technique_id,
-                    "arxiv",
-                    paper["title"],
-                    paper["url"],
-                    paper["summary"],
-                    paper["relevance_score"],
-                    now_iso,
-                    expires,
-                ),
-            )
-        conn.commit()
+    ranked = await run_db(
+        _rank_and_persist,
+        conn,
+        [(technique_id, technique_name, search_terms, list(all_papers.values()), None if succeeded else error)],
+        term_hits,
+    )
+    results = ranked[technique_id]
 
     logger.info("arXiv: found %d papers for %s", len(results), technique_id)
     return results
+
+
+async def search_arxiv_batch(
+    conn: sqlite3.Connection,
+    techniques: list[tuple[str, str, list[str]]],
+) -> tuple[dict[str, list[dict]], dict[str, str]]:
+    """Search arXiv for many techniques at once.
+
+    `techniques` is a list of (technique_id, technique_name, keywords). The
+    search terms of all techniques are deduplicated and OR'd together into
+    a few large queries; each returned paper is then attributed back to every
+    technique whose term appears in its title or abstract. Returns results
+    keyed by technique id, with the same shape and caching as `search_arxiv`,
+    and the error of each technique whose fetch failed (results for those
+    are whatever was stored before).
+    """
+    results = await run_db(_check_cache, conn, [t[0] for t in techniques])
+    # term (lowercased) -> [technique_id]
+    term_owners: dict[str, list[str]] = {}
+    queries: dict[str, tuple[str, list[str]]] = {}
+
+    for technique_id, technique_name, keywords in techniques:
+        if technique_id in results:
+            continue
+        results[technique_id] = []
+
+        terms: list[str] = []
+        for term in [technique_name, *(keywords or [])]:
+            if term and term.lower() not in terms:
+                terms.append(term.lower())
+        queries[technique_id] = (technique_name, keywords or [])
+        for term in terms[:3]:
+            term_owners.setdefault(term, []).append(technique_id)
+
+    if not term_owners:
+        return results, {}
+
+    unique_terms = list(term_owners)
+    groups = [unique_terms[i:i + BATCH_TERMS_PER_QUERY] for i in range(0, len(unique_terms), BATCH_TERMS_PER_QUERY)]
+    # technique_id -> indexes of the query groups holding its terms
+    technique_groups: dict[str, set[int]] = {}
+    for index, group in enumerate(groups):
+        for term in group:
+            for technique_id in term_owners[term]:
+                technique_groups.setdefault(technique_id, set()).add(index)
+    # technique_id -> {url: paper}
+    matched: dict[str, dict[str, dict]] = {}
+    # Outcome of each query group that was sent: None on success, else its error
+    group_errors: dict[int, str | None] = {}
+
+    async with osint_client() as client:
+        for index, group in enumerate(groups):
+            query = " OR ".join(f'all:"{term}"' for term in group)
+            try:
+                resp = await get_with_retry(
+                    client,
+                    "arxiv",
+                    ARXIV_API_URL,
+                    params={
+                        "search_query": query,
+                        "start": 0,
+                        "max_results": BATCH_MAX_RESULTS,
+                        "sortBy": "relevance",
+                        "sortOrder": "descending",
+                    },
+                )
+                resp.raise_for_status()
+            except CircuitOpenError:
+                break
+            except httpx.HTTPError as e:
+                logger.error("arXiv batch search failed for %d terms: %s", len(group), e)
+                group_errors[index] = str(e)
+                continue
+            group_errors[index] = None
+
+            for paper in _parse_arxiv_response(resp.text, summary_chars=None):
+                text = f"{paper['title']} {paper['summary']}".lower()
+                for term in group:
+                    if term not in text:
+                        continue
+                    for technique_id in term_owners[term]:
+                        matched.setdefault(technique_id, {}).setdefault(
+                            paper["url"], {**paper, "summary": paper["summary"][:500]}
+                        )
+
+    # A technique's fetch succeeded if any query holding one of its terms did;
+    # otherwise it failed with the error of its first failed query. Techniques
+    # none of whose queries were sent (circuit opened) keep their stored papers.
+    errors: dict[str, str | None] = {}
+    unsent: list[str] = []
+    for technique_id in sorted(queries):
+        outcomes = [group_errors[i] for i in sorted(technique_groups.get(technique_id, ())) if i in group_errors]
+        if outcomes:
+            errors[technique_id] = None if None in outcomes else outcomes[0]
+        elif technique_id in technique_groups:
+            unsent.append(technique_id)
+        else:
+            errors[technique_id] = None  # nothing to search for
+
+    failures = {technique_id: error for technique_id, error in errors.items() if error is not None}
+    if unsent:
+        logger.info("arXiv circuit open, serving stored papers for %d techniques", len(unsent))
+        results.update(await run_db(_load_stored, conn, unsent))
+        failures.update({technique_id: "arxiv circuit is open" for technique_id in unsent})
+
+    # One scoring pass and transaction for the whole batch instead of a commit per technique.
+    # Term hits are not recorded: a term sharing a capped result page with
+    # BATCH_TERMS_PER_QUERY others says little about its own yield, so only
+    # per-term searches (search_arxiv) feed keyword pruning.
+    if errors:
+        results.update(await run_db(
+            _rank_and_persist,
+            conn,
+            [
+                (technique_id, *queries[technique_id], list(matched.get(technique_id, {}).values()), error)
+                for technique_id, error in errors.items()
+            ],
+            [],
+        ))
+
+    logger.info(
+        "arXiv batch: %d techniques, %d terms, %d queries, %d techniques matched",
+        len(techniques), len(unique_terms), len(group_errors), len(matched),
+    )
+    return results, failures
@@ -0,0 +1,228 @@
+"""Per-source circuit breakers and retrying requests for external OSINT APIs.
+
+Transient failures (HTTP 429/5xx, rate-limit 403s, timeouts, connection
+errors) are retried with jittered exponential backoff. If a source keeps
+failing, its breaker opens and requests fail fast with CircuitOpenError
+instead of waiting on the network; after a cool-down a single probe request
+is let through (half-open) and its outcome closes or re-opens the breaker.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+
+import httpx
+
+from ..config import OSINT_REPLAY_DIR
+from ..prometheus import Counter, Histogram
+from .rate_limit import LIMITERS
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+OSINT_REQUESTS = Counter(
+    "atlas_osint_requests_total", "Requests sent to external OSINT APIs, by response status", ("source", "status")
+)
+OSINT_ERRORS = Counter(
+    "atlas_osint_errors_total", "OSINT API requests that failed (transport error or HTTP status >= 400)", ("source",)
+)
+OSINT_RATE_LIMITED = Counter(
+    "atlas_osint_rate_limited_total", "OSINT API requests rejected by the API's rate limit", ("source",)
+)
+OSINT_REQUEST_SECONDS = Histogram(
+    "atlas_osint_request_duration_seconds", "OSINT API request latency", ("source",)
+)
+OSINT_RATE_LIMIT_WAIT_SECONDS = Counter(
+    "atlas_osint_rate_limit_wait_seconds_total", "Time spent waiting for a local rate limiter slot", ("limiter",)
+)
+OSINT_CIRCUIT_REJECTIONS = Counter(
+    "atlas_osint_circuit_rejections_total", "OSINT requests refused because the circuit was open", ("source",)
+)
+
+
+# Transport for every OSINT API client; None uses the network. Replaced with
+# a ReplayTransport when OSINT_REPLAY_DIR is set, or by benchmarks.
+transport: httpx.AsyncBaseTransport | None = None
+if OSINT_REPLAY_DIR:
+    from .osint_replay import ReplayTransport, load_recordings
+
+    transport = ReplayTransport(load_recordings(OSINT_REPLAY_DIR))
+
+
+def osint_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """Return an HTTP client for the external OSINT APIs."""
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while a source's breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open, `allow_request()` is False until `reset_timeout` seconds have
+    passed; then one probe is allowed (half-open). A success closes the
+    breaker, a failure re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.last_error: str | None = None
+        self._probe_started_at: float | None = None
+
+    def allow_request(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open" and now - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_started_at = None
+        # A probe that never reported back (e.g. cancelled) is replaced after
+        # another reset_timeout.
+        if self.state == "half_open" and (
+            self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout
+        ):
+            self._probe_started_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Circuit for %s closed", self.name)
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self, error: str) -> None:
+        self.consecutive_failures += 1
+        self.last_error = error[:500]
+        self._probe_started_at = None
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("Circuit for %s opened after %d failures: %s", self.name, self.consecutive_failures, error)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        retry_in = None
+        if self.state == "open":
+            retry_in = max(math.ceil(self.reset_timeout - (time.monotonic() - self.opened_at)), 0)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "retry_in_seconds": retry_in,
+        }
+
+
+BREAKERS: dict[str, CircuitBreaker] = {
+    "github": CircuitBreaker("github"),
+    "arxiv": CircuitBreaker("arxiv"),
+    "nvd": CircuitBreaker("nvd"),
+}
+
+
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    # GitHub signals an exhausted quota with 403 and no remaining requests
+    return resp.status_code == 429 or (
+        resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def _retry_delay(attempt: int, resp: httpx.Response | None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header
+    or, for rate-limited responses, the X-RateLimit-Reset time."""
+    if resp is not None and resp.headers.get("Retry-After", "").isdigit():
+        return min(float(resp.headers["Retry-After"]), RETRY_MAX_SECONDS)
+    if resp is not None and _is_rate_limited(resp) and resp.headers.get("X-RateLimit-Reset", "").isdigit():
+        return min(max(float(resp.headers["X-RateLimit-Reset"]) - time.time(), 0.0), RETRY_MAX_SECONDS)
+    return random.uniform(0, min(RETRY_BASE_SECONDS * 2 ** attempt, RETRY_MAX_SECONDS))
+
+
+async def get_with_retry(
+    client: httpx.AsyncClient,
+    source: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response:
+    """GET `url` through the source's rate limiter and circuit breaker."""
+    return await request_with_retry(client, source, "GET", url, **kwargs)
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    source: str,
+    method: str,
+    url: str,
+    limiter: str | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request through a rate limiter and the source's circuit breaker.
+
+    `limiter` names the LIMITERS entry to use when it differs from the
+    source (e.g. GitHub's core API versus its search API).
+
+    Transient failures, rate-limited responses included, are retried up to
+    MAX_ATTEMPTS while the breaker stays closed; each failed attempt counts
+    towards opening it. The final response is returned as-is (callers still
+    check its status) and transport errors are re-raised. Raises
+    CircuitOpenError without a request if the breaker is open.
+    """
+    breaker = BREAKERS[source]
+    if not breaker.allow_request():
+        OSINT_CIRCUIT_REJECTIONS.inc(source=source)
+        raise CircuitOpenError(f"{source} circuit is open")
+
+    limiter = limiter or source
+    attempt = 0
+    while True:
+        attempt += 1
+        start = time.monotonic()
+        await LIMITERS[limiter].acquire()
+        sent = time.monotonic()
+        OSINT_RATE_LIMIT_WAIT_SECONDS.inc(sent - start, limiter=limiter)
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            OSINT_REQUEST_SECONDS.observe(time.monotonic() - sent, source=source)
+            OSINT_REQUESTS.inc(source=source, status="error")
+            OSINT_ERRORS.inc(source=source)
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            if attempt >= MAX_ATTEMPTS or breaker.state == "open":
+                raise
+            logger.info("%s request failed (%s), retrying (attempt %d)", source, e, attempt)
+            resp = None
+        else:
+            OSINT_REQUEST_SECONDS.observe(time.monotonic() - sent, source=source)
+            OSINT_REQUESTS.inc(source=source, status=resp.status_code)
+            if resp.status_code >= 400:
+                OSINT_ERRORS.inc(source=source)
+            rate_limited = _is_rate_limited(resp)
+            if rate_limited:
+                OSINT_RATE_LIMITED.inc(source=source)
+            if resp.status_code not in RETRY_STATUSES and not rate_limited:
+                breaker.record_success()
+                return resp
+            breaker.record_failure(f"HTTP {resp.status_code}")
+            if attempt >= MAX_ATTEMPTS or breaker.state == "open":
+                return resp
+            logger.info("%s returned %d, retrying (attempt %d)", source, resp.status_code, attempt)
+        await asyncio.sleep(_retry_delay(attempt - 1, resp))
+
+
+def breaker_status() -> dict[str, dict]:
+    """Return the current breaker state of every source."""
+    return {source: breaker.snapshot() for source, breaker in BREAKERS.items()}
@@ -0,0 +1,173 @@
+"""Refresh stored GitHub repo metadata without re-running search queries.
+
+Two modes keep stars, language and description current:
+
+- "graphql" fetches up to 100 repos per GraphQL query (needs GITHUB_TOKEN).
+- "etag" revalidates each repo with a conditional REST request using its
+  stored ETag. Unchanged repos answer 304 Not Modified, which GitHub does
+  not count against the rate limit.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timezone
+
+import httpx
+
+from ..config import GITHUB_TOKEN
+from ..database import run_db
+from .circuit_breaker import CircuitOpenError, osint_client, request_with_retry
+from .rate_limit import LIMITERS
+
+logger = logging.getLogger(__name__)
+
+GITHUB_REPO_URL = "https://api.github.com/repos/{}"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 100
+
+
+def _stored_repos(conn: sqlite3.Connection, limit: int | None) -> list[sqlite3.Row]:
+    return conn.execute(
+        "SELECT id, canonical_id, etag FROM osint_artifacts WHERE source = 'github' "
+        "ORDER BY id LIMIT ?",
+        (limit if limit is not None else -1,),
+    ).fetchall()
+
+
+def _apply_updates(conn: sqlite3.Connection, updates: list[dict]) -> int:
+    """Write refreshed metadata; returns the number of repos whose content changed."""
+    now_iso = datetime.now(timezone.utc).isoformat()
+    changed = 0
+    content_changed = "(stars IS NOT :stars OR language IS NOT :language OR summary IS NOT :summary OR url IS NOT :url)"
+    for u in updates:
+        # SET expressions see the old row; updated_at moves only when the content changed
+        row = conn.execute(
+            "UPDATE osint_artifacts SET stars = :stars, language = :language, summary = :summary, url = :url, "
+            "etag = COALESCE(:etag, etag), "
+            "stars_delta = CASE WHEN stars IS NOT :stars THEN :stars - stars ELSE stars_delta END, "
+            f"updated_at = CASE WHEN {content_changed} THEN :now ELSE updated_at END "
+            "WHERE id = :id RETURNING updated_at = :now",
+            {**u, "etag": u.get("etag"), "now": now_iso},
+        ).fetchone()
+        changed += bool(row and row[0])
+    conn.commit()
+    return changed
+
+
+def _headers() -> dict:
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"token {GITHUB_TOKEN}"
+    return headers
+
+
+def _graphql_query(count: int) -> str:
+    """Build a query fetching `count` repositories, aliased r0..rN."""
+    variables = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    fields = "nameWithOwner url description stargazerCount primaryLanguage { name }"
+    repos = " ".join(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {fields} }}" for i in range(count))
+    return f"query({variables}) {{ {repos} }}"
+
+
+async def _refresh_graphql(client, repos: list[sqlite3.Row], stats: dict, updates: list[dict]) -> None:
+    for i in range(0, len(repos), GRAPHQL_BATCH_SIZE):
+        chunk = repos[i:i + GRAPHQL_BATCH_SIZE]
+        variables = {}
+        for j, repo in enumerate(chunk):
+            owner, _, name = repo["canonical_id"].partition("/")
+            variables[f"o{j}"], variables[f"n{j}"] = owner, name
+
+        resp = await request_with_retry(
+            client,
+            "github",
+            "POST",
+            GITHUB_GRAPHQL_URL,
+            limiter="github_core",
+            json={"query": _graphql_query(len(chunk)), "variables": variables},
+            headers=_headers(),
+        )
+        stats["requests"] += 1
+        resp.raise_for_status()
+        data = resp.json().get("data") or {}
+
+        for j, repo in enumerate(chunk):
+            node = data.get(f"r{j}")
+            if node is None:
+                # Deleted, renamed or made private
+                stats["missing"] += 1
+                continue
+            updates.append({
+                "id": repo["id"],
+                "stars": node.get("stargazerCount", 0),
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "summary": (node.get("description") or "")[:500],
+                "url": node.get("url", ""),
+            })
+
+
+async def _refresh_etag(client, repos: list[sqlite3.Row], stats: dict, updates: list[dict]) -> None:
+    for repo in repos:
+        headers = _headers()
+        if repo["etag"]:
+            headers["If-None-Match"] = repo["etag"]
+        resp = await request_with_retry(
+            client,
+            "github",
+            "GET",
+            GITHUB_REPO_URL.format(repo["canonical_id"]),
+            limiter="github_core",
+            headers=headers,
+        )
+        stats["requests"] += 1
+        if resp.status_code == 304:
+            LIMITERS["github_core"].refund()
+            stats["not_modified"] += 1
+            continue
+        if resp.status_code == 404:
+            stats["missing"] += 1
+            continue
+        resp.raise_for_status()
+        item = resp.json()
+        updates.append({
+            "id": repo["id"],
+            "stars": item.get("stargazers_count", 0),
+            "language": item.get("language"),
+            "summary": (item.get("description") or "")[:500],
+            "url": item.get("html_url", ""),
+            "etag": resp.headers.get("ETag"),
+        })
+
+
+async def refresh_github_repos(
+    conn: sqlite3.Connection,
+    mode: str | None = None,
+    limit: int | None = None,
+) -> dict:
+    """Refresh metadata of stored GitHub repos (the first `limit` if given).
+
+    `mode` is "graphql" or "etag"; by default GraphQL is used when a token is
+    configured (the GraphQL API requires one) and ETag revalidation otherwise.
+    """
+    mode = mode or ("graphql" if GITHUB_TOKEN else "etag")
+    if mode == "graphql" and not GITHUB_TOKEN:
+        raise ValueError("GraphQL refresh requires GITHUB_TOKEN")
+    if mode not in ("graphql", "etag"):
+        raise ValueError(f"Unknown refresh mode {mode!r} (expected graphql or etag)")
+
+    repos = await run_db(_stored_repos, conn, limit)
+    stats = {"mode": mode, "repos": len(repos), "requests": 0, "not_modified": 0, "missing": 0, "updated": 0}
+
+    refresh = _refresh_graphql if mode == "graphql" else _refresh_etag
+    updates: list[dict] = []
+    async with osint_client() as client:
+        # Keep whatever was refreshed before an outage or rate limit
+        try:
+            await refresh(client, repos, stats, updates)
+        except CircuitOpenError:
+            logger.warning("GitHub circuit open, repo refresh stopped early")
+        except httpx.HTTPError as e:
+            logger.error("GitHub repo refresh stopped early: %s", e)
+
+    stats["updated"] = await run_db(_apply_updates, conn, updates)
+    logger.info("GitHub repo refresh: %s", stats)
+    return stats
@@ -2,11 +2,15 @@
 
 import logging
 import sqlite3
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
 import httpx
 
 from ..config import GITHUB_TOKEN
+from ..database import run_db
+from .circuit_breaker import CircuitOpenError, get_with_retry, osint_client
+from .osint_store import load_fresh_artifacts, store_fetches
+from .search_terms import record_term_hits
 
 logger = logging.getLogger(__name__)
 
@@ -14,25 +18,34 @@ GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
 CACHE_TTL_HOURS = 6
 
 
-def _check_cache(conn: sqlite3.Connection, technique_id: str, ttl_hours: int = CACHE_TTL_HOURS) -> list[dict] | None:
+async def _check_cache(conn: sqlite3.Connection, technique_id: str) -> list[dict] | None:
     """Return cached GitHub repos if still fresh, else None."""
-    rows = conn.execute(
-        "SELECT * FROM github_repos WHERE technique_id = ? ORDER BY stars DESC",
-        (technique_id,),
-    ).fetchall()
-    if not rows:
-        return None
-
-    # Check freshness using last_updated of the first result
-    last = rows[0]["last_updated"]
-    if last:
-        try:
-            fetched_at = datetime.fromisoformat(last.replace("Z", "+00:00"))
-            if datetime.now(timezone.utc) - fetched_at < timedelta(hours=ttl_hours):
-                return [dict(r) for r in rows]
-        except (ValueError, TypeError):
-            pass
-    return None
+    return await run_db(load_fresh_artifacts, conn, technique_id, "github")
+
+
+def _persist_results(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    results: list[dict],
+    error: str | None,
+    term_hits: list[tuple[str, str, int]],
+) -> None:
+    """Replace the cached GitHub repos for a technique and record the fetch
+    and the result count of each search term."""
+    record_term_hits(conn, "github", term_hits)
+    items = [
+        {
+            "canonical_id": repo["repo_full_name"],
+            "title": repo["repo_full_name"],
+            "url": repo["url"],
+            "summary": repo["description"],
+            "stars": repo["stars"],
+            "language": repo["language"],
+            "category": repo["category"],
+        }
+        for repo in results
+    ]
+    store_fetches(conn, "github", [(technique_id, items, error)], CACHE_TTL_HOURS)
 
 
 async def search_github(
@@ -41,9 +54,12 @@ async def search_github(
     technique_name: str,
     keywords: list[str] | None = None,
 ) -> list[dict]:
-    """Search GitHub for repos related to a technique. Returns list of repo dicts."""
+    """Search GitHub for repos related to a technique. Returns list of repo dicts.
+
+    Raises CircuitOpenError if GitHub's circuit opens before any query succeeds.
+    """
     # Check cache first
-    cached = _check_cache(conn, technique_id)
+    cached = await _check_cache(conn, technique_id)
     if cached is not None:
         logger.info("GitHub cache hit for %s (%d repos)", technique_id, len(cached))
         return cached
@@ -58,22 +74,30 @@ async def search_github(
         headers["Authorization"] = f"token {GITHUB_TOKEN}"
 
     all_repos: dict[str, dict] = {}  # keyed by repo_full_name for dedup
+    term_hits: list[tuple[str, str, int]] = []
+    succeeded = False
+    error: str | None = None
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with osint_client() as client:
         for term in search_terms[:3]:  # Limit to 3 search terms
             # Search name, description, and topics for relevant results
             query = f'"{term}" in:name,description,topics'
             try:
-                resp = await client.get(
+                resp = await get_with_retry(
+                    client,
+                    "github",
                     GITHUB_SEARCH_URL,
                     params={"q": query, "sort": "stars", "order": "desc", "per_page": 10},
                     headers=headers,
                 )
                 if resp.status_code == 403:
                     logger.warning("GitHub rate limit hit for query: %s", term)
+                    error = "rate limited"
                     break
                 resp.raise_for_status()
                 data = resp.json()
+                succeeded = True
+                term_hits.append((technique_id, term, len(data.get("items", []))))
 
                 for item in data.get("items", []):
                     full_name = item["full_name"]
@@ -88,31 +112,19 @@ async def search_github(
                             "category": "osint-discovery",
                             "last_updated": datetime.now(timezone.utc).isoformat(),
                         }
+            except CircuitOpenError:
+                # Nothing fetched yet: let the caller decide whether stored results will do
+                if not succeeded:
+                    raise
+                break
             except httpx.HTTPError as e:
                 logger.error("GitHub search failed for '%s': %s", term, e)
+                error = str(e)
 
     results = sorted(all_repos.values(), key=lambda r: r["stars"], reverse=True)[:20]
 
     # Persist to cache
-    if results:
-        conn.execute("DELETE FROM github_repos WHERE technique_id = ?", (technique_id,))
-        for repo in results:
-            conn.execute(
-                """INSERT INTO github_repos
-                   (technique_id, repo_full_name, description, stars, language, url, category, last_updated)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    repo["technique_id"],
-                    repo["repo_full_name"],
-                    repo["description"],
-                    repo["stars"],
-                    repo["language"],
-                    repo["url"],
-                    repo["category"],
-                    repo["last_updated"],
-                ),
-            )
-        conn.commit()
+    await run_db(_persist_results, conn, technique_id, results, None if succeeded else error, term_hits)
 
     logger.info("GitHub: found %d repos for %s", len(results), technique_id)
     return results
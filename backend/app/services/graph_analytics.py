@@ -0,0 +1,206 @@
+"""Analytics over the technique co-occurrence graph.
+
+Everything is derived from the case study x technique incidence matrix B
+(see services.technique_graph): C = B.T @ B holds pair co-occurrence on the
+off-diagonal and per-technique case study counts on the diagonal.
+
+- Edge weights normalized for technique frequency: Jaccard
+  (c_ab / (n_a + n_b - c_ab)), PMI (log(N c_ab / (n_a n_b))) and NPMI
+  (PMI / -log(c_ab / N), in [-1, 1]).
+- Node centrality: degree, betweenness (Brandes, with the breadth-first
+  searches of all sources run together as matrix products) and eigenvector
+  centrality of the weighted graph (power iteration).
+- Communities: Louvain modularity optimization on the weighted graph.
+
+Results are cached per granularity and data version, so they are computed
+once per ingestion.
+"""
+
+import math
+import sqlite3
+
+import numpy as np
+
+from .technique_graph import cached_for_version, data_version, incidence_matrix
+
+EIGENVECTOR_MAX_ITERATIONS = 1000
+EIGENVECTOR_TOLERANCE = 1e-9
+
+
+def _betweenness(adjacency: np.ndarray) -> np.ndarray:
+    """Normalized betweenness centrality of an unweighted undirected graph.
+
+    Row s of each matrix below belongs to the search from source s, so one
+    product per BFS level advances every search at once.
+    """
+    n = len(adjacency)
+    if n < 3:
+        return np.zeros(n)
+    dist = np.full((n, n), -1)
+    np.fill_diagonal(dist, 0)
+    sigma = np.eye(n)  # number of shortest paths from s to v
+    frontier = np.eye(n)
+    level = 0
+    while frontier.any():
+        paths = frontier @ adjacency
+        reached = (paths > 0) & (dist < 0)
+        level += 1
+        dist[reached] = level
+        sigma[reached] = paths[reached]
+        frontier = np.where(reached, sigma, 0.0)
+
+    # Accumulate dependencies from the deepest level back to the sources
+    delta = np.zeros((n, n))
+    for d in range(level, 0, -1):
+        coeff = np.where(dist == d, (1 + delta) / np.where(sigma > 0, sigma, 1), 0.0)
+        delta += np.where(dist == d - 1, sigma * (coeff @ adjacency), 0.0)
+    np.fill_diagonal(delta, 0)
+    # Each pair is counted from both ends
+    return delta.sum(axis=0) / ((n - 1) * (n - 2))
+
+
+def _eigenvector(weights: np.ndarray) -> np.ndarray:
+    """Eigenvector centrality of the weighted graph, scaled so the maximum is 1."""
+    n = len(weights)
+    if n == 0 or not weights.any():
+        return np.zeros(n)
+    # Iterating on W + I has the same leading eigenvector and also converges
+    # on bipartite components
+    shifted = weights + np.eye(n)
+    x = np.full(n, 1 / math.sqrt(n))
+    for _ in range(EIGENVECTOR_MAX_ITERATIONS):
+        nxt = shifted @ x
+        nxt /= np.linalg.norm(nxt)
+        if np.abs(nxt - x).sum() < n * EIGENVECTOR_TOLERANCE:
+            x = nxt
+            break
+        x = nxt
+    return x / x.max()
+
+
+def _louvain_pass(weights: np.ndarray) -> np.ndarray:
+    """Move nodes between communities while modularity improves; return labels 0..k-1."""
+    n = len(weights)
+    strength = weights.sum(axis=1)
+    total_weight = strength.sum()
+    community = np.arange(n)
+    if total_weight == 0:
+        return community
+    community_strength = strength.copy()
+
+    moved = True
+    while moved:
+        moved = False
+        for i in range(n):
+            current = community[i]
+            community_strength[current] -= strength[i]
+            links = np.bincount(community, weights=weights[i], minlength=n)
+            links[current] -= weights[i, i]
+            gain = links - community_strength * strength[i] / total_weight
+            best = int(np.argmax(gain))
+            if gain[best] <= gain[current] + 1e-12:
+                best = current
+            community[i] = best
+            community_strength[best] += strength[i]
+            moved |= best != current
+    return np.unique(community, return_inverse=True)[1]
+
+
+def _louvain(weights: np.ndarray) -> np.ndarray:
+    """Louvain communities: local moves, then merge communities into nodes and repeat."""
+    labels = np.arange(len(weights))
+    level = weights
+    while True:
+        community = _louvain_pass(level)
+        if community.max(initial=-1) + 1 == len(level):
+            return labels
+        labels = community[labels]
+        membership = np.eye(community.max() + 1)[community]
+        level = membership.T @ level @ membership
+
+
+def _modularity(weights: np.ndarray, labels: np.ndarray) -> float:
+    total_weight = weights.sum()
+    if total_weight == 0:
+        return 0.0
+    membership = np.eye(labels.max(initial=0) + 1)[labels]
+    internal = np.diag(membership.T @ weights @ membership)
+    strength = membership.T @ weights.sum(axis=1)
+    return float((internal / total_weight - (strength / total_weight) ** 2).sum())
+
+
+def compute_analytics(conn: sqlite3.Connection, granularity: str = "parent") -> dict:
+    """Compute node centralities, communities and normalized edge weights."""
+    node_ids, incidence = incidence_matrix(conn, granularity)
+    n_cases = len(incidence)
+    cooccurrence = (incidence.T @ incidence).astype(float)
+    case_counts = np.diag(cooccurrence).copy()
+    weights = cooccurrence - np.diag(case_counts)
+    adjacency = (weights > 0).astype(float)
+
+    n = len(node_ids)
+    degree = adjacency.sum(axis=1)
+    betweenness = _betweenness(adjacency)
+    eigenvector = _eigenvector(weights)
+
+    # Number communities by size, largest first, then by first member
+    labels = _louvain(weights)
+    groups = sorted(
+        (np.flatnonzero(labels == c) for c in range(labels.max(initial=-1) + 1)),
+        key=lambda members: (-len(members), members[0]),
+    )
+    community = np.empty(n, dtype=int)
+    for i, members in enumerate(groups):
+        community[members] = i
+
+    a, b = np.nonzero(np.triu(weights, k=1))
+    pair_counts = weights[a, b]
+    jaccard = pair_counts / (case_counts[a] + case_counts[b] - pair_counts)
+    pmi = np.log(n_cases * pair_counts / (case_counts[a] * case_counts[b])) if len(a) else np.zeros(0)
+    joint = pair_counts / max(n_cases, 1)
+    npmi = np.divide(pmi, -np.log(joint), out=np.ones_like(pmi), where=joint < 1)
+    order = np.lexsort((b, a, -pair_counts))
+
+    return {
+        "granularity": granularity,
+        "case_study_count": n_cases,
+        "modularity": round(_modularity(weights, community), 4),
+        "nodes": [
+            {
+                "id": node_ids[i],
+                "case_study_count": int(case_counts[i]),
+                "degree": int(degree[i]),
+                "strength": int(weights[i].sum()),
+                "degree_centrality": round(float(degree[i] / (n - 1)) if n > 1 else 0.0, 4),
+                "betweenness": round(float(betweenness[i]), 4),
+                "eigenvector": round(float(eigenvector[i]), 4),
+                "community": int(community[i]),
+            }
+            for i in range(n)
+        ],
+        "edges": [
+            {
+                "source": node_ids[a[k]],
+                "target": node_ids[b[k]],
+                "weight": int(pair_counts[k]),
+                "jaccard": round(float(jaccard[k]), 4),
+                "pmi": round(float(pmi[k]), 4),
+                "npmi": round(float(npmi[k]), 4),
+            }
+            for k in order.tolist()
+        ],
+        "communities": [
+            {"id": i, "size": len(members), "technique_ids": [node_ids[m] for m in members.tolist()]}
+            for i, members in enumerate(groups)
+        ],
+    }
+
+
+def get_analytics(conn: sqlite3.Connection, granularity: str = "parent") -> dict:
+    """Return graph analytics, recomputed only when the ingested data changes."""
+    return cached_for_version(
+        conn,
+        "analytics",
+        granularity,
+        lambda c, g: {**compute_analytics(c, g), "data_version": data_version(c)},
+    )
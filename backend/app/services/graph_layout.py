@@ -0,0 +1,64 @@
+"""Force-directed layout of the technique co-occurrence graph.
+
+Fruchterman-Reingold with every pairwise force computed in one vectorized
+NumPy step per iteration: nodes repel each other, co-occurring techniques
+attract in proportion to their co-occurrence weight, and a weak pull toward
+the center keeps isolated techniques in view. Starting points are a fixed
+spiral in node id order, so the layout is deterministic and stays the same
+between requests. Coordinates are scaled to [0, 1] and cached per data
+version, so clients can place nodes without running a simulation.
+"""
+
+import math
+import sqlite3
+
+import numpy as np
+
+from .technique_graph import cached_for_version, incidence_matrix
+
+LAYOUT_ITERATIONS = 300
+LAYOUT_GRAVITY = 0.05
+
+
+def compute_layout(conn: sqlite3.Connection, granularity: str = "parent") -> dict[str, tuple[float, float]]:
+    """Return {technique id: (x, y)} with coordinates in [0, 1]."""
+    node_ids, incidence = incidence_matrix(conn, granularity)
+    n = len(node_ids)
+    if n == 0:
+        return {}
+    weights = (incidence.T @ incidence).astype(float)
+    np.fill_diagonal(weights, 0)
+    if weights.any():
+        weights /= weights.max()
+
+    # Golden-angle spiral: evenly spread, deterministic starting points
+    angle = np.arange(n) * math.pi * (3 - math.sqrt(5))
+    radius = np.sqrt((np.arange(n) + 0.5) / n)
+    pos = np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+
+    k = 1 / math.sqrt(n)  # ideal edge length for a unit area
+    temperature = 0.1
+    for step in range(LAYOUT_ITERATIONS):
+        dx = pos[:, 0:1] - pos[:, 0]
+        dy = pos[:, 1:2] - pos[:, 1]
+        distance = np.maximum(np.hypot(dx, dy), 1e-3)
+        # Force along each pair's direction, positive pushing apart: repulsion
+        # k^2/d between all pairs, attraction w*d^2/k along edges
+        force = k * k / distance - weights * distance * distance / k
+        np.fill_diagonal(force, 0)
+        scale = force / distance
+        displacement = np.column_stack(((scale * dx).sum(axis=1), (scale * dy).sum(axis=1)))
+        displacement -= LAYOUT_GRAVITY * pos / k
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = 0.1 * (1 - (step + 1) / LAYOUT_ITERATIONS) + 1e-3
+
+    low, high = pos.min(axis=0), pos.max(axis=0)
+    pos = (pos - low) / np.where(high > low, high - low, 1)
+    return {technique_id: (round(float(x), 4), round(float(y), 4)) for technique_id, (x, y) in zip(node_ids, pos)}
+
+
+def get_layout(conn: sqlite3.Connection, granularity: str = "parent") -> dict[str, tuple[float, float]]:
+    """Return node coordinates, recomputed only when the ingested data changes."""
+    return cached_for_version(conn, "layout", granularity, compute_layout)
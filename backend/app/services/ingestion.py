@@ -7,15 +7,32 @@ parses it, and inserts all entities into the local SQLite database.
 import hashlib
 import logging
 import sqlite3
+import time
 from datetime import datetime, timezone
 
 import httpx
 import yaml
 
 from ..config import ATLAS_YAML_URL
+from ..prometheus import Gauge, Histogram
+from .technique_graph import rebuild_cooccurrence
+from .technique_similarity import rebuild_related
 
 logger = logging.getLogger(__name__)
 
+INGESTED_ENTITIES = ("tactics", "techniques", "subtechniques", "mitigations", "case_studies")
+
+INGESTION_SECONDS = Histogram(
+    "atlas_ingestion_duration_seconds",
+    "ATLAS ingestion time, download included",
+    ("status",),
+    buckets=(1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+INGESTION_ROWS = Gauge("atlas_ingestion_rows", "Entities stored by the last successful ATLAS ingestion", ("entity",))
+INGESTION_LAST_SUCCESS = Gauge(
+    "atlas_ingestion_last_success_timestamp_seconds", "Unix time of the last successful ATLAS ingestion"
+)
+
 
 def extract_id(value) -> str:
     """Extract ID from a value that could be a string ID or a dict with 'id' key.
@@ -251,6 +268,20 @@ def ingest_atlas(conn: sqlite3.Connection) -> dict:
 
     Returns a dict with ingestion statistics.
     """
+    start = time.perf_counter()
+    try:
+        result = _fetch_and_ingest(conn)
+    except Exception:
+        INGESTION_SECONDS.observe(time.perf_counter() - start, status="failure")
+        raise
+    INGESTION_SECONDS.observe(time.perf_counter() - start, status="success")
+    for entity in INGESTED_ENTITIES:
+        INGESTION_ROWS.set(result[entity], entity=entity)
+    INGESTION_LAST_SUCCESS.set(time.time())
+    return result
+
+
+def _fetch_and_ingest(conn: sqlite3.Connection) -> dict:
     logger.info("Fetching ATLAS.yaml from %s", ATLAS_YAML_URL)
     print(f"Fetching ATLAS.yaml from {ATLAS_YAML_URL} ...")
 
@@ -303,6 +334,14 @@ def ingest_atlas(conn: sqlite3.Connection) -> dict:
         cs_count = _insert_case_studies(conn, case_studies)
         print(f"  -> {cs_count} case studies inserted")
 
+        print("Computing technique co-occurrence ...")
+        pair_count = rebuild_cooccurrence(conn)
+        print(f"  -> {pair_count} technique pairs")
+
+        print("Indexing related techniques ...")
+        related_count = rebuild_related(conn)
+        print(f"  -> {related_count} related technique entries")
+
         # Update metadata
         now_iso = datetime.now(timezone.utc).isoformat()
         conn.execute("DELETE FROM atlas_metadata")
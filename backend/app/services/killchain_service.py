@@ -271,17 +271,37 @@ def get_killchain_with_flow(conn: sqlite3.Connection, killchain_id: int) -> dict
     }
 
 
+KILLCHAIN_LIST_FIELDS = (
+    "id", "name", "description", "source_case_study_id", "severity",
+    "attack_category", "year", "created_at", "step_count",
+)
+
+
 def list_killchains(
     conn: sqlite3.Connection,
     category: str | None = None,
     severity: str | None = None,
+    fields: list[str] | None = None,
+    after: int | None = None,
+    limit: int | None = None,
 ) -> list[dict]:
-    """List all killchains with basic info and step count."""
-    query = (
-        "SELECT k.*, COUNT(ks.id) AS step_count "
-        "FROM killchains k "
-        "LEFT JOIN killchain_steps ks ON k.id = ks.killchain_id "
-    )
+    """List all killchains with basic info and step count.
+
+    `fields` limits each result to those of KILLCHAIN_LIST_FIELDS (steps are
+    only counted when step_count is wanted); `after` and `limit` return a
+    page of ids greater than `after`.
+    """
+    fields = [f for f in KILLCHAIN_LIST_FIELDS if fields is None or f in fields]
+    columns = [f"k.{f}" for f in fields if f != "step_count"]
+    query = f"SELECT {', '.join(columns)}"
+    if "step_count" in fields:
+        query += (
+            ", COUNT(ks.id) AS step_count "
+            "FROM killchains k "
+            "LEFT JOIN killchain_steps ks ON k.id = ks.killchain_id "
+        )
+    else:
+        query += " FROM killchains k "
     conditions = []
     params: list = []
 
@@ -291,24 +311,19 @@ def list_killchains(
     if severity:
         conditions.append("k.severity = ?")
         params.append(severity)
+    if after is not None:
+        conditions.append("k.id > ?")
+        params.append(after)
 
     if conditions:
         query += "WHERE " + " AND ".join(conditions) + " "
 
-    query += "GROUP BY k.id ORDER BY k.id"
+    if "step_count" in fields:
+        query += "GROUP BY k.id "
+    query += "ORDER BY k.id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
 
     rows = conn.execute(query, params).fetchall()
-    return [
-        {
-            "id": r["id"],
-            "name": r["name"],
-            "description": r["description"],
-            "source_case_study_id": r["source_case_study_id"],
-            "severity": r["severity"],
-            "attack_category": r["attack_category"],
-            "year": r["year"],
-            "created_at": r["created_at"],
-            "step_count": r["step_count"],
-        }
-        for r in rows
-    ]
+    return [{f: r[f] for f in fields} for r in rows]
@@ -0,0 +1,233 @@
+"""Local NVD CVE mirror.
+
+CVEs are imported from NVD JSON feed files on disk and kept current with
+incremental `lastModStartDate`/`lastModEndDate` window queries against the
+NVD API. An FTS5 index over CVE descriptions turns technique-to-CVE lookup
+into a local indexed query instead of a rate-limited `keywordSearch` call.
+"""
+
+import gzip
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from ..config import NVD_API_KEY
+from .circuit_breaker import get_with_retry, osint_client
+
+logger = logging.getLogger(__name__)
+
+NVD_API_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+# The NVD API rejects lastModified ranges longer than 120 days
+MAX_WINDOW_DAYS = 120
+RESULTS_PER_PAGE = 2000
+
+
+def parse_cve(cve: dict) -> dict | None:
+    """Extract id, description, CVSS score and dates from an NVD 2.0 CVE object."""
+    cve_id = cve.get("id", "")
+    if not cve_id:
+        return None
+
+    # Extract description (English preferred)
+    descriptions = cve.get("descriptions", [])
+    desc = ""
+    for d in descriptions:
+        if d.get("lang") == "en":
+            desc = d.get("value", "")
+            break
+    if not desc and descriptions:
+        desc = descriptions[0].get("value", "")
+
+    # Prefer the newest CVSS version available
+    metrics = cve.get("metrics", {})
+    cvss_score = None
+    for version in ["cvssMetricV31", "cvssMetricV30", "cvssMetricV2"]:
+        metric_list = metrics.get(version, [])
+        if metric_list:
+            cvss_score = metric_list[0].get("cvssData", {}).get("baseScore")
+            break
+
+    return {
+        "cve_id": cve_id,
+        "description": desc,
+        "cvss_score": cvss_score,
+        "published": cve.get("published"),
+        "last_modified": cve.get("lastModified"),
+    }
+
+
+def _parse_legacy_item(item: dict) -> dict | None:
+    """Extract the same fields from a legacy NVD 1.1 feed `CVE_Items` entry."""
+    cve_id = item.get("cve", {}).get("CVE_data_meta", {}).get("ID", "")
+    if not cve_id:
+        return None
+
+    descriptions = item.get("cve", {}).get("description", {}).get("description_data", [])
+    desc = next((d.get("value", "") for d in descriptions if d.get("lang") == "en"), "")
+    if not desc and descriptions:
+        desc = descriptions[0].get("value", "")
+
+    impact = item.get("impact", {})
+    cvss_score = (
+        impact.get("baseMetricV3", {}).get("cvssV3", {}).get("baseScore")
+        or impact.get("baseMetricV2", {}).get("cvssV2", {}).get("baseScore")
+    )
+
+    return {
+        "cve_id": cve_id,
+        "description": desc,
+        "cvss_score": cvss_score,
+        "published": item.get("publishedDate"),
+        "last_modified": item.get("lastModifiedDate"),
+    }
+
+
+def _parse_ts(value: str) -> datetime:
+    """Parse an NVD timestamp (naive values are UTC)."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _upsert_cves(conn: sqlite3.Connection, cves: list[dict]) -> None:
+    """Insert or update CVE rows; unchanged rows are left untouched."""
+    conn.executemany(
+        """INSERT INTO nvd_cves (cve_id, description, cvss_score, published, last_modified)
+           VALUES (:cve_id, :description, :cvss_score, :published, :last_modified)
+           ON CONFLICT(cve_id) DO UPDATE SET
+               description = excluded.description,
+               cvss_score = excluded.cvss_score,
+               published = excluded.published,
+               last_modified = excluded.last_modified
+           WHERE excluded.last_modified IS NOT nvd_cves.last_modified""",
+        cves,
+    )
+
+
+def _advance_state(conn: sqlite3.Connection, last_modified: datetime) -> None:
+    """Move the mirror's high-water mark forward (never backwards)."""
+    row = conn.execute("SELECT last_modified_end FROM nvd_mirror_state WHERE id = 1").fetchone()
+    if row and row["last_modified_end"] and _parse_ts(row["last_modified_end"]) >= last_modified:
+        return
+    conn.execute(
+        """INSERT INTO nvd_mirror_state (id, last_modified_end, updated_at) VALUES (1, ?, ?)
+           ON CONFLICT(id) DO UPDATE SET
+               last_modified_end = excluded.last_modified_end,
+               updated_at = excluded.updated_at""",
+        (last_modified.isoformat(), datetime.now(timezone.utc).isoformat()),
+    )
+
+
+def import_feed_file(conn: sqlite3.Connection, path: str | Path) -> int:
+    """Import an NVD JSON feed file (2.0 or legacy 1.1, optionally gzipped).
+
+    Returns the number of CVEs read from the file.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if "vulnerabilities" in data:
+        cves = [parse_cve(v.get("cve", {})) for v in data["vulnerabilities"]]
+    else:
+        cves = [_parse_legacy_item(item) for item in data.get("CVE_Items", [])]
+    cves = [c for c in cves if c is not None]
+
+    _upsert_cves(conn, cves)
+    modified = [_parse_ts(c["last_modified"]) for c in cves if c["last_modified"]]
+    if modified:
+        _advance_state(conn, max(modified))
+    conn.commit()
+
+    logger.info("NVD mirror: imported %d CVEs from %s", len(cves), path.name)
+    return len(cves)
+
+
+async def update_mirror(conn: sqlite3.Connection, since: datetime | None = None) -> dict:
+    """Fetch CVEs modified since the last update, in windows of at most 120 days.
+
+    The high-water mark is saved after every window, so an interrupted update
+    continues from the last completed window.
+    """
+    if since is None:
+        row = conn.execute("SELECT last_modified_end FROM nvd_mirror_state WHERE id = 1").fetchone()
+        if not row or not row["last_modified_end"]:
+            raise ValueError("NVD mirror is empty; import NVD JSON feed files first or pass a start date")
+        since = _parse_ts(row["last_modified_end"])
+
+    headers = {}
+    if NVD_API_KEY:
+        headers["apiKey"] = NVD_API_KEY
+
+    now = datetime.now(timezone.utc)
+    window_start = since
+    updated = 0
+    requests = 0
+
+    async with osint_client(timeout=60.0) as client:
+        while window_start < now:
+            window_end = min(window_start + timedelta(days=MAX_WINDOW_DAYS), now)
+            start_index = 0
+            while True:
+                resp = await get_with_retry(
+                    client,
+                    "nvd",
+                    NVD_API_URL,
+                    params={
+                        "lastModStartDate": window_start.isoformat(timespec="milliseconds"),
+                        "lastModEndDate": window_end.isoformat(timespec="milliseconds"),
+                        "startIndex": start_index,
+                        "resultsPerPage": RESULTS_PER_PAGE,
+                    },
+                    headers=headers,
+                )
+                requests += 1
+                resp.raise_for_status()
+                data = resp.json()
+
+                cves = [parse_cve(v.get("cve", {})) for v in data.get("vulnerabilities", [])]
+                cves = [c for c in cves if c is not None]
+                _upsert_cves(conn, cves)
+                updated += len(cves)
+
+                start_index += data.get("resultsPerPage", 0) or RESULTS_PER_PAGE
+                if not cves or start_index >= data.get("totalResults", 0):
+                    break
+
+            _advance_state(conn, window_end)
+            conn.commit()
+            window_start = window_end
+
+    logger.info("NVD mirror: %d CVEs updated since %s in %d requests", updated, since.isoformat(), requests)
+    return {"since": since.isoformat(), "until": now.isoformat(), "updated": updated, "requests": requests}
+
+
+def mirror_available(conn: sqlite3.Connection) -> bool:
+    """Return True if the local CVE mirror has been populated."""
+    return conn.execute("SELECT 1 FROM nvd_cves LIMIT 1").fetchone() is not None
+
+
+def mirror_status(conn: sqlite3.Connection) -> dict:
+    """Return the mirror's size and high-water mark."""
+    state = conn.execute("SELECT last_modified_end, updated_at FROM nvd_mirror_state WHERE id = 1").fetchone()
+    return {
+        "cve_count": conn.execute("SELECT COUNT(*) AS c FROM nvd_cves").fetchone()["c"],
+        "last_modified_end": state["last_modified_end"] if state else None,
+        "updated_at": state["updated_at"] if state else None,
+    }
+
+
+def lookup_cves(conn: sqlite3.Connection, terms: list[str], limit: int = 50) -> list[sqlite3.Row]:
+    """Return the CVEs whose description best matches any of the search terms."""
+    phrases = [t.replace('"', '""') for t in terms if t and t.strip()]
+    if not phrases:
+        return []
+    fts_query = " OR ".join(f'"{p}"' for p in phrases)
+    return conn.execute(
+        "SELECT c.cve_id, c.description, c.cvss_score "
+        "FROM nvd_cves_fts f JOIN nvd_cves c ON c.id = f.rowid "
+        "WHERE nvd_cves_fts MATCH ? ORDER BY f.rank LIMIT ?",
+        (fts_query, limit),
+    ).fetchall()
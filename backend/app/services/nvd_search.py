@@ -2,38 +2,85 @@
 
 import logging
 import sqlite3
-from datetime import datetime, timezone, timedelta
 
 import httpx
 
 from ..config import NVD_API_KEY
+from ..database import run_db
+from .nvd_mirror import NVD_API_URL, lookup_cves, mirror_available, parse_cve
+from .circuit_breaker import CircuitOpenError, get_with_retry, osint_client
+from .osint_store import load_fresh_artifacts, store_fetches
+from .relevance import rank_results
+from .search_terms import record_term_hits
 
 logger = logging.getLogger(__name__)
 
-NVD_API_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
 CACHE_TTL_HOURS = 12
+MAX_RESULTS = 15
 
 
-def _check_cache(
-    conn: sqlite3.Connection, technique_id: str, ttl_hours: int = CACHE_TTL_HOURS
-) -> list[dict] | None:
+async def _check_cache(conn: sqlite3.Connection, technique_id: str) -> list[dict] | None:
     """Return cached NVD results if still fresh, else None."""
-    rows = conn.execute(
-        "SELECT * FROM osint_results WHERE technique_id = ? AND source = 'nvd' ORDER BY relevance_score DESC",
-        (technique_id,),
-    ).fetchall()
-    if not rows:
-        return None
+    return await run_db(load_fresh_artifacts, conn, technique_id, "nvd")
+
+
+def _to_result(cve_id: str, description: str, cvss_score: float | None) -> dict:
+    """Shape a CVE as an (unscored) OSINT result."""
+    return {
+        "title": cve_id,
+        "url": f"https://nvd.nist.gov/vuln/detail/{cve_id}",
+        "summary": description[:500],
+        "cvss_score": cvss_score,
+    }
+
+
+def _persist_results(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    results: list[dict],
+    error: str | None,
+) -> None:
+    """Replace the cached NVD CVEs for a technique and record the fetch."""
+    items = [{**cve, "canonical_id": cve["title"]} for cve in results]
+    store_fetches(conn, "nvd", [(technique_id, items, error)], CACHE_TTL_HOURS)
+
+
+def _rank_and_persist(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    technique_name: str,
+    search_terms: list[str],
+    candidates: list[dict],
+    error: str | None,
+    term_hits: list[tuple[str, str, int]] | None = None,
+) -> list[dict]:
+    """Score candidate CVEs against the technique, then persist the best
+    MAX_RESULTS along with the result count of each API search term."""
+    record_term_hits(conn, "nvd", term_hits or [])
+    results = rank_results(conn, technique_id, technique_name, search_terms, candidates, MAX_RESULTS)
+    _persist_results(conn, technique_id, results, error)
+    return results
+
+
+def _search_mirror(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    technique_name: str,
+    search_terms: list[str],
+) -> list[dict] | None:
+    """Look a technique up in the local CVE mirror and cache the results.
 
-    fetched = rows[0]["fetched_at"]
-    if fetched:
-        try:
-            fetched_at = datetime.fromisoformat(fetched.replace("Z", "+00:00"))
-            if datetime.now(timezone.utc) - fetched_at < timedelta(hours=ttl_hours):
-                return [dict(r) for r in rows]
-        except (ValueError, TypeError):
-            pass
-    return None
+    Returns None if the mirror is empty. With a mirror the lookup is an
+    indexed FTS query, so every search term can be used and no API request
+    is made.
+    """
+    if not mirror_available(conn):
+        return None
+    candidates = [
+        _to_result(r["cve_id"], r["description"], r["cvss_score"])
+        for r in lookup_cves(conn, search_terms)
+    ]
+    return _rank_and_persist(conn, technique_id, technique_name, search_terms, candidates, None)
 
 
 async def search_nvd(
@@ -42,102 +89,75 @@ async def search_nvd(
     technique_name: str,
     keywords: list[str] | None = None,
 ) -> list[dict]:
-    """Search NVD for CVEs related to a technique."""
-    cached = _check_cache(conn, technique_id)
+    """Search NVD for CVEs related to a technique.
+
+    Raises CircuitOpenError if NVD's circuit opens before any query succeeds.
+    """
+    cached = await _check_cache(conn, technique_id)
     if cached is not None:
         logger.info("NVD cache hit for %s (%d CVEs)", technique_id, len(cached))
         return cached
 
-    search_terms = keywords or []
-    if technique_name:
-        search_terms.insert(0, technique_name)
+    search_terms = list(keywords or [technique_name])
+
+    results = await run_db(_search_mirror, conn, technique_id, technique_name, search_terms)
+    if results is not None:
+        logger.info("NVD mirror: found %d CVEs for %s", len(results), technique_id)
+        return results
 
     headers = {}
     if NVD_API_KEY:
         headers["apiKey"] = NVD_API_KEY
 
     all_cves: dict[str, dict] = {}
+    term_hits: list[tuple[str, str, int]] = []
+    succeeded = False
+    error: str | None = None
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with osint_client() as client:
         for term in search_terms[:2]:  # NVD has stricter rate limits
             try:
-                resp = await client.get(
+                resp = await get_with_retry(
+                    client,
+                    "nvd",
                     NVD_API_URL,
                     params={"keywordSearch": term, "resultsPerPage": 10},
                     headers=headers,
                 )
                 if resp.status_code == 403:
                     logger.warning("NVD rate limit hit for query: %s", term)
+                    error = "rate limited"
                     break
                 resp.raise_for_status()
                 data = resp.json()
+                succeeded = True
+                term_hits.append((technique_id, term, len(data.get("vulnerabilities", []))))
 
                 for vuln in data.get("vulnerabilities", []):
-                    cve = vuln.get("cve", {})
-                    cve_id = cve.get("id", "")
-                    if not cve_id or cve_id in all_cves:
+                    cve = parse_cve(vuln.get("cve", {}))
+                    if cve is None or cve["cve_id"] in all_cves:
                         continue
+                    all_cves[cve["cve_id"]] = _to_result(cve["cve_id"], cve["description"], cve["cvss_score"])
 
-                    # Extract description (English preferred)
-                    descriptions = cve.get("descriptions", [])
-                    desc = ""
-                    for d in descriptions:
-                        if d.get("lang") == "en":
-                            desc = d.get("value", "")[:500]
-                            break
-                    if not desc and descriptions:
-                        desc = descriptions[0].get("value", "")[:500]
-
-                    # Extract CVSS score for relevance
-                    metrics = cve.get("metrics", {})
-                    cvss_score = None
-                    for version in ["cvssMetricV31", "cvssMetricV30", "cvssMetricV2"]:
-                        metric_list = metrics.get(version, [])
-                        if metric_list:
-                            cvss_score = metric_list[0].get("cvssData", {}).get("baseScore")
-                            break
-
-                    relevance = (cvss_score / 10.0) if cvss_score else 0.5
-                    url = f"https://nvd.nist.gov/vuln/detail/{cve_id}"
-
-                    all_cves[cve_id] = {
-                        "title": cve_id,
-                        "url": url,
-                        "summary": desc,
-                        "relevance_score": round(relevance, 2),
-                    }
-
+            except CircuitOpenError:
+                # Nothing fetched yet: let the caller decide whether stored results will do
+                if not succeeded:
+                    raise
+                break
             except httpx.HTTPError as e:
                 logger.error("NVD search failed for '%s': %s", term, e)
-
-    results = sorted(all_cves.values(), key=lambda c: c["relevance_score"], reverse=True)[:15]
-
-    # Persist to cache
-    now_iso = datetime.now(timezone.utc).isoformat()
-    expires = (datetime.now(timezone.utc) + timedelta(hours=CACHE_TTL_HOURS)).isoformat()
-
-    if results:
-        conn.execute(
-            "DELETE FROM osint_results WHERE technique_id = ? AND source = 'nvd'",
-            (technique_id,),
-        )
-        for cve in results:
-            conn.execute(
-                """INSERT INTO osint_results
-                   (technique_id, source, title, url, summary, relevance_score, fetched_at, expires_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    technique_id,
-                    "nvd",
-                    cve["title"],
-                    cve["url"],
-                    cve["summary"],
-                    cve["relevance_score"],
-                    now_iso,
-                    expires,
-                ),
-            )
-        conn.commit()
+                error = str(e)
+
+    results = await run_db(
+        _rank_and_persist,
+        conn,
+        technique_id,
+        technique_name,
+        search_terms,
+        list(all_cves.values()),
+        None if succeeded else error,
+        term_hits,
+    )
 
     logger.info("NVD: found %d CVEs for %s", len(results), technique_id)
     return results
@@ -0,0 +1,123 @@
+"""Background eviction of expired and over-budget OSINT cache entries.
+
+Expired entries are kept for a grace period so cached views can still show
+stale results while a refresh is pending; past that they are deleted. If the
+cache is still over its row or byte budget, whole (technique, source) groups
+are evicted oldest-expiring first, so a technique never serves a partial
+result set from cache. First-seen/last-seen history is kept for
+HISTORY_RETENTION_DAYS after an artifact was last returned.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+
+from ..config import OSINT_CACHE_MAX_BYTES, OSINT_CACHE_MAX_ROWS, OSINT_EVICTION_INTERVAL_MINUTES
+from ..database import run_db
+
+logger = logging.getLogger(__name__)
+
+EXPIRED_GRACE_HOURS = 24 * 7
+HISTORY_RETENTION_DAYS = 90
+EVICTION_BATCH_GROUPS = 50
+
+
+def _cache_size(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Return (link rows, approximate artifact bytes) currently cached."""
+    rows = conn.execute("SELECT COUNT(*) AS c FROM technique_artifacts").fetchone()["c"]
+    size = conn.execute(
+        "SELECT COALESCE(SUM(LENGTH(canonical_id) + COALESCE(LENGTH(title), 0) "
+        "+ COALESCE(LENGTH(url), 0) + COALESCE(LENGTH(summary), 0)), 0) AS b FROM osint_artifacts"
+    ).fetchone()["b"]
+    return rows, size
+
+
+def _prune_orphans(conn: sqlite3.Connection) -> int:
+    return conn.execute(
+        "DELETE FROM osint_artifacts "
+        "WHERE NOT EXISTS (SELECT 1 FROM technique_artifacts l WHERE l.artifact_id = osint_artifacts.id)"
+    ).rowcount
+
+
+def _evict_oldest_groups(conn: sqlite3.Connection, target_links: int) -> int:
+    """Delete oldest-expiring (technique, source) groups until at least
+    `target_links` links are gone (at most EVICTION_BATCH_GROUPS per call).
+    Returns the number of links removed."""
+    groups = conn.execute(
+        "SELECT technique_id, source FROM technique_artifacts "
+        "GROUP BY technique_id, source ORDER BY MAX(expires_at) LIMIT ?",
+        (EVICTION_BATCH_GROUPS,),
+    ).fetchall()
+    removed = 0
+    for g in groups:
+        if removed >= target_links:
+            break
+        removed += conn.execute(
+            "DELETE FROM technique_artifacts WHERE technique_id = ? AND source = ?",
+            (g["technique_id"], g["source"]),
+        ).rowcount
+        conn.execute(
+            "DELETE FROM osint_fetch_status WHERE technique_id = ? AND source = ?",
+            (g["technique_id"], g["source"]),
+        )
+    return removed
+
+
+def evict_osint_cache(
+    conn: sqlite3.Connection,
+    max_rows: int = OSINT_CACHE_MAX_ROWS,
+    max_bytes: int = OSINT_CACHE_MAX_BYTES,
+) -> dict:
+    """Drop long-expired cache entries, then evict until within budget (0 = unlimited)."""
+    cutoff = time.time() - EXPIRED_GRACE_HOURS * 3600
+    expired_links = conn.execute(
+        "DELETE FROM technique_artifacts WHERE expires_at < ?", (cutoff,)
+    ).rowcount
+    expired_status = conn.execute(
+        "DELETE FROM osint_fetch_status WHERE expires_at < ?", (cutoff,)
+    ).rowcount
+    orphans = _prune_orphans(conn)
+    expired_history = conn.execute(
+        "DELETE FROM osint_history WHERE last_seen < ?", (time.time() - HISTORY_RETENTION_DAYS * 86400,)
+    ).rowcount
+
+    evicted_links = 0
+    rows, size = _cache_size(conn)
+    while rows and ((max_rows and rows > max_rows) or (max_bytes and size > max_bytes)):
+        # Links to shed: the row excess, or the byte excess scaled to links
+        target = max(
+            rows - max_rows if max_rows else 0,
+            -(-rows * (size - max_bytes) // size) if max_bytes and size > max_bytes else 0,
+            1,
+        )
+        removed = _evict_oldest_groups(conn, target)
+        if not removed:
+            break
+        evicted_links += removed
+        orphans += _prune_orphans(conn)
+        rows, size = _cache_size(conn)
+    conn.commit()
+
+    result = {
+        "expired_links": expired_links,
+        "expired_status": expired_status,
+        "evicted_links": evicted_links,
+        "orphaned_artifacts": orphans,
+        "expired_history": expired_history,
+        "rows": rows,
+        "bytes": size,
+    }
+    if expired_links or expired_status or evicted_links or orphans or expired_history:
+        logger.info("OSINT cache eviction: %s", result)
+    return result
+
+
+async def run_eviction_loop(conn: sqlite3.Connection) -> None:
+    """Sweep the OSINT cache every OSINT_EVICTION_INTERVAL_MINUTES until cancelled."""
+    while True:
+        try:
+            await run_db(evict_osint_cache, conn)
+        except sqlite3.Error:
+            logger.exception("OSINT cache eviction failed")
+        await asyncio.sleep(OSINT_EVICTION_INTERVAL_MINUTES * 60)
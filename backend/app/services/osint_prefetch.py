@@ -0,0 +1,343 @@
+"""Bulk OSINT prefetch: enrich every technique through the rate-limited sources.
+
+Progress is checkpointed per (technique, source) in SQLite, so a run that is
+interrupted (crash, restart, Ctrl-C) resumes where it left off instead of
+re-querying techniques that were already enriched.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable
+
+from ..database import run_db
+from .arxiv_search import search_arxiv, search_arxiv_batch
+from .circuit_breaker import BREAKERS
+from .github_search import search_github
+from .nvd_search import search_nvd
+from .search_terms import load_keywords, seed_search_terms
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SEARCHES = {
+    "github": search_github,
+    "arxiv": search_arxiv,
+    "nvd": search_nvd,
+}
+
+# Sources with a batch mode that serves many techniques per request. The
+# value is the batch search, which returns (results, errors) keyed by
+# technique id, and the number of techniques handed to each call (and so
+# the checkpoint granularity for that source).
+BATCH_SEARCHES = {
+    "arxiv": (search_arxiv_batch, 40),
+}
+
+# Run ids currently being processed by this process. _STARTING holds the
+# slot while claim_run creates the run (real run ids start at 1).
+_active_runs: set[int] = set()
+_STARTING = 0
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def is_prefetch_running() -> bool:
+    """Return True if a prefetch run is in progress in this process."""
+    return bool(_active_runs)
+
+
+def start_run(
+    conn: sqlite3.Connection,
+    sources: list[str] | None = None,
+    restart: bool = False,
+) -> tuple[int, list[str]]:
+    """Create a new prefetch run, or resume the latest unfinished one.
+
+    Checkpoints for every (technique, source) pair are created up front so
+    progress and ETA can be reported against a fixed total. Resuming retries
+    failed checkpoints, and sources requested explicitly that the unfinished
+    run does not cover are added to it. Returns the run id and the sources
+    added to a resumed run.
+    """
+    requested = sources or list(SOURCE_SEARCHES)
+    unknown = [s for s in requested if s not in SOURCE_SEARCHES]
+    if unknown:
+        raise ValueError(
+            f"Unknown sources: {', '.join(unknown)} (expected any of {', '.join(SOURCE_SEARCHES)})"
+        )
+    seed_search_terms(conn)
+
+    now_iso = _now_iso()
+    unfinished = conn.execute(
+        "SELECT id, sources FROM osint_prefetch_runs WHERE status = 'running' ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+
+    if unfinished and restart:
+        conn.execute(
+            "UPDATE osint_prefetch_runs SET status = 'abandoned', finished_at = ? WHERE status = 'running'",
+            (now_iso,),
+        )
+    elif unfinished:
+        run_id = unfinished["id"]
+        run_sources = unfinished["sources"].split(",")
+        added = [s for s in requested if s not in run_sources] if sources else []
+        conn.execute(
+            "UPDATE osint_prefetch_runs SET sources = ?, resumed_at = ? WHERE id = ?",
+            (",".join(run_sources + added), now_iso, run_id),
+        )
+        conn.execute(
+            "UPDATE osint_prefetch_checkpoints SET status = 'pending', result_count = NULL, error = NULL, "
+            "completed_at = NULL WHERE run_id = ? AND status = 'failed'",
+            (run_id,),
+        )
+        _create_checkpoints(conn, run_id, added)
+        conn.commit()
+        logger.info(
+            "Resuming OSINT prefetch run %d (%s)%s",
+            run_id,
+            unfinished["sources"],
+            f", adding {','.join(added)}" if added else "",
+        )
+        return run_id, added
+
+    cur = conn.execute(
+        "INSERT INTO osint_prefetch_runs (sources, status, started_at, resumed_at) VALUES (?, 'running', ?, ?)",
+        (",".join(requested), now_iso, now_iso),
+    )
+    run_id = cur.lastrowid
+    _create_checkpoints(conn, run_id, requested)
+    conn.commit()
+    logger.info("Started OSINT prefetch run %d (%s)", run_id, ",".join(requested))
+    return run_id, []
+
+
+async def claim_run(
+    conn: sqlite3.Connection,
+    sources: list[str] | None = None,
+    restart: bool = False,
+) -> tuple[int, list[str]]:
+    """Create or resume a run (see start_run) and mark it in progress.
+
+    The run is marked before the first await, so concurrent callers cannot
+    both start one; run_prefetch releases it when it finishes. Raises
+    RuntimeError if a run is already in progress in this process.
+    """
+    if is_prefetch_running():
+        raise RuntimeError("An OSINT prefetch run is already in progress")
+    _active_runs.add(_STARTING)
+    try:
+        run_id, added = await run_db(start_run, conn, sources, restart=restart)
+    finally:
+        _active_runs.discard(_STARTING)
+    _active_runs.add(run_id)
+    return run_id, added
+
+
+def _create_checkpoints(conn: sqlite3.Connection, run_id: int, sources: list[str]) -> None:
+    technique_ids = [r["id"] for r in conn.execute("SELECT id FROM techniques ORDER BY id").fetchall()]
+    conn.executemany(
+        "INSERT INTO osint_prefetch_checkpoints (run_id, technique_id, source) VALUES (?, ?, ?)",
+        [(run_id, tid, source) for tid in technique_ids for source in sources],
+    )
+
+
+def get_prefetch_status(conn: sqlite3.Connection, run_id: int | None = None) -> dict | None:
+    """Return progress, throughput and ETA for a prefetch run (latest by default)."""
+    if run_id is None:
+        run = conn.execute("SELECT * FROM osint_prefetch_runs ORDER BY id DESC LIMIT 1").fetchone()
+    else:
+        run = conn.execute("SELECT * FROM osint_prefetch_runs WHERE id = ?", (run_id,)).fetchone()
+    if not run:
+        return None
+
+    counts = {
+        r["status"]: r["c"]
+        for r in conn.execute(
+            "SELECT status, COUNT(*) AS c FROM osint_prefetch_checkpoints WHERE run_id = ? GROUP BY status",
+            (run["id"],),
+        ).fetchall()
+    }
+    total = sum(counts.values())
+    done = counts.get("done", 0)
+    failed = counts.get("failed", 0)
+    pending = counts.get("pending", 0)
+
+    # Throughput is measured since the run was (re)started by this process,
+    # so time spent crashed or stopped does not drag the rate down.
+    since_resume = conn.execute(
+        "SELECT COUNT(*) AS c FROM osint_prefetch_checkpoints "
+        "WHERE run_id = ? AND status != 'pending' AND completed_at >= ?",
+        (run["id"], run["resumed_at"]),
+    ).fetchone()["c"]
+    end = datetime.fromisoformat(run["finished_at"]) if run["finished_at"] else datetime.now(timezone.utc)
+    elapsed = max((end - datetime.fromisoformat(run["resumed_at"])).total_seconds(), 0.0)
+    per_minute = since_resume / elapsed * 60 if elapsed > 0 else 0.0
+    eta_seconds = round(pending / per_minute * 60) if per_minute > 0 and pending else None
+
+    return {
+        "run_id": run["id"],
+        "status": run["status"],
+        "sources": run["sources"].split(","),
+        "started_at": run["started_at"],
+        "resumed_at": run["resumed_at"],
+        "finished_at": run["finished_at"],
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "pending": pending,
+        "throughput_per_minute": round(per_minute, 2),
+        "eta_seconds": eta_seconds,
+    }
+
+
+def _pending_checkpoints(conn: sqlite3.Connection, run_id: int, source: str) -> list[sqlite3.Row]:
+    return conn.execute(
+        "SELECT c.technique_id, t.name FROM osint_prefetch_checkpoints c "
+        "JOIN techniques t ON t.id = c.technique_id "
+        "WHERE c.run_id = ? AND c.source = ? AND c.status = 'pending' "
+        "ORDER BY c.technique_id",
+        (run_id, source),
+    ).fetchall()
+
+
+async def _wait_for_circuit(source: str) -> None:
+    """Sleep while the source's breaker is open so its checkpoints are not
+    marked done from stale cache during an outage."""
+    breaker = BREAKERS[source]
+    while breaker.state == "open" and (wait := breaker.snapshot()["retry_in_seconds"]):
+        logger.info("Prefetch %s paused for %ds: circuit open", source, wait)
+        await asyncio.sleep(wait)
+
+
+async def _run_source(
+    conn: sqlite3.Connection,
+    run_id: int,
+    source: str,
+    on_progress: Callable[[dict], None] | None,
+) -> None:
+    """Work through the pending checkpoints of one source sequentially.
+
+    The source's rate limiter paces the outbound requests; sources run
+    concurrently with each other since their limits are independent.
+    """
+    pending = await run_db(_pending_checkpoints, conn, run_id, source)
+
+    if source in BATCH_SEARCHES:
+        await _run_source_batched(conn, run_id, source, pending, on_progress)
+        return
+
+    search = SOURCE_SEARCHES[source]
+    for row in pending:
+        technique_id = row["technique_id"]
+        keywords = (await run_db(load_keywords, conn, [(technique_id, row["name"])], source))[technique_id]
+        await _wait_for_circuit(source)
+        try:
+            results = await search(conn, technique_id, row["name"], keywords)
+            status, count, error = "done", len(results), None
+        except Exception as e:
+            logger.error("Prefetch %s failed for %s: %s", source, technique_id, e)
+            status, count, error = "failed", None, str(e)[:500]
+
+        await run_db(_checkpoint, conn, run_id, [(technique_id, source, status, count, error)])
+        if on_progress:
+            on_progress(await run_db(get_prefetch_status, conn, run_id))
+
+
+async def _run_source_batched(
+    conn: sqlite3.Connection,
+    run_id: int,
+    source: str,
+    pending: list[sqlite3.Row],
+    on_progress: Callable[[dict], None] | None,
+) -> None:
+    """Work through pending checkpoints in chunks using the source's batch search."""
+    search_batch, batch_size = BATCH_SEARCHES[source]
+
+    for i in range(0, len(pending), batch_size):
+        chunk = pending[i:i + batch_size]
+        keywords = await run_db(load_keywords, conn, [(r["technique_id"], r["name"]) for r in chunk], source)
+        await _wait_for_circuit(source)
+        try:
+            results, failures = await search_batch(
+                conn,
+                [(r["technique_id"], r["name"], keywords[r["technique_id"]]) for r in chunk],
+            )
+            outcomes = [
+                (r["technique_id"], "failed", None, failures[r["technique_id"]][:500])
+                if r["technique_id"] in failures
+                else (r["technique_id"], "done", len(results.get(r["technique_id"], [])), None)
+                for r in chunk
+            ]
+        except Exception as e:
+            logger.error("Prefetch %s batch failed: %s", source, e)
+            outcomes = [(r["technique_id"], "failed", None, str(e)[:500]) for r in chunk]
+
+        await run_db(
+            _checkpoint,
+            conn,
+            run_id,
+            [(technique_id, source, status, count, error) for technique_id, status, count, error in outcomes],
+        )
+        if on_progress:
+            on_progress(await run_db(get_prefetch_status, conn, run_id))
+
+
+def _checkpoint(
+    conn: sqlite3.Connection,
+    run_id: int,
+    outcomes: list[tuple[str, str, str, int | None, str | None]],
+) -> None:
+    """Mark (technique_id, source, status, count, error) checkpoints complete in one commit."""
+    now_iso = _now_iso()
+    conn.executemany(
+        "UPDATE osint_prefetch_checkpoints SET status = ?, result_count = ?, error = ?, completed_at = ? "
+        "WHERE run_id = ? AND technique_id = ? AND source = ?",
+        [
+            (status, count, error, now_iso, run_id, technique_id, source)
+            for technique_id, source, status, count, error in outcomes
+        ],
+    )
+    conn.commit()
+
+
+def _run_sources(conn: sqlite3.Connection, run_id: int) -> list[str] | None:
+    run = conn.execute("SELECT sources FROM osint_prefetch_runs WHERE id = ?", (run_id,)).fetchone()
+    return run["sources"].split(",") if run else None
+
+
+def _finish_run(conn: sqlite3.Connection, run_id: int) -> None:
+    conn.execute(
+        "UPDATE osint_prefetch_runs SET status = 'completed', finished_at = ? WHERE id = ?",
+        (_now_iso(), run_id),
+    )
+    conn.commit()
+
+
+async def run_prefetch(
+    conn: sqlite3.Connection,
+    run_id: int,
+    on_progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """Process all pending checkpoints of a run and mark it completed.
+
+    The run is marked in progress (if claim_run has not already) until it
+    finishes or fails.
+    """
+    _active_runs.add(run_id)
+    try:
+        sources = await run_db(_run_sources, conn, run_id)
+        if sources is None:
+            raise ValueError(f"Prefetch run {run_id} not found")
+        await asyncio.gather(
+            *(_run_source(conn, run_id, s, on_progress) for s in sources)
+        )
+        await run_db(_finish_run, conn, run_id)
+    finally:
+        _active_runs.discard(run_id)
+
+    status = await run_db(get_prefetch_status, conn, run_id)
+    logger.info("OSINT prefetch run %d complete: %s", run_id, status)
+    return status
@@ -0,0 +1,209 @@
+"""Record and replay GitHub, arXiv and NVD responses without the network.
+
+A recording is a JSON list of exchanges:
+
+    {"source": "github", "params": {"q": "..."}, "status": 200,
+     "headers": {"X-RateLimit-Remaining": "9"}, "body": "...", "latency_ms": 180}
+
+`ReplayTransport` serves them to the OSINT services in place of the real
+APIs. Requests are matched on (source, query params); unmatched requests
+cycle through the source's successful exchanges so a small recording can
+drive a bulk run. Recorded latency is replayed (optionally scaled), the
+published rate limits of each API are enforced the way the real servers do
+(GitHub/NVD 403, arXiv 503), and transient errors can be injected at a
+fixed rate. Every request is logged so benchmarks can report latency and
+rate-limit compliance.
+
+`RecordingTransport` wraps a real transport and captures live exchanges in
+the same format.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from pathlib import Path
+
+import httpx
+
+from ..config import GITHUB_TOKEN, NVD_API_KEY
+
+SOURCE_HOSTS = {
+    "api.github.com": "github",
+    "export.arxiv.org": "arxiv",
+    "services.nvd.nist.gov": "nvd",
+}
+
+# Server-side limits as published: (requests, window seconds)
+SERVER_LIMITS = {
+    "github": (30 if GITHUB_TOKEN else 10, 60.0),
+    "github_core": (5000 if GITHUB_TOKEN else 60, 3600.0),
+    "arxiv": (1, 3.0),
+    "nvd": (50 if NVD_API_KEY else 5, 30.0),
+}
+
+# What each API answers when its limit is exceeded
+_LIMIT_RESPONSES = {
+    "github": (403, '{"message": "API rate limit exceeded"}'),
+    "github_core": (403, '{"message": "API rate limit exceeded"}'),
+    "arxiv": (503, "Rate exceeded."),
+    "nvd": (403, ""),
+}
+
+
+def _source_for(request: httpx.Request) -> str:
+    source = SOURCE_HOSTS.get(request.url.host)
+    if source is None:
+        raise ValueError(f"No OSINT source for host {request.url.host}")
+    # GitHub's search API and its core REST/GraphQL APIs are limited separately
+    if source == "github" and not request.url.path.startswith("/search/"):
+        return "github_core"
+    return source
+
+
+def _request_params(request: httpx.Request) -> dict:
+    """Query params, plus the repo path and GraphQL variables for GitHub core requests."""
+    params = dict(request.url.params)
+    if request.url.host == "api.github.com" and not request.url.path.startswith("/search/"):
+        params["path"] = request.url.path
+        if request.method == "POST" and request.content:
+            params["variables"] = json.dumps(json.loads(request.content).get("variables"), sort_keys=True)
+    return params
+
+
+def _match_key(source: str, params: dict) -> str:
+    return json.dumps([source, sorted((k, str(v)) for k, v in params.items())])
+
+
+def load_recordings(path: str | Path) -> list[dict]:
+    """Load exchanges from a recording file or every *.json file in a directory."""
+    path = Path(path)
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    exchanges = []
+    for f in files:
+        exchanges.extend(json.loads(f.read_text()))
+    return exchanges
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve recorded exchanges in place of the GitHub, arXiv and NVD APIs.
+
+    `latency_scale` multiplies recorded latencies, `time_scale` divides the
+    server rate-limit windows (to match a sped-up client, see
+    `rate_limit.LIMITERS`), and `error_rate` is the fraction of requests
+    answered with an injected 502/503/504.
+    """
+
+    def __init__(
+        self,
+        exchanges: list[dict],
+        latency_scale: float = 1.0,
+        time_scale: float = 1.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self.limits = {s: (n, period / time_scale) for s, (n, period) in SERVER_LIMITS.items()}
+        self._random = random.Random(seed)
+        self._exact: dict[str, dict] = {}
+        self._fallback: dict[str, list[dict]] = {}
+        self._next: dict[str, int] = {}
+        self._windows: dict[str, deque[float]] = {s: deque() for s in SERVER_LIMITS}
+        # (source, status, latency seconds, rate limited) per request served
+        self.log: list[tuple[str, int, float, bool]] = []
+
+        for exchange in exchanges:
+            self._exact[_match_key(exchange["source"], exchange.get("params", {}))] = exchange
+            if exchange["status"] == 200:
+                self._fallback.setdefault(exchange["source"], []).append(exchange)
+
+    def _pick(self, source: str, params: dict) -> dict | None:
+        exchange = self._exact.get(_match_key(source, params))
+        if exchange is not None:
+            return exchange
+        candidates = self._fallback.get(source)
+        if not candidates:
+            return None
+        i = self._next.get(source, 0)
+        self._next[source] = i + 1
+        return candidates[i % len(candidates)]
+
+    def _over_limit(self, source: str, now: float) -> tuple[bool, int, float]:
+        """Count the request against the source window; return (limited, remaining, reset_at)."""
+        max_calls, period = self.limits[source]
+        window = self._windows[source]
+        while window and now - window[0] >= period:
+            window.popleft()
+        window.append(now)
+        return len(window) > max_calls, max(max_calls - len(window), 0), window[0] + period
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        source = _source_for(request)
+        started = time.monotonic()
+        exchange = self._pick(source, _request_params(request))
+        etag = exchange and exchange.get("headers", {}).get("ETag")
+        # Conditional hits are answered 304 and do not count against the limit
+        not_modified = bool(etag) and request.headers.get("If-None-Match") == etag
+        limited, remaining, reset_at = (
+            (False, 0, started) if not_modified else self._over_limit(source, started)
+        )
+
+        if not_modified:
+            status, body, headers = 304, "", {"ETag": etag}
+        elif limited:
+            status, body = _LIMIT_RESPONSES[source]
+            headers = {}
+        elif self.error_rate and self._random.random() < self.error_rate:
+            status, body, headers = self._random.choice([502, 503, 504]), "", {}
+        elif exchange is None:
+            status, body, headers = 404, "", {}
+        else:
+            status, body, headers = exchange["status"], exchange["body"], dict(exchange.get("headers", {}))
+
+        if source in ("github", "github_core") and not not_modified:
+            headers.update({
+                "X-RateLimit-Limit": str(self.limits[source][0]),
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(int(time.time() + reset_at - started)),
+            })
+
+        latency_ms = exchange.get("latency_ms", 0) if exchange else 0
+        await asyncio.sleep(latency_ms / 1000 * self.latency_scale)
+
+        self.log.append((source, status, time.monotonic() - started, limited))
+        return httpx.Response(status, headers=headers, content=body.encode(), request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through to `transport` and capture each exchange."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.exchanges: list[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()
+        self.exchanges.append({
+            "source": _source_for(request),
+            "params": _request_params(request),
+            "status": response.status_code,
+            "headers": {
+                k: v for k, v in response.headers.items()
+                if k.lower().startswith(("x-ratelimit", "retry-after", "content-type", "etag"))
+            },
+            "body": body.decode("utf-8", errors="replace"),
+            "latency_ms": round((time.monotonic() - started) * 1000),
+        })
+        # The body is already decoded, so drop the encoding headers
+        headers = [
+            (k, v) for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.exchanges, indent=2))
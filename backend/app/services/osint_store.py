@@ -0,0 +1,352 @@
+"""Normalized OSINT artifact store shared across techniques.
+
+Each external artifact (GitHub repo, arXiv paper, CVE) is stored once in
+`osint_artifacts`, keyed by its canonical id (repo full name, arXiv id, CVE
+id). `technique_artifacts` links artifacts to techniques with a per-link
+relevance score and fetch timestamps, so refreshing one technique updates a
+shared artifact in place instead of duplicating its text per technique.
+
+`osint_history` remembers when each artifact was first and last returned
+for a technique, and artifacts keep the change of their star count and
+CVSS score at their last update, so "what's new" needs no table scans.
+
+`osint_fetch_status` records the outcome of the last fetch per (technique,
+source) so empty results and failures are cached as well, each with its own
+TTL, instead of re-hitting the external API on every request.
+"""
+
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from ..prometheus import Counter
+
+ARTIFACT_FIELDS = ("title", "url", "summary", "stars", "language", "cvss_score")
+
+# Techniques with no results rarely gain some quickly, so empty fetches are
+# cached longer than any source's regular TTL.
+EMPTY_TTL_HOURS = 48
+# Failed fetches back off exponentially: 15 min, 30 min, 1 h, ... up to 24 h.
+ERROR_BACKOFF_BASE_MINUTES = 15
+ERROR_BACKOFF_MAX_HOURS = 24
+
+OSINT_CACHE_HITS = Counter(
+    "atlas_osint_cache_hits_total", "OSINT lookups served from fresh stored results", ("source",)
+)
+OSINT_CACHE_MISSES = Counter(
+    "atlas_osint_cache_misses_total", "OSINT lookups with no fresh stored results", ("source",)
+)
+
+
+def canonical_arxiv_id(url: str) -> str:
+    """Return the version-less arXiv id from an abs/pdf URL (e.g. 2301.12345)."""
+    tail = url.rsplit("/abs/", 1)[-1].rsplit("/pdf/", 1)[-1]
+    return re.sub(r"v\d+$", "", tail.removesuffix(".pdf"))
+
+
+def save_artifacts(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    source: str,
+    items: list[dict],
+    ttl_hours: int,
+) -> None:
+    """Replace a technique's links for one source, upserting the artifacts.
+
+    `items` carry `canonical_id` plus any of ARTIFACT_FIELDS and the link
+    fields `relevance_score` and `category`. Artifacts whose content did not
+    change are not rewritten; changed ones record their star and CVSS
+    deltas. Artifacts left without any link are removed, but their
+    first-seen/last-seen history is kept. Empty `items` unlink all of the
+    technique's artifacts for the source. The caller commits.
+    """
+    if not items:
+        linked = [
+            r["artifact_id"]
+            for r in conn.execute(
+                "SELECT artifact_id FROM technique_artifacts WHERE technique_id = ? AND source = ?",
+                (technique_id, source),
+            ).fetchall()
+        ]
+        if linked:
+            _unlink(conn, technique_id, linked)
+        return
+
+    now = time.time()
+    now_iso = datetime.now(timezone.utc).isoformat()
+    expires = now + ttl_hours * 3600
+
+    changed = " OR ".join(f"osint_artifacts.{f} IS NOT excluded.{f}" for f in ARTIFACT_FIELDS)
+    conn.executemany(
+        f"""INSERT INTO osint_artifacts (source, canonical_id, {", ".join(ARTIFACT_FIELDS)}, updated_at)
+            VALUES (?, ?, {", ".join("?" for _ in ARTIFACT_FIELDS)}, ?)
+            ON CONFLICT(source, canonical_id) DO UPDATE SET
+                {", ".join(f"{f} = excluded.{f}" for f in ARTIFACT_FIELDS)},
+                stars_delta = CASE WHEN excluded.stars IS NOT osint_artifacts.stars
+                    THEN excluded.stars - osint_artifacts.stars ELSE osint_artifacts.stars_delta END,
+                cvss_delta = CASE WHEN excluded.cvss_score IS NOT osint_artifacts.cvss_score
+                    THEN excluded.cvss_score - osint_artifacts.cvss_score ELSE osint_artifacts.cvss_delta END,
+                updated_at = excluded.updated_at
+            WHERE {changed}""",
+        [
+            (source, item["canonical_id"], *(item.get(f) for f in ARTIFACT_FIELDS), now_iso)
+            for item in items
+        ],
+    )
+
+    canonical_ids = [item["canonical_id"] for item in items]
+    placeholders = ",".join("?" for _ in canonical_ids)
+    artifact_ids = {
+        r["canonical_id"]: r["id"]
+        for r in conn.execute(
+            f"SELECT id, canonical_id FROM osint_artifacts WHERE source = ? AND canonical_id IN ({placeholders})",
+            (source, *canonical_ids),
+        ).fetchall()
+    }
+
+    keep = set(artifact_ids.values())
+    stale = [
+        r["artifact_id"]
+        for r in conn.execute(
+            "SELECT artifact_id FROM technique_artifacts WHERE technique_id = ? AND source = ?",
+            (technique_id, source),
+        ).fetchall()
+        if r["artifact_id"] not in keep
+    ]
+    if stale:
+        _unlink(conn, technique_id, stale)
+
+    conn.executemany(
+        """INSERT INTO technique_artifacts
+           (technique_id, artifact_id, source, relevance_score, category, fetched_at, expires_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(technique_id, artifact_id) DO UPDATE SET
+               relevance_score = excluded.relevance_score,
+               category = excluded.category,
+               fetched_at = excluded.fetched_at,
+               expires_at = excluded.expires_at""",
+        [
+            (
+                technique_id,
+                artifact_ids[item["canonical_id"]],
+                source,
+                item.get("relevance_score"),
+                item.get("category"),
+                now,
+                expires,
+            )
+            for item in items
+        ],
+    )
+    conn.executemany(
+        """INSERT INTO osint_history (technique_id, source, canonical_id, first_seen, last_seen)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT(technique_id, source, canonical_id) DO UPDATE SET last_seen = excluded.last_seen""",
+        [(technique_id, source, item["canonical_id"], now, now) for item in items],
+    )
+
+
+def _unlink(conn: sqlite3.Connection, technique_id: str, artifact_ids: list[int]) -> None:
+    """Remove technique links and drop artifacts no other technique references."""
+    placeholders = ",".join("?" for _ in artifact_ids)
+    conn.execute(
+        f"DELETE FROM technique_artifacts WHERE technique_id = ? AND artifact_id IN ({placeholders})",
+        (technique_id, *artifact_ids),
+    )
+    conn.execute(
+        f"DELETE FROM osint_artifacts WHERE id IN ({placeholders}) "
+        "AND NOT EXISTS (SELECT 1 FROM technique_artifacts l WHERE l.artifact_id = osint_artifacts.id)",
+        artifact_ids,
+    )
+
+
+def expire_technique_artifacts(conn: sqlite3.Connection, technique_id: str) -> None:
+    """Mark all of a technique's cached results as expired so the next lookup refetches.
+
+    Links are kept (and still served if the refetch fails); the refetch then
+    upserts them in place instead of deleting and reinserting everything.
+    """
+    now = time.time()
+    conn.execute(
+        "UPDATE technique_artifacts SET expires_at = ? WHERE technique_id = ? AND expires_at > ?",
+        (now, technique_id, now),
+    )
+    conn.execute(
+        "UPDATE osint_fetch_status SET expires_at = ? WHERE technique_id = ? AND expires_at > ?",
+        (now, technique_id, now),
+    )
+    conn.commit()
+
+
+def record_fetch(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    source: str,
+    result_count: int,
+    ttl_hours: int,
+    error: str | None = None,
+) -> None:
+    """Record the outcome of a fetch and when it should be retried.
+
+    Successful fetches expire after the source TTL, empty ones after
+    EMPTY_TTL_HOURS, and failures after an exponential backoff based on the
+    number of consecutive failures. The caller commits.
+    """
+    now = time.time()
+    row = conn.execute(
+        "SELECT failure_count FROM osint_fetch_status WHERE technique_id = ? AND source = ?",
+        (technique_id, source),
+    ).fetchone()
+
+    if error is not None:
+        status = "error"
+        failure_count = (row["failure_count"] if row else 0) + 1
+        backoff_seconds = min(
+            ERROR_BACKOFF_BASE_MINUTES * 60 * 2 ** (failure_count - 1),
+            ERROR_BACKOFF_MAX_HOURS * 3600,
+        )
+        expires = now + backoff_seconds
+    else:
+        status = "ok" if result_count else "empty"
+        failure_count = 0
+        expires = now + (ttl_hours if result_count else EMPTY_TTL_HOURS) * 3600
+
+    conn.execute(
+        """INSERT INTO osint_fetch_status
+           (technique_id, source, status, result_count, failure_count, last_error, fetched_at, expires_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(technique_id, source) DO UPDATE SET
+               status = excluded.status,
+               result_count = excluded.result_count,
+               failure_count = excluded.failure_count,
+               last_error = excluded.last_error,
+               fetched_at = excluded.fetched_at,
+               expires_at = excluded.expires_at""",
+        (technique_id, source, status, result_count, failure_count, error and error[:500], now, expires),
+    )
+
+
+def store_fetches(
+    conn: sqlite3.Connection,
+    source: str,
+    fetches: list[tuple[str, list[dict], str | None]],
+    ttl_hours: int,
+) -> None:
+    """Persist the results and outcome of fetches in a single transaction.
+
+    `fetches` holds (technique_id, items, error) with items as accepted by
+    save_artifacts; error is None for a successful fetch. Failed fetches
+    keep the stored links so they are still served.
+    """
+    for technique_id, items, error in fetches:
+        if error is None:
+            save_artifacts(conn, technique_id, source, items, ttl_hours)
+        record_fetch(conn, technique_id, source, len(items), ttl_hours, error=error)
+    conn.commit()
+
+
+def epoch_to_iso(value: float | None) -> str | None:
+    """Format an epoch timestamp from the cache tables as ISO-8601 UTC."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+def _to_result(row: sqlite3.Row, technique_id: str) -> dict:
+    """Shape a joined artifact/link row like the per-source API results."""
+    if row["source"] == "github":
+        return {
+            "technique_id": technique_id,
+            "repo_full_name": row["canonical_id"],
+            "description": row["summary"],
+            "stars": row["stars"],
+            "language": row["language"],
+            "url": row["url"],
+            "category": row["category"],
+            "last_updated": epoch_to_iso(row["fetched_at"]),
+            "stars_delta": row["stars_delta"],
+            "first_seen": epoch_to_iso(row["first_seen"]),
+        }
+    return {
+        "technique_id": technique_id,
+        "source": row["source"],
+        "title": row["title"],
+        "url": row["url"],
+        "summary": row["summary"],
+        "relevance_score": row["relevance_score"],
+        "cvss_score": row["cvss_score"],
+        "cvss_delta": row["cvss_delta"],
+        "fetched_at": epoch_to_iso(row["fetched_at"]),
+        "expires_at": epoch_to_iso(row["expires_at"]),
+        "first_seen": epoch_to_iso(row["first_seen"]),
+    }
+
+
+_RESULT_COLUMNS = (
+    "a.source, a.canonical_id, a.title, a.url, a.summary, a.stars, a.stars_delta, a.language, "
+    "a.cvss_score, a.cvss_delta, h.first_seen"
+)
+
+
+def load_artifacts(conn: sqlite3.Connection, technique_id: str, source: str) -> list[dict]:
+    """Return a technique's artifacts for one source, best first."""
+    order = "a.stars DESC" if source == "github" else "l.relevance_score DESC"
+    rows = conn.execute(
+        f"SELECT {_RESULT_COLUMNS}, l.relevance_score, l.category, l.fetched_at, l.expires_at "
+        "FROM technique_artifacts l JOIN osint_artifacts a ON a.id = l.artifact_id "
+        "LEFT JOIN osint_history h ON h.technique_id = l.technique_id "
+        "AND h.source = l.source AND h.canonical_id = a.canonical_id "
+        f"WHERE l.technique_id = ? AND l.source = ? ORDER BY {order}",
+        (technique_id, source),
+    ).fetchall()
+    return [_to_result(r, technique_id) for r in rows]
+
+
+def load_new_artifacts(conn: sqlite3.Connection, technique_id: str, since: float) -> list[dict]:
+    """Return artifacts first returned for a technique at or after `since`
+    (epoch seconds), newest first, that are still linked to it.
+
+    An index range scan on osint_history (technique_id, first_seen).
+    """
+    rows = conn.execute(
+        f"SELECT {_RESULT_COLUMNS}, l.relevance_score, l.category, l.fetched_at, l.expires_at "
+        "FROM osint_history h "
+        "JOIN osint_artifacts a ON a.source = h.source AND a.canonical_id = h.canonical_id "
+        "JOIN technique_artifacts l ON l.technique_id = h.technique_id AND l.artifact_id = a.id "
+        "WHERE h.technique_id = ? AND h.first_seen >= ? ORDER BY h.first_seen DESC",
+        (technique_id, since),
+    ).fetchall()
+    return [_to_result(r, technique_id) for r in rows]
+
+
+def get_osint_stats(conn: sqlite3.Connection) -> dict:
+    """Return the trigger-maintained OSINT coverage counters (one-row read)."""
+    row = conn.execute("SELECT * FROM osint_stats WHERE id = 1").fetchone()
+    stats = dict(row) if row else {}
+    stats.pop("id", None)
+    return stats
+
+
+def load_fresh_artifacts(conn: sqlite3.Connection, technique_id: str, source: str) -> list[dict] | None:
+    """Return a technique's artifacts for one source if still fresh, else None.
+
+    Freshness is an indexed existence check against the stored expiry. While
+    the last recorded fetch has not expired, whatever is stored is returned,
+    which may be an empty list (negative cache hit) or the previous results
+    after a failed refresh. Links without a recorded fetch fall back to their
+    own expiry.
+    """
+    now = time.time()
+    fresh = conn.execute(
+        "SELECT 1 FROM osint_fetch_status WHERE technique_id = ? AND source = ? AND expires_at > ?",
+        (technique_id, source, now),
+    ).fetchone() or conn.execute(
+        "SELECT 1 FROM technique_artifacts WHERE technique_id = ? AND source = ? AND expires_at > ? LIMIT 1",
+        (technique_id, source, now),
+    ).fetchone()
+    if not fresh:
+        OSINT_CACHE_MISSES.inc(source=source)
+        return None
+    OSINT_CACHE_HITS.inc(source=source)
+    return load_artifacts(conn, technique_id, source)
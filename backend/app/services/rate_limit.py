@@ -0,0 +1,49 @@
+"""Per-source request pacing for external OSINT APIs."""
+
+import asyncio
+import time
+from collections import deque
+
+from ..config import GITHUB_TOKEN, NVD_API_KEY
+
+
+class RateLimiter:
+    """Sliding-window limiter allowing at most `max_calls` per `period` seconds.
+
+    Callers `await limiter.acquire()` before each outbound request; the call
+    sleeps until a slot in the window is free.
+    """
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._calls[0]))
+
+    def refund(self) -> None:
+        """Give back the most recent slot, for requests the API does not count."""
+        if self._calls:
+            self._calls.pop()
+
+
+# Published limits: GitHub search allows 10 req/min unauthenticated (30 with a
+# token) and the core REST/GraphQL APIs 60 req/hour (5000 with a token), arXiv
+# asks for one request every 3 seconds, and NVD allows 5 req per rolling 30s
+# without an API key (50 with one).
+LIMITERS: dict[str, RateLimiter] = {
+    "github": RateLimiter(30 if GITHUB_TOKEN else 10, 60.0),
+    "github_core": RateLimiter(5000 if GITHUB_TOKEN else 60, 3600.0),
+    "arxiv": RateLimiter(1, 3.0),
+    "nvd": RateLimiter(50 if NVD_API_KEY else 5, 30.0),
+}
@@ -0,0 +1,123 @@
+"""Local relevance scoring of OSINT candidates against a technique.
+
+Each candidate's title and summary is scored with BM25 against a query built
+from the technique's name, search keywords and description: term frequency
+saturates, long documents are normalized and terms common to most candidates
+count less (IDF over the candidate set). Scores are divided by the best
+score any document could reach for the query, so they fall in [0, 1]. All
+candidates of a technique are scored in one vectorized pass, and the score
+is stored with the link so ranking at read time is a plain ORDER BY.
+"""
+
+import re
+import sqlite3
+
+import numpy as np
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Share of the query weight given to each technique field, spread over the
+# distinct terms of that field
+FIELD_WEIGHTS = {"name": 0.45, "keywords": 0.35, "description": 0.2}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have in into is it its of on or that the their these this "
+    "to was were which while with may such used using use other than been also more".split()
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase alphanumeric tokens of `text`, without stopwords and 1-letter tokens."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def candidate_phrases(text: str | None, max_words: int = 3) -> list[str]:
+    """Return every run of 1..max_words consecutive non-stopword tokens in `text`."""
+    phrases = []
+    run: list[str] = []
+    for token in [*_TOKEN_RE.findall((text or "").lower()), ""]:
+        if len(token) > 1 and token not in STOPWORDS and not token.isdigit():
+            run.append(token)
+            continue
+        for size in range(1, max_words + 1):
+            phrases.extend(" ".join(run[i:i + size]) for i in range(len(run) - size + 1))
+        run = []
+    return phrases
+
+
+def _query_weights(name: str, keywords: list[str], description: str) -> dict[str, float]:
+    fields = {
+        "name": set(tokenize(name)),
+        "keywords": {t for k in keywords for t in tokenize(k)},
+        "description": set(tokenize(description)),
+    }
+    total = sum(FIELD_WEIGHTS[f] for f, tokens in fields.items() if tokens)
+    weights: dict[str, float] = {}
+    for field, tokens in fields.items():
+        for token in tokens:
+            weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field] / total / len(tokens)
+    return weights
+
+
+def score_documents(
+    documents: list[str],
+    name: str,
+    keywords: list[str] | None = None,
+    description: str = "",
+) -> np.ndarray:
+    """Return the normalized BM25 score in [0, 1] of each document for the technique."""
+    query = _query_weights(name, keywords or [], description)
+    if not documents or not query:
+        return np.zeros(len(documents))
+    terms = {t: i for i, t in enumerate(query)}
+    weights = np.fromiter(query.values(), dtype=float, count=len(query))
+
+    # Query-term frequency matrix (documents x query terms) and document lengths
+    docs = [tokenize(d) for d in documents]
+    lengths = np.array([len(tokens) for tokens in docs], dtype=float)
+    hits = [(row, terms[t]) for row, tokens in enumerate(docs) for t in tokens if t in terms]
+    tf = np.zeros((len(docs), len(terms)))
+    if hits:
+        rows, cols = np.array(hits).T
+        np.add.at(tf, (rows, cols), 1.0)
+
+    # Smoothed IDF over the candidates, so terms no candidate contains still count
+    n = len(docs)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n + 1) / (df + 1))
+
+    avg_length = lengths.mean() or 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+
+    term_weights = weights * idf
+    return saturated @ term_weights / ((BM25_K1 + 1) * term_weights.sum())
+
+
+def rank_results(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    technique_name: str,
+    keywords: list[str] | None,
+    results: list[dict],
+    limit: int,
+) -> list[dict]:
+    """Set `relevance_score` on each result and return the best `limit`.
+
+    Results need a title and summary; the technique description is read from
+    the database.
+    """
+    if not results:
+        return []
+    row = conn.execute("SELECT description FROM techniques WHERE id = ?", (technique_id,)).fetchone()
+    scores = score_documents(
+        [f"{r.get('title', '')} {r.get('summary', '')}" for r in results],
+        technique_name,
+        keywords,
+        row["description"] if row else "",
+    )
+    ranked = [{**r, "relevance_score": round(float(s), 3)} for r, s in zip(results, scores)]
+    ranked.sort(key=lambda r: r["relevance_score"], reverse=True)
+    return ranked[:limit]
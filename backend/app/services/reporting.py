@@ -3,6 +3,8 @@
 import logging
 import sqlite3
 
+from .osint_store import epoch_to_iso, get_osint_stats
+
 logger = logging.getLogger(__name__)
 
 # Maturity ranking for risk scoring (higher = more mature/dangerous)
@@ -72,8 +74,8 @@ def _get_top_risk_techniques(conn: sqlite3.Connection, limit: int = 10) -> list[
     rows = conn.execute(
         "SELECT t.id, t.name, t.maturity, t.is_subtechnique, "
         "(SELECT COUNT(DISTINCT csp.case_study_id) FROM case_study_procedures csp WHERE csp.technique_id = t.id) AS case_study_count, "
-        "(SELECT COUNT(*) FROM osint_results o WHERE o.technique_id = t.id) AS osint_count, "
-        "(SELECT COUNT(*) FROM github_repos g WHERE g.technique_id = t.id) AS github_count "
+        "(SELECT COUNT(*) FROM technique_artifacts o WHERE o.technique_id = t.id AND o.source != 'github') AS osint_count, "
+        "(SELECT COUNT(*) FROM technique_artifacts g WHERE g.technique_id = t.id AND g.source = 'github') AS github_count "
         "FROM techniques t "
         "ORDER BY t.id"
     ).fetchall()
@@ -116,50 +118,35 @@ def _get_attack_category_distribution(conn: sqlite3.Connection) -> dict:
 
 def _get_osint_coverage(conn: sqlite3.Connection) -> dict:
     """Summarize OSINT coverage across techniques."""
-    techniques_with_github = conn.execute(
-        "SELECT COUNT(DISTINCT technique_id) AS c FROM github_repos"
-    ).fetchone()["c"]
-    techniques_with_arxiv = conn.execute(
-        "SELECT COUNT(DISTINCT technique_id) AS c FROM osint_results WHERE source = 'arxiv'"
-    ).fetchone()["c"]
-    techniques_with_cves = conn.execute(
-        "SELECT COUNT(DISTINCT technique_id) AS c FROM osint_results WHERE source = 'nvd'"
-    ).fetchone()["c"]
-
-    total_github_repos = conn.execute("SELECT COUNT(*) AS c FROM github_repos").fetchone()["c"]
-    total_arxiv_papers = conn.execute(
-        "SELECT COUNT(*) AS c FROM osint_results WHERE source = 'arxiv'"
-    ).fetchone()["c"]
-    total_cves = conn.execute(
-        "SELECT COUNT(*) AS c FROM osint_results WHERE source = 'nvd'"
-    ).fetchone()["c"]
-
-    total_techniques = conn.execute("SELECT COUNT(*) AS c FROM techniques").fetchone()["c"]
-
+    stats = get_osint_stats(conn)
     return {
-        "total_techniques": total_techniques,
-        "techniques_with_github": techniques_with_github,
-        "techniques_with_arxiv": techniques_with_arxiv,
-        "techniques_with_cves": techniques_with_cves,
-        "total_github_repos": total_github_repos,
-        "total_arxiv_papers": total_arxiv_papers,
-        "total_cves": total_cves,
+        "total_techniques": stats.get("total_techniques", 0),
+        "techniques_with_github": stats.get("techniques_with_github", 0),
+        "techniques_with_arxiv": stats.get("techniques_with_arxiv", 0),
+        "techniques_with_cves": stats.get("techniques_with_nvd", 0),
+        "total_github_repos": stats.get("github_links", 0),
+        "total_arxiv_papers": stats.get("arxiv_links", 0),
+        "total_cves": stats.get("nvd_links", 0),
     }
 
 
 def _get_osint_highlights(conn: sqlite3.Connection) -> dict:
     """Get recent/notable OSINT results."""
-    # Most recent CVEs
+    # Most recent CVEs (each CVE once, attributed to its first-linked technique)
     recent_cves = conn.execute(
-        "SELECT technique_id, title, url, summary, fetched_at "
-        "FROM osint_results WHERE source = 'nvd' "
-        "ORDER BY fetched_at DESC LIMIT 5"
+        "SELECT MIN(l.technique_id) AS technique_id, a.title, a.url, a.summary, MAX(l.fetched_at) AS fetched_at "
+        "FROM technique_artifacts l JOIN osint_artifacts a ON a.id = l.artifact_id "
+        "WHERE l.source = 'nvd' "
+        "GROUP BY a.id ORDER BY fetched_at DESC LIMIT 5"
     ).fetchall()
 
     # Highest-starred GitHub repos
     top_repos = conn.execute(
-        "SELECT technique_id, repo_full_name, description, stars, language, url "
-        "FROM github_repos ORDER BY stars DESC LIMIT 5"
+        "SELECT MIN(l.technique_id) AS technique_id, a.canonical_id AS repo_full_name, "
+        "a.summary AS description, a.stars, a.language, a.url "
+        "FROM technique_artifacts l JOIN osint_artifacts a ON a.id = l.artifact_id "
+        "WHERE l.source = 'github' "
+        "GROUP BY a.id ORDER BY a.stars DESC LIMIT 5"
     ).fetchall()
 
     return {
@@ -169,7 +156,7 @@ def _get_osint_highlights(conn: sqlite3.Connection) -> dict:
                 "title": r["title"],
                 "url": r["url"],
                 "summary": r["summary"],
-                "fetched_at": r["fetched_at"],
+                "fetched_at": epoch_to_iso(r["fetched_at"]),
             }
             for r in recent_cves
         ],
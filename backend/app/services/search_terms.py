@@ -0,0 +1,281 @@
+"""OSINT search keywords per technique, stored in technique_search_terms.
+
+Each term applies to one source (GitHub, arXiv or NVD), so a keyword that
+finds papers but no repos can be dropped for GitHub only. Terms are seeded
+once from DEFAULT_SEARCH_TERMS; admins add, disable or delete them through
+the API and can accept suggestions mined from technique descriptions.
+
+Every external query made with a term is counted, along with whether it
+returned anything. A term with at least PRUNE_MIN_QUERIES queries and a hit
+rate below PRUNE_MIN_HIT_RATE is disabled so it stops costing API calls.
+Enabled terms are searched best hit rate first.
+"""
+
+import logging
+import math
+import sqlite3
+import time
+from collections import Counter
+
+from .relevance import candidate_phrases
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SOURCES = ("github", "arxiv", "nvd")
+
+PRUNE_MIN_QUERIES = 4
+PRUNE_MIN_HIT_RATE = 0.25
+
+# Initial keywords beyond the technique name, seeded for every source
+DEFAULT_SEARCH_TERMS: dict[str, list[str]] = {
+    "AML.T0051": ["prompt injection", "LLM jailbreak", "instruction injection"],
+    "AML.T0051.000": ["direct prompt injection", "LLM jailbreak"],
+    "AML.T0051.001": ["indirect prompt injection", "cross-plugin injection"],
+    "AML.T0051.002": ["stored prompt injection", "persistent prompt injection"],
+    "AML.T0020": ["data poisoning", "training data attack", "backdoor attack ML"],
+    "AML.T0043": ["adversarial examples", "evasion attack ML", "adversarial perturbation"],
+    "AML.T0043.000": ["white box adversarial", "gradient-based attack"],
+    "AML.T0043.001": ["black box adversarial", "query-based attack"],
+    "AML.T0043.002": ["physical adversarial", "adversarial patch"],
+    "AML.T0024": ["model extraction", "model stealing", "model distillation attack"],
+    "AML.T0024.000": ["model replication", "model clone"],
+    "AML.T0024.001": ["side channel model extraction"],
+    "AML.T0025": ["model inversion attack", "attribute inference", "membership inference"],
+    "AML.T0040": ["ML model access", "model API abuse"],
+    "AML.T0042": ["model supply chain", "model poisoning", "trojan model"],
+    "AML.T0042.001": ["ML model backdoor", "neural trojan"],
+    "AML.T0042.002": ["model marketplace attack", "Hugging Face security"],
+    "AML.T0048": ["AML framework", "adversarial ML toolbox"],
+    "AML.T0016": ["training data collection", "data scraping ML"],
+    "AML.T0019": ["system misuse", "AI misuse", "GenAI misuse"],
+    "AML.T0047": ["ML supply chain compromise", "ML dependency attack"],
+    "AML.T0044": ["model evasion", "adversarial evasion"],
+    "AML.T0015": ["ML artifact collection", "model weight extraction"],
+    "AML.T0010": ["ML intellectual property theft", "model IP theft"],
+    "AML.T0034": ["cost harvesting", "denial of ML service", "ML resource abuse"],
+    "AML.T0029": ["denial of ML service", "model degradation", "model DoS"],
+    "AML.T0031": ["model output manipulation", "AI content manipulation"],
+    "AML.T0049": ["LLM plugin compromise", "tool use exploit"],
+    "AML.T0050": ["command injection via API", "tool command injection"],
+    "AML.T0052": ["LLM data leakage", "training data extraction"],
+    "AML.T0053": ["LLM hallucination exploit", "package hallucination"],
+    "AML.T0054": ["LLM agent manipulation", "agentic AI exploit"],
+}
+
+
+def seed_search_terms(conn: sqlite3.Connection) -> int:
+    """Insert DEFAULT_SEARCH_TERMS for every source if no terms exist yet.
+
+    Returns the number of terms inserted.
+    """
+    if conn.execute("SELECT 1 FROM technique_search_terms LIMIT 1").fetchone():
+        return 0
+    rows = [
+        (technique_id, source, term)
+        for technique_id, terms in DEFAULT_SEARCH_TERMS.items()
+        for term in terms
+        for source in SEARCH_SOURCES
+    ]
+    conn.executemany(
+        "INSERT OR IGNORE INTO technique_search_terms (technique_id, source, search_term, origin) "
+        "VALUES (?, ?, ?, 'seed')",
+        rows,
+    )
+    conn.commit()
+    logger.info("Seeded %d OSINT search terms", len(rows))
+    return len(rows)
+
+
+def load_keywords(
+    conn: sqlite3.Connection,
+    techniques: list[tuple[str, str]],
+    source: str,
+) -> dict[str, list[str]]:
+    """Return search keywords for each (technique_id, technique_name), keyed by id.
+
+    The technique name always comes first, followed by the technique's
+    enabled terms for `source`, best hit rate first (terms not searched yet
+    rank in between proven and weak ones).
+    """
+    keywords = {technique_id: [name] if name else [] for technique_id, name in techniques}
+    if not keywords:
+        return keywords
+    placeholders = ", ".join("?" for _ in keywords)
+    rows = conn.execute(
+        "SELECT technique_id, search_term FROM technique_search_terms "
+        f"WHERE source = ? AND enabled = 1 AND technique_id IN ({placeholders}) "
+        "ORDER BY technique_id, (hits + 1.0) / (queries + 2) DESC, id",
+        (source, *keywords),
+    ).fetchall()
+    for row in rows:
+        terms = keywords[row["technique_id"]]
+        if row["search_term"].lower() not in (t.lower() for t in terms):
+            terms.append(row["search_term"])
+    return keywords
+
+
+def record_term_hits(conn: sqlite3.Connection, source: str, outcomes: list[tuple[str, str, int]]) -> None:
+    """Count one query per (technique_id, term, result count) and disable
+    terms whose hit rate has fallen below PRUNE_MIN_HIT_RATE.
+
+    Terms that are not stored (e.g. the technique name) are ignored. The
+    caller commits.
+    """
+    if not outcomes:
+        return
+    now = time.time()
+    conn.executemany(
+        "UPDATE technique_search_terms SET queries = queries + 1, hits = hits + (? > 0), "
+        "results = results + ?, last_used_at = ? "
+        "WHERE technique_id = ? AND source = ? AND search_term = ? COLLATE NOCASE",
+        [(count, count, now, technique_id, source, term) for technique_id, term, count in outcomes],
+    )
+    pruned = conn.execute(
+        "UPDATE technique_search_terms SET enabled = 0 "
+        "WHERE source = ? AND enabled = 1 AND queries >= ? AND hits < queries * ?",
+        (source, PRUNE_MIN_QUERIES, PRUNE_MIN_HIT_RATE),
+    ).rowcount
+    if pruned:
+        logger.info("Disabled %d low-yield %s search terms", pruned, source)
+
+
+def _to_dict(row: sqlite3.Row) -> dict:
+    term = dict(row)
+    term["enabled"] = bool(term["enabled"])
+    term["hit_rate"] = round(term["hits"] / term["queries"], 3) if term["queries"] else None
+    return term
+
+
+def list_search_terms(
+    conn: sqlite3.Connection,
+    technique_id: str | None = None,
+    source: str | None = None,
+    enabled: bool | None = None,
+) -> list[dict]:
+    """Return stored search terms with their query stats, optionally filtered."""
+    clauses, params = [], []
+    if technique_id is not None:
+        clauses.append("technique_id = ?")
+        params.append(technique_id)
+    if source is not None:
+        clauses.append("source = ?")
+        params.append(source)
+    if enabled is not None:
+        clauses.append("enabled = ?")
+        params.append(int(enabled))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT * FROM technique_search_terms {where} ORDER BY technique_id, source, id", params
+    ).fetchall()
+    return [_to_dict(r) for r in rows]
+
+
+def add_search_term(
+    conn: sqlite3.Connection,
+    technique_id: str,
+    search_term: str,
+    sources: list[str] | None = None,
+    origin: str = "manual",
+) -> list[dict]:
+    """Add a term for the given sources (all by default); existing ones are re-enabled.
+
+    Returns the stored rows.
+    """
+    sources = sources or list(SEARCH_SOURCES)
+    unknown = set(sources) - set(SEARCH_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown OSINT source(s): {', '.join(sorted(unknown))}")
+    search_term = " ".join(search_term.split())
+    if not search_term:
+        raise ValueError("Search term must not be empty")
+
+    conn.executemany(
+        "INSERT INTO technique_search_terms (technique_id, source, search_term, origin) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (technique_id, source, search_term) DO UPDATE SET enabled = 1",
+        [(technique_id, source, search_term, origin) for source in sources],
+    )
+    conn.commit()
+    placeholders = ", ".join("?" for _ in sources)
+    rows = conn.execute(
+        "SELECT * FROM technique_search_terms "
+        f"WHERE technique_id = ? AND search_term = ? AND source IN ({placeholders}) ORDER BY source",
+        (technique_id, search_term, *sources),
+    ).fetchall()
+    return [_to_dict(r) for r in rows]
+
+
+def update_search_term(
+    conn: sqlite3.Connection,
+    term_id: int,
+    enabled: bool | None = None,
+    search_term: str | None = None,
+) -> dict | None:
+    """Enable/disable or rename a term. Re-enabling or renaming resets its
+    stats so it is not pruned again straight away. Returns None if missing."""
+    row = conn.execute("SELECT * FROM technique_search_terms WHERE id = ?", (term_id,)).fetchone()
+    if row is None:
+        return None
+    new_term = " ".join(search_term.split()) if search_term is not None else row["search_term"]
+    if not new_term:
+        raise ValueError("Search term must not be empty")
+    new_enabled = row["enabled"] if enabled is None else int(enabled)
+    reset = new_term != row["search_term"] or (new_enabled and not row["enabled"])
+    try:
+        conn.execute(
+            "UPDATE technique_search_terms SET search_term = ?, enabled = ? WHERE id = ?",
+            (new_term, new_enabled, term_id),
+        )
+    except sqlite3.IntegrityError as e:
+        raise ValueError(f"Term {new_term!r} already exists for this technique and source") from e
+    if reset:
+        conn.execute(
+            "UPDATE technique_search_terms SET queries = 0, hits = 0, results = 0 WHERE id = ?", (term_id,)
+        )
+    conn.commit()
+    return _to_dict(conn.execute("SELECT * FROM technique_search_terms WHERE id = ?", (term_id,)).fetchone())
+
+
+def delete_search_term(conn: sqlite3.Connection, term_id: int) -> bool:
+    deleted = conn.execute("DELETE FROM technique_search_terms WHERE id = ?", (term_id,)).rowcount
+    conn.commit()
+    return bool(deleted)
+
+
+def suggest_search_terms(conn: sqlite3.Connection, technique_id: str, limit: int = 10) -> list[dict]:
+    """Suggest keywords for a technique from its name and description.
+
+    Candidate phrases (1-3 consecutive non-stopword words) are ranked by
+    TF-IDF against all technique descriptions, favouring multi-word phrases,
+    which make far more precise search queries. Phrases already stored for
+    the technique, or equal to its name, are skipped.
+    """
+    rows = conn.execute("SELECT id, name, description FROM techniques").fetchall()
+    target = next((r for r in rows if r["id"] == technique_id), None)
+    if target is None:
+        return []
+
+    df: Counter[str] = Counter()
+    for row in rows:
+        df.update(set(candidate_phrases(f"{row['name']}. {row['description']}")))
+    tf = Counter(candidate_phrases(f"{target['name']}. {target['description']}"))
+
+    existing = {
+        r["search_term"].lower()
+        for r in conn.execute(
+            "SELECT search_term FROM technique_search_terms WHERE technique_id = ?", (technique_id,)
+        ).fetchall()
+    }
+    existing.add(target["name"].lower())
+
+    scored = []
+    for phrase, count in tf.items():
+        words = phrase.count(" ") + 1
+        if phrase in existing or (words == 1 and len(phrase) < 4):
+            continue
+        # Phrases found in every technique carry no signal
+        idf = math.log(len(rows) / df[phrase])
+        if idf <= 0:
+            continue
+        scored.append({"search_term": phrase, "score": round(count * idf * math.sqrt(words), 3)})
+    scored.sort(key=lambda s: (-s["score"], s["search_term"]))
+    return scored[:limit]
@@ -0,0 +1,122 @@
+"""Batched loading of technique details.
+
+`load_technique_details` assembles any number of techniques with a fixed
+number of set-based queries (one per requested expansion) instead of a
+round of queries per technique and subtechnique. It backs the technique
+detail, export and bulk list endpoints.
+"""
+
+import sqlite3
+from typing import Iterable
+
+DETAIL_EXPANSIONS = ("tactics", "subtechniques", "mitigations", "case_studies")
+
+
+def _placeholders(values: list) -> str:
+    return ",".join("?" for _ in values)
+
+
+def _tactic_ids(conn: sqlite3.Connection, technique_ids: list[str]) -> dict[str, list[str]]:
+    tactic_ids: dict[str, list[str]] = {t: [] for t in technique_ids}
+    for r in conn.execute(
+        f"SELECT technique_id, tactic_id FROM technique_tactics "
+        f"WHERE technique_id IN ({_placeholders(technique_ids)}) ORDER BY technique_id, tactic_id",
+        technique_ids,
+    ).fetchall():
+        tactic_ids[r["technique_id"]].append(r["tactic_id"])
+    return tactic_ids
+
+
+def load_technique_details(
+    conn: sqlite3.Connection,
+    technique_ids: Iterable[str],
+    expand: Iterable[str] = DETAIL_EXPANSIONS,
+) -> dict[str, dict]:
+    """Return {technique id: detail dict} for the techniques that exist, ordered by id.
+
+    Each detail has the technique's columns and `tactic_ids`, plus one list
+    per name in `expand`: `tactics` ({id, name}), `subtechniques` (summaries
+    with their tactic_ids), `mitigations` (with usage) and `case_studies`.
+    """
+    expand = set(expand)
+    ids = list(dict.fromkeys(technique_ids))
+    if not ids:
+        return {}
+
+    details = {
+        r["id"]: {**dict(r), "is_subtechnique": bool(r["is_subtechnique"])}
+        for r in conn.execute(
+            f"SELECT * FROM techniques WHERE id IN ({_placeholders(ids)}) ORDER BY id", ids
+        ).fetchall()
+    }
+    if not details:
+        return {}
+    ids = list(details)
+
+    sub_rows = []
+    if "subtechniques" in expand:
+        sub_rows = conn.execute(
+            f"SELECT id, name, is_subtechnique, maturity, parent_technique_id FROM techniques "
+            f"WHERE parent_technique_id IN ({_placeholders(ids)}) ORDER BY id",
+            ids,
+        ).fetchall()
+
+    tactic_ids = _tactic_ids(conn, ids + [r["id"] for r in sub_rows])
+    for technique_id, detail in details.items():
+        detail["tactic_ids"] = tactic_ids[technique_id]
+        for name in expand:
+            detail[name] = []
+
+    if "tactics" in expand:
+        all_tactics = sorted({t for d in details.values() for t in d["tactic_ids"]})
+        tactic_names = {
+            r["id"]: r["name"]
+            for r in conn.execute(
+                f"SELECT id, name FROM tactics WHERE id IN ({_placeholders(all_tactics)})", all_tactics
+            ).fetchall()
+        } if all_tactics else {}
+        for detail in details.values():
+            detail["tactics"] = [{"id": t, "name": tactic_names.get(t)} for t in detail["tactic_ids"]]
+
+    for r in sub_rows:
+        details[r["parent_technique_id"]]["subtechniques"].append({
+            "id": r["id"],
+            "name": r["name"],
+            "is_subtechnique": bool(r["is_subtechnique"]),
+            "maturity": r["maturity"],
+            "tactic_ids": tactic_ids[r["id"]],
+        })
+
+    if "mitigations" in expand:
+        for r in conn.execute(
+            f"SELECT mt.technique_id, m.id, m.name, m.category, mt.usage "
+            f"FROM mitigation_techniques mt "
+            f"JOIN mitigations m ON mt.mitigation_id = m.id "
+            f"WHERE mt.technique_id IN ({_placeholders(ids)}) "
+            f"ORDER BY mt.technique_id, mt.rowid",
+            ids,
+        ).fetchall():
+            details[r["technique_id"]]["mitigations"].append(
+                {"id": r["id"], "name": r["name"], "category": r["category"], "usage": r["usage"]}
+            )
+
+    if "case_studies" in expand:
+        # Case studies in the order the technique first appears in their procedures
+        for r in conn.execute(
+            f"SELECT csp.technique_id, cs.id, cs.name, cs.incident_date, cs.case_study_type, cs.target "
+            f"FROM case_study_procedures csp "
+            f"JOIN case_studies cs ON csp.case_study_id = cs.id "
+            f"WHERE csp.technique_id IN ({_placeholders(ids)}) "
+            f"GROUP BY csp.technique_id, cs.id "
+            f"ORDER BY csp.technique_id, MIN(csp.id)",
+            ids,
+        ).fetchall():
+            details[r["technique_id"]]["case_studies"].append({
+                "id": r["id"],
+                "name": r["name"],
+                "incident_date": r["incident_date"],
+                "case_study_type": r["case_study_type"],
+                "target": r["target"],
+            })
+
+    return details
@@ -0,0 +1,191 @@
+"""Technique co-occurrence graph precomputed from case study procedures.
+
+Two techniques co-occur when both appear in the same case study. At
+"parent" granularity subtechniques are rolled up to their parent; at
+"subtechnique" granularity every technique is its own node. The counts come
+from a single incidence-matrix product: with B[case, technique] = 1 when the
+case study uses the technique, B.T @ B holds the number of shared case
+studies for every pair. They are stored in `technique_cooccurrence` once per
+ingestion, so serving the graph is a read plus optional pruning.
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("parent", "subtechnique")
+
+# Results derived from the graph (analytics, layout), keyed by name and
+# granularity, with the data version they were computed for
+_derived_cache: dict[tuple[str, str], tuple[str, object]] = {}
+_derived_lock = threading.Lock()
+
+
+def data_version(conn: sqlite3.Connection) -> str:
+    """Identify the ingested ATLAS data, for caching results derived from it."""
+    row = conn.execute("SELECT last_updated FROM atlas_metadata LIMIT 1").fetchone()
+    return row["last_updated"] if row else ""
+
+
+def cached_for_version(conn: sqlite3.Connection, name: str, granularity: str, compute: Callable):
+    """Return `compute(conn, granularity)`, recomputed only when the ingested data changes."""
+    version = data_version(conn)
+    with _derived_lock:
+        cached = _derived_cache.get((name, granularity))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = compute(conn, granularity)
+        _derived_cache[(name, granularity)] = (version, result)
+        return result
+
+
+def incidence_matrix(conn: sqlite3.Connection, granularity: str = "parent") -> tuple[list[str], np.ndarray]:
+    """Return the graph's node ids and the case study x node 0/1 incidence matrix.
+
+    Node ids are sorted; only case studies using at least one node get a row.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown graph granularity: {granularity}")
+    techniques = conn.execute("SELECT id, parent_technique_id, is_subtechnique FROM techniques").fetchall()
+    if granularity == "parent":
+        node_ids = sorted(r["id"] for r in techniques if not r["is_subtechnique"])
+        resolve = {r["id"]: r["parent_technique_id"] or r["id"] for r in techniques}
+    else:
+        node_ids = sorted(r["id"] for r in techniques)
+        resolve = {}
+
+    node_index = {technique_id: i for i, technique_id in enumerate(node_ids)}
+    case_index: dict[str, int] = {}
+    cells = set()
+    for r in conn.execute("SELECT DISTINCT case_study_id, technique_id FROM case_study_procedures").fetchall():
+        node = node_index.get(resolve.get(r["technique_id"], r["technique_id"]))
+        if node is not None:
+            cells.add((case_index.setdefault(r["case_study_id"], len(case_index)), node))
+
+    incidence = np.zeros((len(case_index), len(node_ids)), dtype=np.int32)
+    if cells:
+        rows, cols = np.array(sorted(cells)).T
+        incidence[rows, cols] = 1
+    return node_ids, incidence
+
+
+def rebuild_cooccurrence(conn: sqlite3.Connection) -> int:
+    """Recompute technique_cooccurrence from case_study_procedures.
+
+    Returns the number of parent-level technique pairs stored. The caller
+    commits.
+    """
+    conn.execute("DELETE FROM technique_cooccurrence")
+    counts = {}
+    for granularity in GRANULARITIES:
+        node_ids, incidence = incidence_matrix(conn, granularity)
+        cooccurrence = incidence.T @ incidence
+        # Upper triangle: each unordered pair once, with technique_a < technique_b
+        a, b = np.nonzero(np.triu(cooccurrence, k=1))
+        conn.executemany(
+            "INSERT INTO technique_cooccurrence (granularity, technique_a, technique_b, weight) VALUES (?, ?, ?, ?)",
+            [
+                (granularity, node_ids[i], node_ids[j], int(cooccurrence[i, j]))
+                for i, j in zip(a.tolist(), b.tolist())
+            ],
+        )
+        counts[granularity] = len(a)
+    logger.info("Technique co-occurrence rebuilt: %s pairs", counts)
+    return counts["parent"]
+
+
+def ensure_cooccurrence(conn: sqlite3.Connection) -> None:
+    """Build technique_cooccurrence for databases ingested before it existed."""
+    if conn.execute("SELECT 1 FROM technique_cooccurrence LIMIT 1").fetchone():
+        return
+    if not conn.execute("SELECT 1 FROM case_study_procedures LIMIT 1").fetchone():
+        return
+    rebuild_cooccurrence(conn)
+    conn.commit()
+
+
+def _top_k_edges(edges: list[dict], top_k: int) -> list[dict]:
+    """Keep edges ranking among the `top_k` heaviest of either endpoint.
+
+    `edges` must be sorted by weight descending.
+    """
+    kept = []
+    degree: dict[str, int] = {}
+    for edge in edges:
+        a, b = edge["source"], edge["target"]
+        if degree.get(a, 0) < top_k or degree.get(b, 0) < top_k:
+            kept.append(edge)
+        degree[a] = degree.get(a, 0) + 1
+        degree[b] = degree.get(b, 0) + 1
+    return kept
+
+
+def load_graph(
+    conn: sqlite3.Connection,
+    granularity: str = "parent",
+    min_weight: int = 1,
+    top_k: int | None = None,
+    tactic_ids: list[str] | None = None,
+) -> dict:
+    """Return {"nodes": [...], "edges": [...]} from the precomputed co-occurrence.
+
+    Nodes are parent techniques, or every technique at "subtechnique"
+    granularity, optionally limited to those in any of `tactic_ids`
+    (subtechniques without tactics of their own use their parent's). Edges
+    below `min_weight` or between filtered-out nodes are dropped, then
+    `top_k` keeps each node's heaviest edges. Edges are ordered by weight
+    descending.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown graph granularity: {granularity}")
+
+    rows = conn.execute(
+        "SELECT t.id, t.name, t.maturity, t.parent_technique_id, "
+        "  COALESCE(cs.case_study_count, 0) AS case_study_count "
+        "FROM techniques t "
+        "LEFT JOIN ("
+        "  SELECT technique_id, COUNT(DISTINCT case_study_id) AS case_study_count "
+        "  FROM case_study_procedures GROUP BY technique_id"
+        ") cs ON cs.technique_id = t.id "
+        "WHERE t.is_subtechnique = 0 OR ? = 'subtechnique' "
+        "ORDER BY t.id",
+        (granularity,),
+    ).fetchall()
+
+    tactics: dict[str, list[str]] = {}
+    for r in conn.execute("SELECT technique_id, tactic_id FROM technique_tactics ORDER BY technique_id, tactic_id").fetchall():
+        tactics.setdefault(r["technique_id"], []).append(r["tactic_id"])
+
+    wanted = set(tactic_ids or [])
+    nodes = []
+    for r in rows:
+        node_tactics = tactics.get(r["id"]) or tactics.get(r["parent_technique_id"], [])
+        if wanted and wanted.isdisjoint(node_tactics):
+            continue
+        nodes.append({
+            "id": r["id"],
+            "name": r["name"],
+            "tactic_ids": node_tactics,
+            "maturity": r["maturity"],
+            "case_study_count": r["case_study_count"],
+        })
+
+    node_ids = {n["id"] for n in nodes}
+    edges = [
+        {"source": r["technique_a"], "target": r["technique_b"], "weight": r["weight"]}
+        for r in conn.execute(
+            "SELECT technique_a, technique_b, weight FROM technique_cooccurrence "
+            "WHERE granularity = ? AND weight >= ? "
+            "ORDER BY weight DESC, technique_a, technique_b",
+            (granularity, min_weight),
+        ).fetchall()
+        if r["technique_a"] in node_ids and r["technique_b"] in node_ids
+    ]
+    if top_k is not None:
+        edges = _top_k_edges(edges, top_k)
+    return {"nodes": nodes, "edges": edges}
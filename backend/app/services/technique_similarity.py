@@ -0,0 +1,170 @@
+"""Technique similarity and precomputed "related techniques" index.
+
+Four signals are computed for every pair of techniques, each in [0, 1]:
+
+- text: cosine similarity of TF-IDF vectors (words and word pairs) over the
+  technique name and description
+- co-occurrence: Jaccard overlap of the case studies using each technique
+- mitigations: Jaccard overlap of the mitigations addressing each technique
+- tactics: Jaccard overlap of their tactics (subtechniques without tactics
+  of their own use their parent's)
+
+The combined score is their weighted sum (RELATED_WEIGHTS). The best
+RELATED_TOP_K neighbors of each technique are stored in `technique_related`
+once per ingestion, so serving them is a primary-key range read.
+"""
+
+import logging
+import math
+import sqlite3
+
+import numpy as np
+
+from .relevance import tokenize
+from .technique_graph import incidence_matrix
+
+logger = logging.getLogger(__name__)
+
+RELATED_TOP_K = 20
+RELATED_WEIGHTS = {"text": 0.4, "cooccurrence": 0.3, "mitigations": 0.2, "tactics": 0.1}
+
+
+def _terms(text: str) -> list[str]:
+    tokens = tokenize(text)
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _text_similarity(documents: list[str]) -> np.ndarray:
+    """Cosine similarity of smoothed TF-IDF vectors, with sublinear term frequency."""
+    docs = [_terms(d) for d in documents]
+    vocabulary: dict[str, int] = {}
+    cells: dict[tuple[int, int], int] = {}
+    for row, terms in enumerate(docs):
+        for term in terms:
+            key = (row, vocabulary.setdefault(term, len(vocabulary)))
+            cells[key] = cells.get(key, 0) + 1
+
+    tfidf = np.zeros((len(docs), len(vocabulary)))
+    if cells:
+        rows, cols = np.array(list(cells)).T
+        tfidf[rows, cols] = 1 + np.log(np.fromiter(cells.values(), dtype=float, count=len(cells)))
+    df = np.count_nonzero(tfidf, axis=0)
+    tfidf *= np.log((1 + len(docs)) / (1 + df)) + 1
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf /= np.where(norms > 0, norms, 1)
+    return tfidf @ tfidf.T
+
+
+def _jaccard(membership: np.ndarray) -> np.ndarray:
+    """Pairwise Jaccard similarity of the rows of a 0/1 membership matrix."""
+    membership = membership.astype(float)
+    shared = membership @ membership.T
+    sizes = membership.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - shared
+    return np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+
+def _membership(node_ids: list[str], pairs: list[tuple[str, str]]) -> np.ndarray:
+    """0/1 matrix of techniques x groups from (technique id, group id) pairs."""
+    index = {technique_id: i for i, technique_id in enumerate(node_ids)}
+    groups: dict[str, int] = {}
+    cells = {(index[t], groups.setdefault(g, len(groups))) for t, g in pairs if t in index}
+    matrix = np.zeros((len(node_ids), len(groups)))
+    if cells:
+        rows, cols = np.array(sorted(cells)).T
+        matrix[rows, cols] = 1
+    return matrix
+
+
+def similarity_matrices(conn: sqlite3.Connection) -> tuple[list[str], dict[str, np.ndarray]]:
+    """Return technique ids and the technique x technique matrix of each signal."""
+    node_ids, incidence = incidence_matrix(conn, "subtechnique")
+    techniques = {
+        r["id"]: r for r in conn.execute(
+            "SELECT id, name, description, parent_technique_id FROM techniques"
+        ).fetchall()
+    }
+
+    tactics: dict[str, list[str]] = {}
+    for r in conn.execute("SELECT technique_id, tactic_id FROM technique_tactics").fetchall():
+        tactics.setdefault(r["technique_id"], []).append(r["tactic_id"])
+    tactic_pairs = [
+        (t, tactic)
+        for t in node_ids
+        for tactic in tactics.get(t) or tactics.get(techniques[t]["parent_technique_id"], [])
+    ]
+    mitigation_pairs = [
+        (r["technique_id"], r["mitigation_id"])
+        for r in conn.execute("SELECT mitigation_id, technique_id FROM mitigation_techniques").fetchall()
+    ]
+
+    return node_ids, {
+        "text": _text_similarity(
+            [f"{techniques[t]['name']} {techniques[t]['description'] or ''}" for t in node_ids]
+        ),
+        "cooccurrence": _jaccard(incidence.T),
+        "mitigations": _jaccard(_membership(node_ids, mitigation_pairs)),
+        "tactics": _jaccard(_membership(node_ids, tactic_pairs)),
+    }
+
+
+def rebuild_related(conn: sqlite3.Connection, top_k: int = RELATED_TOP_K) -> int:
+    """Recompute the top-k related techniques of every technique.
+
+    Returns the number of rows stored. The caller commits.
+    """
+    node_ids, signals = similarity_matrices(conn)
+    conn.execute("DELETE FROM technique_related")
+    if len(node_ids) < 2:
+        return 0
+
+    score = sum(RELATED_WEIGHTS[name] * matrix for name, matrix in signals.items())
+    np.fill_diagonal(score, -math.inf)
+    k = min(top_k, len(node_ids) - 1)
+    # argpartition picks each row's k best in linear time; only those are sorted
+    best = np.argpartition(-score, k - 1, axis=1)[:, :k]
+    rows = []
+    for i, candidates in enumerate(best):
+        candidates = candidates[np.lexsort((candidates, -score[i, candidates]))]
+        rank = 0
+        for j in candidates.tolist():
+            if score[i, j] <= 0:
+                break
+            rank += 1
+            rows.append((
+                node_ids[i],
+                rank,
+                node_ids[j],
+                round(float(score[i, j]), 4),
+                *(round(float(signals[name][i, j]), 4) for name in RELATED_WEIGHTS),
+            ))
+    conn.executemany(
+        "INSERT INTO technique_related (technique_id, rank, related_id, score, "
+        "text_score, cooccurrence_score, mitigation_score, tactic_score) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    logger.info("Related techniques rebuilt: %d rows for %d techniques", len(rows), len(node_ids))
+    return len(rows)
+
+
+def ensure_related(conn: sqlite3.Connection) -> None:
+    """Build technique_related for databases ingested before it existed."""
+    if conn.execute("SELECT 1 FROM technique_related LIMIT 1").fetchone():
+        return
+    if conn.execute("SELECT COUNT(*) AS c FROM techniques").fetchone()["c"] < 2:
+        return
+    rebuild_related(conn)
+    conn.commit()
+
+
+def load_related(conn: sqlite3.Connection, technique_id: str, limit: int = 10) -> list[dict]:
+    """Return the stored related techniques of `technique_id`, best first."""
+    rows = conn.execute(
+        "SELECT r.related_id AS id, t.name, t.is_subtechnique, t.maturity, r.score, "
+        "  r.text_score, r.cooccurrence_score, r.mitigation_score, r.tactic_score "
+        "FROM technique_related r JOIN techniques t ON t.id = r.related_id "
+        "WHERE r.technique_id = ? ORDER BY r.rank LIMIT ?",
+        (technique_id, limit),
+    ).fetchall()
+    return [{**dict(r), "is_subtechnique": bool(r["is_subtechnique"])} for r in rows]
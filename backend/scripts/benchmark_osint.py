@@ -0,0 +1,223 @@
+"""Record OSINT API responses, or benchmark bulk enrichment against recordings.
+
+`run` copies the database, points every OSINT client at a ReplayTransport
+serving the recordings and drives a prefetch run over the first N
+techniques. It reports throughput, per-search tail latency and whether any
+request was rejected by the simulated server rate limits. `--speedup`
+shrinks the client rate limiters and the server windows by the same factor
+so a run that would take an hour completes in a minute without changing
+the compliance picture.
+
+Usage:
+    python3 -m scripts.benchmark_osint run [--techniques 30] [--speedup 60] [--error-rate 0.05]
+    python3 -m scripts.benchmark_osint record --techniques 5 --out scripts/recordings/live.json
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# Ensure the backend package is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import DB_PATH
+from app.database import init_db
+from app.services import circuit_breaker, osint_prefetch
+from app.services.osint_replay import RecordingTransport, ReplayTransport, load_recordings
+from app.services.rate_limit import LIMITERS
+from app.services.search_terms import load_keywords, seed_search_terms
+
+DEFAULT_RECORDINGS = Path(__file__).resolve().parent / "recordings"
+
+
+def _copy_db(path: str) -> sqlite3.Connection:
+    """Copy the ATLAS database to `path` with the OSINT cache emptied."""
+    src = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    src.backup(conn)
+    src.close()
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys=ON")
+    init_db(conn)
+    for table in (
+        "osint_prefetch_checkpoints",
+        "osint_prefetch_runs",
+        "technique_artifacts",
+        "osint_artifacts",
+        "osint_fetch_status",
+    ):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    seed_search_terms(conn)
+    return conn
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def _timed(fn, durations: list[float]):
+    """Wrap a search function to record how long each call takes."""
+    async def wrapper(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            durations.append(time.monotonic() - started)
+    return wrapper
+
+
+def run_benchmark(
+    recordings: Path,
+    techniques: int,
+    sources: list[str] | None,
+    speedup: float,
+    latency_scale: float,
+    error_rate: float,
+) -> dict:
+    transport = ReplayTransport(
+        load_recordings(recordings),
+        latency_scale=latency_scale / speedup,
+        time_scale=speedup,
+        error_rate=error_rate,
+    )
+    circuit_breaker.transport = transport
+    for limiter in LIMITERS.values():
+        limiter.period /= speedup
+    for breaker in circuit_breaker.BREAKERS.values():
+        breaker.reset_timeout /= speedup
+    circuit_breaker.RETRY_BASE_SECONDS /= speedup
+    circuit_breaker.RETRY_MAX_SECONDS /= speedup
+
+    durations: dict[str, list[float]] = {}
+    for source, search in osint_prefetch.SOURCE_SEARCHES.items():
+        osint_prefetch.SOURCE_SEARCHES[source] = _timed(search, durations.setdefault(source, []))
+    for source, (search_batch, size) in osint_prefetch.BATCH_SEARCHES.items():
+        osint_prefetch.BATCH_SEARCHES[source] = (_timed(search_batch, durations[source]), size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _copy_db(str(Path(tmp) / "atlas.db"))
+        run_id, _ = osint_prefetch.start_run(conn, sources)
+        # Limit the run to the first N techniques
+        conn.execute(
+            "DELETE FROM osint_prefetch_checkpoints WHERE run_id = ? AND technique_id NOT IN "
+            "(SELECT id FROM techniques ORDER BY id LIMIT ?)",
+            (run_id, techniques),
+        )
+        conn.commit()
+
+        started = time.monotonic()
+        status = asyncio.run(osint_prefetch.run_prefetch(conn, run_id))
+        elapsed = time.monotonic() - started
+        conn.close()
+
+    by_source: dict[str, dict] = {}
+    for source in {entry[0] for entry in transport.log}:
+        entries = [e for e in transport.log if e[0] == source]
+        by_source[source] = {
+            "requests": len(entries),
+            "statuses": dict(Counter(e[1] for e in entries)),
+            "rate_limited": sum(1 for e in entries if e[3]),
+        }
+    for source, values in durations.items():
+        if values:
+            # Report in real-world seconds, undoing the speedup
+            real = [v * speedup for v in values]
+            by_source.setdefault(source, {}).update({
+                "searches": len(real),
+                "p50_s": round(statistics.median(real), 2),
+                "p95_s": round(_percentile(real, 95), 2),
+                "p99_s": round(_percentile(real, 99), 2),
+                "max_s": round(max(real), 2),
+            })
+
+    return {
+        "checkpoints": status["total"],
+        "done": status["done"],
+        "failed": status["failed"],
+        "elapsed_s": round(elapsed, 2),
+        "real_time_equivalent_s": round(elapsed * speedup, 1),
+        "checkpoints_per_real_minute": round(status["total"] / (elapsed * speedup) * 60, 2) if elapsed else None,
+        "sources": by_source,
+        "rate_limit_violations": sum(1 for e in transport.log if e[3]),
+        "breakers": circuit_breaker.breaker_status(),
+    }
+
+
+def record(out: Path, techniques: int, sources: list[str] | None) -> int:
+    """Run live searches for the first N techniques and save the exchanges."""
+    transport = RecordingTransport()
+    circuit_breaker.transport = transport
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _copy_db(str(Path(tmp) / "atlas.db"))
+        rows = conn.execute("SELECT id, name FROM techniques ORDER BY id LIMIT ?", (techniques,)).fetchall()
+
+        async def _record_all():
+            for source in sources or list(osint_prefetch.SOURCE_SEARCHES):
+                search = osint_prefetch.SOURCE_SEARCHES[source]
+                keywords = load_keywords(conn, [(row["id"], row["name"]) for row in rows], source)
+                for row in rows:
+                    await search(conn, row["id"], row["name"], keywords[row["id"]])
+
+        asyncio.run(_record_all())
+        conn.close()
+
+    transport.save(out)
+    return len(transport.exchanges)
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"\n{report['done']}/{report['checkpoints']} checkpoints done, {report['failed']} failed "
+        f"in {report['elapsed_s']}s ({report['real_time_equivalent_s']}s at real rate limits, "
+        f"{report['checkpoints_per_real_minute']} checkpoints/min)"
+    )
+    print(f"{'source':8} {'reqs':>5} {'searches':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  statuses")
+    for source, s in sorted(report["sources"].items()):
+        print(
+            f"{source:8} {s.get('requests', 0):5d} {s.get('searches', 0):8d} "
+            f"{s.get('p50_s', 0):6.2f}s {s.get('p95_s', 0):6.2f}s {s.get('p99_s', 0):6.2f}s {s.get('max_s', 0):6.2f}s  "
+            f"{s.get('statuses', {})}"
+        )
+    violations = report["rate_limit_violations"]
+    print(f"\nRate-limit compliance: {'OK' if not violations else f'{violations} requests rejected'}")
+    for source, b in report["breakers"].items():
+        if b["state"] != "closed":
+            print(f"  {source} circuit {b['state']} ({b['last_error']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = sub.add_parser("run", help="Benchmark a prefetch run against recorded responses")
+    run_cmd.add_argument("--recordings", type=Path, default=DEFAULT_RECORDINGS, help="Recording file or directory")
+    run_cmd.add_argument("--techniques", type=int, default=30, help="Number of techniques to enrich")
+    run_cmd.add_argument("--sources", nargs="+", choices=list(osint_prefetch.SOURCE_SEARCHES))
+    run_cmd.add_argument("--speedup", type=float, default=60.0, help="Time compression for rate limits and latency")
+    run_cmd.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for recorded latencies")
+    run_cmd.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 5xx")
+
+    record_cmd = sub.add_parser("record", help="Record live API responses for later replay")
+    record_cmd.add_argument("--out", type=Path, required=True)
+    record_cmd.add_argument("--techniques", type=int, default=5)
+    record_cmd.add_argument("--sources", nargs="+", choices=list(osint_prefetch.SOURCE_SEARCHES))
+
+    args = parser.parse_args()
+    if args.command == "run":
+        _print_report(run_benchmark(
+            args.recordings, args.techniques, args.sources, args.speedup, args.latency_scale, args.error_rate,
+        ))
+    else:
+        count = record(args.out, args.techniques, args.sources)
+        print(f"Recorded {count} exchanges to {args.out}")
@@ -0,0 +1,71 @@
+"""Manage the local NVD CVE mirror used for technique-to-CVE lookup.
+
+Usage:
+    python3 -m scripts.nvd_mirror import nvdcve-2.0-2024.json.gz [...]
+    python3 -m scripts.nvd_mirror update [--since 2024-01-01]
+    python3 -m scripts.nvd_mirror status
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure the backend package is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import get_db
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.nvd_mirror import import_feed_file, mirror_status, update_mirror
+
+
+def _print_status(conn) -> None:
+    status = mirror_status(conn)
+    print(
+        f"Mirror holds {status['cve_count']} CVEs "
+        f"(modified through {status['last_modified_end'] or 'n/a'}, "
+        f"last updated {status['updated_at'] or 'never'})."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = sub.add_parser("import", help="Import NVD JSON feed files from disk")
+    import_cmd.add_argument("files", nargs="+", type=Path)
+
+    update_cmd = sub.add_parser("update", help="Fetch CVEs modified since the last update")
+    update_cmd.add_argument("--since", help="ISO date to start from (default: mirror high-water mark)")
+
+    sub.add_parser("status", help="Show mirror size and freshness")
+
+    args = parser.parse_args()
+    conn = get_db()
+
+    if args.command == "import":
+        total = 0
+        for path in args.files:
+            count = import_feed_file(conn, path)
+            total += count
+            print(f"  {path.name}: {count} CVEs")
+        print(f"\nImported {total} CVEs from {len(args.files)} file(s).")
+    elif args.command == "update":
+        since = None
+        if args.since:
+            since = datetime.fromisoformat(args.since)
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+        try:
+            result = asyncio.run(update_mirror(conn, since))
+        except (ValueError, CircuitOpenError) as exc:
+            print(f"Update failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Updated {result['updated']} CVEs in {result['requests']} requests.")
+
+    _print_status(conn)
+
+
+if __name__ == "__main__":
+    main()
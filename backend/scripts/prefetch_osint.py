@@ -0,0 +1,69 @@
+"""Prefetch OSINT results for every technique, resuming interrupted runs.
+
+Usage:
+    python3 -m scripts.prefetch_osint [--sources github arxiv nvd] [--restart]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure the backend package is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import get_db
+from app.services.osint_prefetch import SOURCE_SEARCHES, get_prefetch_status, run_prefetch, start_run
+
+
+def _format_eta(seconds: int | None) -> str:
+    if seconds is None:
+        return "--"
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+def _print_progress(status: dict) -> None:
+    finished = status["done"] + status["failed"]
+    print(
+        f"  [{finished:4d}/{status['total']}] "
+        f"{status['failed']} failed, "
+        f"{status['throughput_per_minute']:.1f}/min, "
+        f"ETA {_format_eta(status['eta_seconds'])}"
+    )
+
+
+def prefetch_osint(sources: list[str] | None = None, restart: bool = False) -> dict:
+    """Run (or resume) a prefetch over all techniques and return the final status."""
+    conn = get_db()
+
+    run_id, added_sources = start_run(conn, sources, restart=restart)
+    status = get_prefetch_status(conn, run_id)
+    print(
+        f"Prefetch run #{run_id} ({', '.join(status['sources'])}): "
+        f"{status['pending']} of {status['total']} checkpoints pending."
+    )
+    if added_sources:
+        print(f"Added {', '.join(added_sources)} to the unfinished run.")
+
+    status = asyncio.run(run_prefetch(conn, run_id, on_progress=_print_progress))
+
+    print(
+        f"\nPrefetch complete: {status['done']} done, {status['failed']} failed "
+        f"({status['throughput_per_minute']:.1f} checkpoints/min)."
+    )
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", nargs="+", choices=list(SOURCE_SEARCHES), help="Sources to prefetch (default: all)")
+    parser.add_argument("--restart", action="store_true", help="Abandon any unfinished run and start over")
+    args = parser.parse_args()
+
+    try:
+        prefetch_osint(args.sources, restart=args.restart)
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun to resume from the last checkpoint.")
+        sys.exit(130)
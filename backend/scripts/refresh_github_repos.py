@@ -0,0 +1,37 @@
+"""Refresh stars, language and description of stored GitHub repos.
+
+Uses one GraphQL query per 100 repos when GITHUB_TOKEN is set, otherwise
+conditional REST requests with stored ETags (304s are not rate limited).
+
+Usage:
+    python3 -m scripts.refresh_github_repos [--mode graphql|etag] [--limit 500]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure the backend package is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import get_db
+from app.services.github_refresh import refresh_github_repos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["graphql", "etag"], help="Default: graphql with a token, else etag")
+    parser.add_argument("--limit", type=int, help="Refresh at most this many repos")
+    args = parser.parse_args()
+
+    try:
+        stats = asyncio.run(refresh_github_repos(get_db(), args.mode, args.limit))
+    except ValueError as exc:
+        print(f"Refresh failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"Refreshed {stats['repos']} repos ({stats['mode']}) in {stats['requests']} requests: "
+        f"{stats['updated']} updated, {stats['not_modified']} not modified, {stats['missing']} missing."
+    )
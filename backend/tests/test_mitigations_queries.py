@@ -0,0 +1,82 @@
+"""GET /api/mitigations loads a page's relations with a fixed number of statements."""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import init_db
+from app.main import app
+from app.routers import matrix
+
+TECHNIQUES = 5
+
+
+def _seed(conn: sqlite3.Connection, mitigations: int) -> None:
+    conn.executemany(
+        "INSERT INTO techniques (id, name, description) VALUES (?, ?, '')",
+        [(f"AML.T{i:04d}", f"Technique {i}") for i in range(TECHNIQUES)],
+    )
+    for i in range(mitigations):
+        mitigation_id = f"AML.M{i:04d}"
+        conn.execute(
+            "INSERT INTO mitigations (id, name, description, category) VALUES (?, ?, '', 'Policy')",
+            (mitigation_id, f"Mitigation {i}"),
+        )
+        conn.executemany(
+            "INSERT INTO mitigation_lifecycle (mitigation_id, lifecycle_stage) VALUES (?, ?)",
+            [(mitigation_id, "Deployment"), (mitigation_id, "ML Model Evaluation")],
+        )
+        conn.executemany(
+            "INSERT INTO mitigation_techniques (mitigation_id, technique_id, usage) VALUES (?, ?, 'usage')",
+            [(mitigation_id, f"AML.T{j % TECHNIQUES:04d}") for j in (i, i + 1)],
+        )
+    conn.commit()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Return a function seeding a fresh database with N mitigations and serving it to the router."""
+
+    def make(mitigations: int) -> sqlite3.Connection:
+        conn = sqlite3.connect(tmp_path / f"atlas-{mitigations}.db", check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        init_db(conn)
+        _seed(conn, mitigations)
+        monkeypatch.setattr(matrix, "get_db", lambda: conn)
+        return conn
+
+    return make
+
+
+def _count_statements(conn: sqlite3.Connection, params: dict) -> tuple[list, int]:
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        response = TestClient(app).get("/api/mitigations", params=params)
+    finally:
+        conn.set_trace_callback(None)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"category": "Policy"}, {"fields": "name,techniques"}, {"fields": "name"}, {"limit": 500}],
+)
+def test_statement_count_does_not_grow_with_mitigations(database, params):
+    items, small = _count_statements(database(10), params)
+    assert len(items) == 10
+    items, large = _count_statements(database(20), params)
+    assert len(items) == 20
+    assert small == large
+
+
+def test_relations_are_attached_to_their_mitigation(database):
+    items, _ = _count_statements(database(3), {})
+    assert [m["lifecycle_stages"] for m in items] == [["Deployment", "ML Model Evaluation"]] * 3
+    assert [[t["id"] for t in m["techniques"]] for m in items] == [
+        ["AML.T0000", "AML.T0001"],
+        ["AML.T0001", "AML.T0002"],
+        ["AML.T0002", "AML.T0003"],
+    ]
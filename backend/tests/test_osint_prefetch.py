@@ -0,0 +1,40 @@
+"""Prefetch runs: source validation and one run in progress per process."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import init_db
+from app.services import osint_prefetch
+from app.services.osint_prefetch import claim_run, is_prefetch_running, start_run
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "atlas.db", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    init_db(conn)
+    conn.execute("INSERT INTO techniques (id, name, description) VALUES ('AML.T0000', 'Technique', '')")
+    conn.commit()
+    return conn
+
+
+def test_unknown_sources_are_rejected(conn):
+    with pytest.raises(ValueError, match="Unknown sources: foo"):
+        start_run(conn, ["github", "foo"])
+    assert conn.execute("SELECT COUNT(*) FROM osint_prefetch_runs").fetchone()[0] == 0
+
+
+def test_concurrent_claims_start_one_run(conn, monkeypatch):
+    monkeypatch.setattr(osint_prefetch, "_active_runs", set())
+
+    async def claim_twice():
+        return await asyncio.gather(claim_run(conn, ["github"]), claim_run(conn, ["github"]), return_exceptions=True)
+
+    first, second = asyncio.run(claim_twice())
+
+    run_id, _ = first
+    assert isinstance(second, RuntimeError)
+    assert osint_prefetch._active_runs == {run_id}
+    assert is_prefetch_running()
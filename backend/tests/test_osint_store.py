@@ -0,0 +1,46 @@
+"""Stored OSINT fetches: successful empty fetches replace stale links."""
+
+import sqlite3
+
+import pytest
+
+from app.database import init_db
+from app.services.osint_store import load_fresh_artifacts, store_fetches
+
+TECHNIQUE = "AML.T0000"
+REPOS = [
+    {"canonical_id": "owner/repo-a", "title": "owner/repo-a", "url": "https://github.com/owner/repo-a", "stars": 10},
+    {"canonical_id": "owner/repo-b", "title": "owner/repo-b", "url": "https://github.com/owner/repo-b", "stars": 5},
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "atlas.db")
+    conn.row_factory = sqlite3.Row
+    init_db(conn)
+    conn.execute("INSERT INTO techniques (id, name, description) VALUES (?, 'Technique', '')", (TECHNIQUE,))
+    conn.commit()
+    return conn
+
+
+def test_successful_empty_fetch_unlinks_stored_results(conn):
+    store_fetches(conn, "github", [(TECHNIQUE, REPOS, None)], 6)
+    assert len(load_fresh_artifacts(conn, TECHNIQUE, "github")) == 2
+
+    store_fetches(conn, "github", [(TECHNIQUE, [], None)], 6)
+
+    assert load_fresh_artifacts(conn, TECHNIQUE, "github") == []
+    assert conn.execute("SELECT COUNT(*) FROM osint_artifacts").fetchone()[0] == 0
+    # First-seen/last-seen history outlives the links
+    assert conn.execute("SELECT COUNT(*) FROM osint_history").fetchone()[0] == 2
+
+
+def test_failed_fetch_keeps_stored_results(conn):
+    store_fetches(conn, "github", [(TECHNIQUE, REPOS, None)], 6)
+
+    store_fetches(conn, "github", [(TECHNIQUE, [], "HTTP 503")], 6)
+
+    assert conn.execute(
+        "SELECT COUNT(*) FROM technique_artifacts WHERE technique_id = ?", (TECHNIQUE,)
+    ).fetchone()[0] == 2
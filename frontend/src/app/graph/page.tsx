@@ -27,6 +27,10 @@ const TACTIC_LABELS: Record<string, string> = {
   "AML.TA0011": "Impact",
 };
 
+// Heaviest edges kept per node, so the force layout stays readable and the
+// payload bounded as the corpus grows
+const GRAPH_TOP_K = 8;
+
 // D3 simulation node extends GraphNode with x, y, etc.
 interface SimNode extends d3.SimulationNodeDatum {
   id: string;
@@ -50,11 +54,12 @@ export default function GraphPage() {
   const [graph, setGraph] = useState<TechniqueGraph | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [granularity, setGranularity] = useState<"parent" | "subtechnique">("parent");
 
   // Fetch data
   useEffect(() => {
     api
-      .getTechniqueGraph()
+      .getTechniqueGraph({ granularity, top_k: GRAPH_TOP_K })
       .then((data) => {
         setGraph(data);
         setLoading(false);
@@ -63,7 +68,7 @@ export default function GraphPage() {
         setError(err.message);
         setLoading(false);
       });
-  }, []);
+  }, [granularity]);
 
   // D3 rendering
   const renderGraph = useCallback(() => {
@@ -89,8 +94,15 @@ export default function GraphPage() {
       });
     svg.call(zoom);
 
-    // Prepare simulation data
-    const nodes: SimNode[] = graph.nodes.map((n) => ({ ...n }));
+    // Prepare simulation data, placing nodes at the server-computed layout
+    // when every node has one
+    const precomputed = graph.nodes.every((n) => n.x != null && n.y != null);
+    const pad = 40;
+    const nodes: SimNode[] = graph.nodes.map(({ x, y, ...n }) => ({
+      ...n,
+      x: precomputed ? pad + x! * (width - 2 * pad) : undefined,
+      y: precomputed ? pad + y! * (height - 2 * pad) : undefined,
+    }));
     const nodeMap = new Map<string, SimNode>();
     nodes.forEach((n) => nodeMap.set(n.id, n));
 
@@ -256,7 +268,7 @@ export default function GraphPage() {
     nodeElements.call(drag);
 
     // Tick function
-    simulation.on("tick", () => {
+    const ticked = () => {
       linkElements
         .attr("x1", (d) => (d.source as SimNode).x ?? 0)
         .attr("y1", (d) => (d.source as SimNode).y ?? 0)
@@ -266,7 +278,14 @@ export default function GraphPage() {
       nodeElements
         .attr("cx", (d) => d.x ?? 0)
         .attr("cy", (d) => d.y ?? 0);
-    });
+    };
+    simulation.on("tick", ticked);
+
+    // With a precomputed layout, render it as is; dragging restarts the simulation
+    if (precomputed) {
+      simulation.stop();
+      ticked();
+    }
 
     // Cleanup
     return () => {
@@ -318,11 +337,28 @@ export default function GraphPage() {
             case study count. Edge thickness = co-occurrence weight.
           </p>
         </div>
-        {graph && (
-          <div className="text-sm text-gray-500">
-            {graph.nodes.length} techniques &middot; {graph.edges.length} connections
+        <div className="flex items-center gap-4">
+          <div className="flex rounded-lg border border-gray-800 overflow-hidden text-xs">
+            {(["parent", "subtechnique"] as const).map((g) => (
+              <button
+                key={g}
+                onClick={() => setGranularity(g)}
+                className={`px-3 py-1.5 transition-colors ${
+                  granularity === g
+                    ? "bg-gray-800 text-gray-100"
+                    : "text-gray-400 hover:text-gray-200"
+                }`}
+              >
+                {g === "parent" ? "Techniques" : "With subtechniques"}
+              </button>
+            ))}
           </div>
-        )}
+          {graph && (
+            <div className="text-sm text-gray-500">
+              {graph.nodes.length} techniques &middot; {graph.edges.length} connections
+            </div>
+          )}
+        </div>
       </div>
 
       <div
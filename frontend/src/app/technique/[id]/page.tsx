@@ -33,6 +33,9 @@ export default async function TechniqueDetailPage({
     );
   }
 
+  // Related techniques are optional; the page renders without them
+  const related = await api.getRelatedTechniques(id, 6).catch(() => []);
+
   const maturityColor = technique.maturity
     ? MATURITY_COLORS[technique.maturity] || "#6b7280"
     : null;
@@ -171,6 +174,35 @@ export default async function TechniqueDetailPage({
         <TechniqueDetailTabs technique={technique} />
       </section>
 
+      {/* Related techniques */}
+      {related.length > 0 && (
+        <section className="mb-8">
+          <h2 className="text-lg font-semibold text-gray-200 mb-3">
+            Related Techniques
+          </h2>
+          <div className="grid grid-cols-1 sm:grid-cols-2 gap-2">
+            {related.map((r) => (
+              <a
+                key={r.id}
+                href={`/technique/${r.id}`}
+                className="flex items-center justify-between gap-3 bg-gray-900 border border-gray-800 hover:border-gray-700 rounded-lg px-4 py-2 transition-colors"
+              >
+                <div className="min-w-0">
+                  <div className="text-sm text-gray-200 truncate">{r.name}</div>
+                  <div className="text-xs font-mono text-gray-500">{r.id}</div>
+                </div>
+                <span
+                  className="text-xs text-gray-400 flex-shrink-0"
+                  title={`text ${r.text_score} · co-occurrence ${r.cooccurrence_score} · mitigations ${r.mitigation_score} · tactics ${r.tactic_score}`}
+                >
+                  {Math.round(r.score * 100)}%
+                </span>
+              </a>
+            ))}
+          </div>
+        </section>
+      )}
+
       {/* Metadata footer */}
       <div className="border-t border-gray-800 pt-4 mt-8 text-xs text-gray-600 flex gap-6">
         {technique.created_date && (
@@ -1,8 +1,10 @@
 "use client";
 
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { api } from "@/lib/api";
-import type { OsintResponse, GitHubRepo, OsintResult } from "@/lib/types";
+import type { OsintResponse, OsintSourceKey, GitHubRepo, OsintResult } from "@/lib/types";
+
+const ALL_SOURCES: OsintSourceKey[] = ["github_repos", "arxiv_papers", "nvd_cves"];
 
 interface Props {
   techniqueId: string;
@@ -10,33 +12,62 @@ interface Props {
 
 export default function OsintPanel({ techniqueId }: Props) {
   const [data, setData] = useState<OsintResponse | null>(null);
+  const [pending, setPending] = useState<OsintSourceKey[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const closeStream = useRef<(() => void) | null>(null);
 
-  const fetchData = useCallback(async () => {
-    try {
-      setLoading(true);
-      setError(null);
-      const result = await api.getOsint(techniqueId);
-      setData(result);
-    } catch (e) {
-      setError(e instanceof Error ? e.message : "Failed to fetch OSINT data");
-    } finally {
-      setLoading(false);
-    }
+  // Stream results so each source renders as soon as it completes instead
+  // of waiting for the slowest one.
+  const fetchData = useCallback(() => {
+    closeStream.current?.();
+    setLoading(true);
+    setError(null);
+    setData({
+      technique_id: techniqueId,
+      github_repos: [],
+      arxiv_papers: [],
+      nvd_cves: [],
+      cached: false,
+      last_fetched: null,
+    });
+    setPending(ALL_SOURCES);
+
+    closeStream.current = api.streamOsint(techniqueId, {
+      onSource: (event) => {
+        setData((prev) => (prev ? { ...prev, [event.key]: event.results } : prev));
+        setPending((prev) => prev.filter((key) => key !== event.key));
+        setLoading(false);
+      },
+      onSummary: (summary) => {
+        setData((prev) =>
+          prev ? { ...prev, cached: summary.cached, last_fetched: summary.last_fetched } : prev
+        );
+        setPending([]);
+        setLoading(false);
+      },
+      onError: () => {
+        setError("Failed to fetch OSINT data");
+        setPending([]);
+        setLoading(false);
+      },
+    });
   }, [techniqueId]);
 
   useEffect(() => {
     fetchData();
+    return () => closeStream.current?.();
   }, [fetchData]);
 
   const handleRefresh = async () => {
     try {
       setRefreshing(true);
       setError(null);
+      closeStream.current?.();
       const result = await api.refreshOsint(techniqueId);
       setData(result);
+      setPending([]);
     } catch (e) {
       setError(e instanceof Error ? e.message : "Refresh failed");
     } finally {
@@ -119,13 +150,34 @@ export default function OsintPanel({ techniqueId }: Props) {
       </div>
 
       {/* GitHub Repos */}
-      <GitHubSection repos={data.github_repos} />
+      {pending.includes("github_repos") ? (
+        <PendingSection label="GitHub" />
+      ) : (
+        <GitHubSection repos={data.github_repos} />
+      )}
 
       {/* arXiv Papers */}
-      <ArxivSection papers={data.arxiv_papers} />
+      {pending.includes("arxiv_papers") ? (
+        <PendingSection label="arXiv" />
+      ) : (
+        <ArxivSection papers={data.arxiv_papers} />
+      )}
 
       {/* NVD CVEs */}
-      <NvdSection cves={data.nvd_cves} />
+      {pending.includes("nvd_cves") ? (
+        <PendingSection label="NVD" />
+      ) : (
+        <NvdSection cves={data.nvd_cves} />
+      )}
+    </div>
+  );
+}
+
+function PendingSection({ label }: { label: string }) {
+  return (
+    <div className="flex items-center gap-2 text-sm text-gray-500">
+      <div className="w-3.5 h-3.5 border-2 border-indigo-500 border-t-transparent rounded-full animate-spin" />
+      Searching {label}...
     </div>
   );
 }
@@ -265,8 +317,8 @@ function NvdSection({ cves }: { cves: OsintResult[] }) {
                     </p>
                   )}
                 </div>
-                {cve.relevance_score != null && (
-                  <CvssBadge score={cve.relevance_score} />
+                {cve.cvss_score != null && (
+                  <CvssBadge cvss={cve.cvss_score} />
                 )}
               </div>
             </a>
@@ -279,9 +331,10 @@ function NvdSection({ cves }: { cves: OsintResult[] }) {
 
 function RelevanceBadge({ score }: { score: number }) {
   const color =
-    score >= 0.8
+    // Normalized BM25 score; a close title/abstract match lands around 0.3-0.5
+    score >= 0.4
       ? "text-emerald-400 bg-emerald-500/10"
-      : score >= 0.5
+      : score >= 0.2
         ? "text-amber-400 bg-amber-500/10"
         : "text-gray-400 bg-gray-800";
   return (
@@ -291,9 +344,7 @@ function RelevanceBadge({ score }: { score: number }) {
   );
 }
 
-function CvssBadge({ score }: { score: number }) {
-  // Score is normalized 0-1 (from CVSS 0-10)
-  const cvss = score * 10;
+function CvssBadge({ cvss }: { cvss: number }) {
   const color =
     cvss >= 7
       ? "text-red-400 bg-red-500/10"
@@ -2,16 +2,20 @@ import type {
   MatrixResponse,
   TacticSummary,
   TacticDetail,
-  TechniqueSummary,
+  TechniqueListItem,
   TechniqueDetail,
+  RelatedTechnique,
   CaseStudySummary,
   CaseStudyDetail,
   SyncStatus,
   OsintResponse,
+  OsintSourceEvent,
+  OsintStreamSummary,
   KillchainSummary,
   KillchainDetail,
   SearchResponse,
   TechniqueGraph,
+  TechniqueGraphAnalytics,
   ExecutiveReport,
   ExerciseSummary,
   ExerciseDetail,
@@ -34,14 +38,23 @@ export const api = {
   getMatrix: () => fetchApi<MatrixResponse>("/api/matrix"),
   getTactics: () => fetchApi<TacticSummary[]>("/api/tactics"),
   getTactic: (id: string) => fetchApi<TacticDetail>(`/api/tactics/${id}`),
-  getTechniques: (params?: { tactic_id?: string; maturity?: string }) => {
+  getTechniques: (params?: {
+    tactic_id?: string;
+    maturity?: string;
+    ids?: string[];
+    expand?: ("tactics" | "subtechniques" | "mitigations" | "case_studies")[];
+  }) => {
     const searchParams = new URLSearchParams();
     if (params?.tactic_id) searchParams.set("tactic_id", params.tactic_id);
     if (params?.maturity) searchParams.set("maturity", params.maturity);
+    if (params?.ids) searchParams.set("ids", params.ids.join(","));
+    if (params?.expand?.length) searchParams.set("expand", params.expand.join(","));
     const qs = searchParams.toString();
-    return fetchApi<TechniqueSummary[]>(`/api/techniques${qs ? `?${qs}` : ""}`);
+    return fetchApi<TechniqueListItem[]>(`/api/techniques${qs ? `?${qs}` : ""}`);
   },
   getTechnique: (id: string) => fetchApi<TechniqueDetail>(`/api/techniques/${id}`),
+  getRelatedTechniques: (id: string, limit = 10) =>
+    fetchApi<RelatedTechnique[]>(`/api/techniques/${id}/related?limit=${limit}`),
   getCaseStudies: () => fetchApi<CaseStudySummary[]>("/api/case-studies"),
   getCaseStudy: (id: string) => fetchApi<CaseStudyDetail>(`/api/case-studies/${id}`),
   search: (q: string) =>
@@ -51,6 +64,30 @@ export const api = {
     fetch(`${API_URL}/api/sync`, { method: "POST" }).then((r) => r.json()),
   getOsint: (techniqueId: string) =>
     fetchApi<OsintResponse>(`/api/osint/${techniqueId}`),
+  // Server-Sent Events: one "source" event per source as it completes, then
+  // a "summary" event. Returns a function that closes the stream.
+  streamOsint: (
+    techniqueId: string,
+    handlers: {
+      onSource: (event: OsintSourceEvent) => void;
+      onSummary: (summary: OsintStreamSummary) => void;
+      onError: () => void;
+    }
+  ) => {
+    const source = new EventSource(`${API_URL}/api/osint/${techniqueId}/stream`);
+    source.addEventListener("source", (e) =>
+      handlers.onSource(JSON.parse((e as MessageEvent).data))
+    );
+    source.addEventListener("summary", (e) => {
+      source.close();
+      handlers.onSummary(JSON.parse((e as MessageEvent).data));
+    });
+    source.onerror = () => {
+      source.close();
+      handlers.onError();
+    };
+    return () => source.close();
+  },
   refreshOsint: (techniqueId: string) =>
     fetch(`${API_URL}/api/osint/${techniqueId}/refresh`, { method: "POST" }).then(
       (r) => r.json() as Promise<OsintResponse>
@@ -66,7 +103,22 @@ export const api = {
   getKillchainCategories: () => fetchApi<string[]>("/api/killchains/categories"),
   seedKillchains: () =>
     fetch(`${API_URL}/api/killchains/seed`, { method: "POST" }).then((r) => r.json()),
-  getTechniqueGraph: () => fetchApi<TechniqueGraph>("/api/techniques/graph"),
+  getTechniqueGraph: (params?: {
+    granularity?: "parent" | "subtechnique";
+    min_weight?: number;
+    top_k?: number;
+    tactic_ids?: string[];
+  }) => {
+    const sp = new URLSearchParams();
+    if (params?.granularity) sp.set("granularity", params.granularity);
+    if (params?.min_weight) sp.set("min_weight", String(params.min_weight));
+    if (params?.top_k) sp.set("top_k", String(params.top_k));
+    params?.tactic_ids?.forEach((id) => sp.append("tactic_id", id));
+    const qs = sp.toString();
+    return fetchApi<TechniqueGraph>(`/api/techniques/graph${qs ? `?${qs}` : ""}`);
+  },
+  getTechniqueGraphAnalytics: (granularity: "parent" | "subtechnique" = "parent") =>
+    fetchApi<TechniqueGraphAnalytics>(`/api/techniques/graph/analytics?granularity=${granularity}`),
   getExecutiveReport: () => fetchApi<ExecutiveReport>("/api/reports/executive"),
   getExercises: () => fetchApi<ExerciseSummary[]>("/api/exercises"),
   getExercise: (id: string) => fetchApi<ExerciseDetail>(`/api/exercises/${id}`),
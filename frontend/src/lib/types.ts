@@ -23,6 +23,14 @@ export interface TechniqueSummary {
   tactic_ids: string[];
 }
 
+// TechniqueSummary plus the relations requested with `expand`
+export interface TechniqueListItem extends TechniqueSummary {
+  tactics?: { id: string; name: string | null }[];
+  subtechniques?: TechniqueSummary[];
+  mitigations?: MitigationRef[];
+  case_studies?: CaseStudySummary[];
+}
+
 export interface TechniqueDetail {
   id: string;
   name: string;
@@ -113,6 +121,7 @@ export interface OsintResult {
   url: string | null;
   summary: string | null;
   relevance_score: number | null;
+  cvss_score?: number | null;
   fetched_at: string | null;
 }
 
@@ -125,6 +134,23 @@ export interface OsintResponse {
   last_fetched: string | null;
 }
 
+export type OsintSourceKey = "github_repos" | "arxiv_papers" | "nvd_cves";
+
+export interface OsintSourceEvent {
+  source: "github" | "arxiv" | "nvd";
+  key: OsintSourceKey;
+  results: GitHubRepo[] | OsintResult[];
+  error: string | null;
+}
+
+export interface OsintStreamSummary {
+  technique_id: string;
+  cached: boolean;
+  last_fetched: string | null;
+  counts: Record<OsintSourceKey, number>;
+  elapsed_ms: number;
+}
+
 export interface KillchainSummary {
   id: number;
   name: string;
@@ -186,6 +212,9 @@ export interface GraphNode {
   tactic_ids: string[];
   maturity: string | null;
   case_study_count: number;
+  // Precomputed layout position in [0, 1]
+  x?: number | null;
+  y?: number | null;
 }
 
 export interface GraphEdge {
@@ -199,6 +228,54 @@ export interface TechniqueGraph {
   edges: GraphEdge[];
 }
 
+export interface RelatedTechnique {
+  id: string;
+  name: string;
+  is_subtechnique: boolean;
+  maturity: string | null;
+  score: number;
+  text_score: number;
+  cooccurrence_score: number;
+  mitigation_score: number;
+  tactic_score: number;
+}
+
+export interface GraphNodeAnalytics {
+  id: string;
+  case_study_count: number;
+  degree: number;
+  strength: number;
+  degree_centrality: number;
+  betweenness: number;
+  eigenvector: number;
+  community: number;
+}
+
+export interface GraphEdgeAnalytics {
+  source: string;
+  target: string;
+  weight: number;
+  jaccard: number;
+  pmi: number;
+  npmi: number;
+}
+
+export interface GraphCommunity {
+  id: number;
+  size: number;
+  technique_ids: string[];
+}
+
+export interface TechniqueGraphAnalytics {
+  granularity: "parent" | "subtechnique";
+  data_version: string;
+  case_study_count: number;
+  modularity: number;
+  nodes: GraphNodeAnalytics[];
+  edges: GraphEdgeAnalytics[];
+  communities: GraphCommunity[];
+}
+
 export interface SearchResultTechnique {
   id: string;
   name: string;